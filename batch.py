@@ -0,0 +1,275 @@
+"""
+Runs many Brewin programs across a pool of processes
+
+    python batch.py programs/ --workers 8 --timeout 5 --output results.json
+    python batch.py manifest.json --memory 512 --version 2
+
+The programs are either every .brewin file in a directory, each reading its
+input from the .in file beside it if there is one, or those listed in a JSON
+manifest, with paths relative to it:
+
+    [{"program": "fib.brewin", "input": "fib.in", "version": 3}, ...]
+
+Each program's output, ErrorType and line (if it failed), status and run time
+are written to one JSON results file; a program that throws an exception it
+never catches has status uncaught, with the exception's message
+
+fan_out runs one program on many inputs instead, loading it once and forking
+the workers from the process that loaded it
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Callable
+import argparse
+import gc
+import importlib
+import json
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+import time
+
+from bparser import string_to_program
+from intbase import InterpreterBase
+from interpreterv3 import Complaint, Interpreter, Menu, Overbrewed
+from sinks import Sink
+from sources import StreamSource
+
+
+OK = 'ok'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+MEMORY = 'memory'
+CRASH = 'crash'
+UNCAUGHT = 'uncaught'
+BUDGET = 'budget'
+DEADLINE = 'deadline'
+HEAP = 'heap'
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    program: str
+    input: str | None = None
+    version: int = 3
+
+
+class Timeout(Exception):
+    pass
+
+
+MENU: Menu | None = None
+INTERPRETER: Interpreter | None = None
+
+
+def load_jobs(path: str, version: int = 3) -> list[Job]:
+    """
+    The jobs in a directory of .brewin files or a JSON manifest, running on
+    interpreter version unless the manifest says otherwise
+    """
+    if os.path.isdir(path):
+        jobs = []
+        for entry in sorted(os.listdir(path)):
+            name, extension = os.path.splitext(entry)
+            if extension != '.brewin':
+                continue
+            inp = os.path.join(path, f'{name}.in')
+            jobs.append(Job(name, os.path.join(path, entry),
+                            inp if os.path.exists(inp) else None, version))
+        return jobs
+    with open(path) as f:
+        manifest = json.load(f)
+    root = os.path.dirname(path)
+    return [
+        Job(entry.get('name', os.path.splitext(
+                os.path.basename(entry['program'])
+            )[0]),
+            os.path.join(root, entry['program']),
+            entry.get('input') and os.path.join(root, entry['input']),
+            entry.get('version', version))
+        for entry in manifest
+    ]
+
+
+def limit_memory(memory: int | None):
+    """
+    Caps the address space of the worker at memory bytes
+    """
+    if memory:
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+
+def raise_timeout(signum, frame):
+    raise Timeout()
+
+
+def attempt(interpreter: InterpreterBase, run: Callable[[], None],
+            timeout: float | None) -> dict:
+    """
+    Calls run, which runs a program on interpreter, stopping it after timeout
+    seconds, and returns how it went
+    """
+    result = {'status': OK, 'error_type': None, 'error_line': None,
+              'message': None}
+    previous = signal.signal(signal.SIGALRM, raise_timeout)
+    start = time.perf_counter()
+    try:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        run()
+    except Timeout:
+        result['status'] = TIMEOUT
+    except MemoryError:
+        result['status'] = MEMORY
+    except Overbrewed as e:
+        result.update(status=e.reason, error_line=e.line_num, message=str(e))
+    except Complaint as e:
+        result.update(status=UNCAUGHT, message=str(e))
+    except RuntimeError as e:
+        error_type, error_line = interpreter.get_error_type_and_line()
+        if error_type is None:
+            result['status'] = CRASH
+        else:
+            result.update(status=ERROR, error_type=error_type.name,
+                          error_line=error_line)
+        result['message'] = str(e)
+    except Exception as e:
+        result.update(status=CRASH, message=f'{type(e).__name__}: {e}')
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+    scale = getattr(interpreter, 'scale', None)
+    return result | {
+        'output': list(interpreter.get_output()),
+        'time': time.perf_counter() - start,
+        'heap_peak': scale.peak if scale else None,
+    }
+
+
+def run_job(job: Job, timeout: float | None = None) -> dict:
+    """
+    Runs job in this process, stopping it after timeout seconds
+    """
+    source = StreamSource.from_file(job.input) if job.input else None
+    interpreter = importlib.import_module(
+        f'interpreterv{job.version}'
+    ).Interpreter(console_output=False, sink=Sink(log=[]),
+                  source=source or (lambda: None))
+
+    def run():
+        with open(job.program) as f:
+            interpreter.run(string_to_program(f.read()))
+
+    try:
+        return asdict(job) | attempt(interpreter, run, timeout)
+    finally:
+        if source:
+            source.close()
+
+
+def run_batch(jobs: list[Job], workers: int | None = None,
+              timeout: float | None = None, memory: int | None = None,
+              chunksize: int = 1) -> list[dict]:
+    """
+    Runs jobs on a pool of workers (default: one per CPU), each stopped after
+    timeout seconds and in a process capped at memory bytes, returning their
+    results in order
+
+    Workers are handed chunksize jobs at a time
+    """
+    with multiprocessing.Pool(workers, limit_memory, (memory,)) as pool:
+        return pool.starmap(run_job, [(job, timeout) for job in jobs],
+                            chunksize)
+
+
+def open_counter(settings: dict):
+    """
+    Makes the interpreter a forked worker runs MENU on
+    """
+    global INTERPRETER
+    INTERPRETER = Interpreter(console_output=False, sink=Sink(log=[]),
+                              **settings)
+
+
+def run_input(inp: list[str], timeout: float | None = None) -> dict:
+    """
+    Runs MENU on inp in a worker started by fan_out
+    """
+    lines = iter(inp)
+    INTERPRETER.source = lambda: next(lines, None)
+    return attempt(INTERPRETER, lambda: INTERPRETER.run_prepared(MENU),
+                   timeout)
+
+
+def fan_out(program: list[str], inputs: list[list[str]],
+            workers: int | None = None, timeout: float | None = None,
+            chunksize: int | None = None, **settings) -> list[dict]:
+    """
+    Runs program on each of inputs across a pool of forked workers (default:
+    one per CPU), each stopped after timeout seconds, returning the results in
+    input order
+
+    The program is loaded once, here, by an interpreter with settings (as
+    Interpreter takes them), then frozen out of the garbage collector's reach
+    so the workers share it with this process instead of copying it as they
+    collect
+
+    Throws RuntimeError if the program fails to load
+    """
+    global MENU
+    MENU = Interpreter(console_output=False, **settings).prepare(program)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(inputs) // (4 * workers))
+    gc.freeze()
+    try:
+        with multiprocessing.get_context('fork').Pool(
+            workers, open_counter, (settings,)
+        ) as pool:
+            return pool.starmap(run_input, [(inp, timeout) for inp in inputs],
+                                chunksize)
+    finally:
+        gc.unfreeze()
+        MENU = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('programs', help="directory of programs or manifest")
+    parser.add_argument('--workers', type=int,
+                        help="processes to run (default: one per CPU)")
+    parser.add_argument('--timeout', type=float,
+                        help="seconds each program may run for")
+    parser.add_argument('--memory', type=int,
+                        help="MiB each worker process may use")
+    parser.add_argument('--version', type=int, default=3,
+                        help="interpreter version for programs that don't "
+                             "give one")
+    parser.add_argument('--output', default='results.json',
+                        help="file to write the results to")
+    args = parser.parse_args()
+    if args.version not in (1, 2, 3):
+        parser.error(f"no interpreter version {args.version}")
+
+    start = time.perf_counter()
+    results = run_batch(load_jobs(args.programs, args.version), args.workers,
+                        args.timeout, args.memory and args.memory * 2 ** 20)
+    with open(args.output, 'w') as f:
+        json.dump({'wall': time.perf_counter() - start, 'results': results}, f,
+                  indent=2)
+    statuses = {}
+    for result in results:
+        statuses[result['status']] = statuses.get(result['status'], 0) + 1
+    print(f"{len(results)} programs: " + ', '.join(
+        f"{count} {status}" for status, count in statuses.items()
+    ), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
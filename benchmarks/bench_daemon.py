@@ -0,0 +1,129 @@
+"""
+Load generator for daemon.py: starts a server, has client processes send it
+the programs in corpus.py at their smallest size, and reports the latency and
+throughput they see, next to the latency of running each program in a fresh
+Python process
+
+    python benchmarks/bench_daemon.py
+    python benchmarks/bench_daemon.py --clients 4 --requests 200
+
+Every reply's output is checked against the program's Python model
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import CORPUS
+from daemon import Client, Server
+
+COLD = '''
+import sys
+sys.path.insert(0, {root!r})
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+interpreter = Interpreter(console_output=False, inp={inp!r})
+interpreter.run(string_to_program({source!r}))
+print('\\n'.join(interpreter.get_output()))
+'''
+
+
+def jobs() -> list[tuple[str, str, list[str], list[str]]]:
+    return [(name, program.source, program.inputs(program.sizes[0]),
+             program.expected(program.sizes[0]))
+            for name, program in CORPUS.items()]
+
+
+def load(path: str, requests: int, start: int) -> list[float]:
+    """
+    Sends requests requests round the corpus from start, returning the
+    latency of each
+    """
+    corpus = jobs()
+    latencies = []
+    with Client(path) as client:
+        for request in range(start, start + requests):
+            name, source, inp, expected = corpus[request % len(corpus)]
+            sent = time.perf_counter()
+            result = client.run(source, inp)
+            latencies.append(time.perf_counter() - sent)
+            if result['output'] != expected:
+                raise AssertionError(f"{name} printed the wrong output")
+    return latencies
+
+
+def cold(runs: int) -> list[float]:
+    latencies = []
+    for name, source, inp, expected in jobs()[:runs]:
+        sent = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', COLD.format(root=ROOT, inp=inp,
+                                               source=source)],
+            capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        latencies.append(time.perf_counter() - sent)
+        if output != expected:
+            raise AssertionError(f"{name} printed the wrong output cold")
+    return latencies
+
+
+def describe(label: str, latencies: list[float]):
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    print(f"{label}: p50 {cuts[49] * 1e3:7.2f} ms, "
+          f"p95 {cuts[94] * 1e3:7.2f} ms, max {max(latencies) * 1e3:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--clients', type=int, default=2,
+                        help="client processes sending requests at once")
+    parser.add_argument('--requests', type=int, default=100,
+                        help="requests each client sends")
+    parser.add_argument('--cache-mb', type=float, default=64)
+    parser.add_argument('--workers', type=int,
+                        help="requests the server runs at a time (default: "
+                             "one per CPU)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'brewin.sock')
+        context = multiprocessing.get_context('fork')
+        server = context.Process(
+            target=Server(path, int(args.cache_mb * 2 ** 20),
+                          args.workers).serve_forever,
+            daemon=True
+        )
+        server.start()
+        while not os.path.exists(path):
+            time.sleep(0.01)
+        try:
+            start = time.perf_counter()
+            with context.Pool(args.clients) as pool:
+                latencies = [latency for client in pool.starmap(
+                    load, [(path, args.requests, client * args.requests)
+                           for client in range(args.clients)]
+                ) for latency in client]
+            wall = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.join()
+
+    describe("daemon", latencies)
+    print(f"  {len(latencies) / wall:.1f} requests/s from {args.clients} "
+          f"clients")
+    describe("fresh process", cold(len(CORPUS)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Runs one program from corpus.py over many input sets with batch.fan_out at
+each number of workers, reporting throughput, speedup over one worker and
+the workers' peak RSS (shared pages included)
+
+    python benchmarks/bench_fanout.py
+    python benchmarks/bench_fanout.py shapes --runs 2000 --workers 1,2,4,8
+
+Each input set is the program's input at a size from --sizes, in turn, and
+every run's output is checked against the program's Python model
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import fan_out
+from bparser import string_to_program
+from corpus import CORPUS
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('program', nargs='?', default='rpn_parser',
+                        help=f"program to run (one of {', '.join(CORPUS)})")
+    parser.add_argument('--runs', type=int, default=500,
+                        help="input sets to run it on")
+    parser.add_argument('--sizes', default='1,2,3,4,5',
+                        help="comma-separated sizes to take inputs at")
+    parser.add_argument('--workers',
+                        help="comma-separated numbers of workers (default: "
+                             "powers of two up to one per CPU)")
+    args = parser.parse_args()
+    if args.program not in CORPUS:
+        parser.error(f"unknown program: {args.program}")
+
+    program = CORPUS[args.program]
+    sizes = tuple(map(int, args.sizes.split(',')))
+    runs = [sizes[run % len(sizes)] for run in range(args.runs)]
+    inputs = [program.inputs(size) for size in runs]
+    expected = [program.expected(size) for size in runs]
+    if args.workers:
+        counts = tuple(map(int, args.workers.split(',')))
+    else:
+        counts = tuple(2 ** power for power in range(
+            (os.cpu_count() or 1).bit_length()
+        ))
+
+    source = string_to_program(program.source)
+    single = None
+    for workers in counts:
+        start = time.perf_counter()
+        results = fan_out(source, inputs, workers)
+        wall = time.perf_counter() - start
+        if [result['output'] for result in results] != expected:
+            raise AssertionError(f"{args.program} printed the wrong output")
+        single = single or wall
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+        print(f"{workers:>3} workers: {len(runs) / wall:8.1f} runs/s, "
+              f"speedup {single / wall:5.2f}, "
+              f"worker peak RSS {peak / 2 ** 20:6.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
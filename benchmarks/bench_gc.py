@@ -0,0 +1,140 @@
+"""
+Runs the programs in corpus.py, and churn, which makes and drops an object on
+every turn of a loop, at their largest size, counting the garbage collections
+of each generation during execution and the objects only the cyclic collector
+could free, next to the execution time; each run gets a freshly spawned
+process
+
+    python benchmarks/bench_gc.py
+    python benchmarks/bench_gc.py linked_list shapes --sizes 1000
+
+--root runs the interpreter of another checkout instead, to compare before
+and after a change to the object model:
+
+    git worktree add /tmp/before HEAD~1
+    python benchmarks/bench_gc.py --root /tmp/before
+
+Every run's output is checked against the program's Python model
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import CORPUS, Program
+
+
+CHURN = '''
+(class cell
+  (field int value 0)
+  (method void fill ((int v)) (set value v))
+  (method int get () (return value))
+)
+
+(class main
+  (field int n 0)
+  (field int total 0)
+  (field cell c null)
+  (method void main ()
+    (begin
+      (inputi n)
+      (while (> n 0)
+        (begin
+          (set c (new cell))
+          (call c fill n)
+          (set total (+ total (call c get)))
+          (set n (- n 1))
+        )
+      )
+      (print total)
+    )
+  )
+)
+'''
+
+PROGRAMS = CORPUS | {'churn': Program(
+    'churn', CHURN, (1000, 20000), lambda n: [str(n)],
+    lambda n: [str(n * (n + 1) // 2)]
+)}
+
+
+def run(root: str, name: str, size: int) -> dict:
+    sys.path.insert(0, root)
+    from bparser import string_to_program
+    from interpreterv3 import Interpreter
+
+    program = PROGRAMS[name]
+    interpreter = Interpreter(console_output=False, inp=program.inputs(size))
+    interpreter.load(interpreter.parse(string_to_program(program.source)))
+    collections = [0, 0, 0]
+    collected = 0
+
+    def count(phase: str, info: dict):
+        nonlocal collected
+        if phase == 'stop':
+            collections[info['generation']] += 1
+            collected += info['collected']
+
+    gc.collect()
+    gc.callbacks.append(count)
+    start = time.perf_counter()
+    try:
+        interpreter.execute()
+    finally:
+        executed = time.perf_counter()
+        gc.callbacks.remove(count)
+    if interpreter.get_output() != program.expected(size):
+        raise AssertionError(f"{name} printed the wrong output at size {size}")
+    return {
+        'size': size,
+        'execute': executed - start,
+        'collections': collections,
+        'collected': collected,
+    }
+
+
+def measure(root: str, name: str, size: int) -> dict:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run, (root, name, size))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('programs', nargs='*',
+                        help=f"programs to run (default: all of "
+                             f"{', '.join(PROGRAMS)})")
+    parser.add_argument('--sizes',
+                        help="comma-separated sizes to use instead of each "
+                             "program's largest")
+    parser.add_argument('--root', default=ROOT,
+                        help="checkout whose interpreter to run")
+    args = parser.parse_args()
+    for name in args.programs:
+        if name not in PROGRAMS:
+            parser.error(f"unknown program: {name}")
+
+    root = os.path.abspath(args.root)
+    print(f"interpreter from {root}")
+    print(f"{'program':<16} {'size':>6} {'execute':>9} {'gen 0':>7} "
+          f"{'gen 1':>6} {'gen 2':>6} {'collected':>10}")
+    for name in args.programs or list(PROGRAMS):
+        sizes = (tuple(map(int, args.sizes.split(','))) if args.sizes
+                 else PROGRAMS[name].sizes[-1:])
+        for size in sizes:
+            result = measure(root, name, size)
+            print(f"{name:<16} {size:>6} {result['execute']:>8.3f}s "
+                  f"{result['collections'][0]:>7} "
+                  f"{result['collections'][1]:>6} "
+                  f"{result['collections'][2]:>6} {result['collected']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Runs the realistic programs in corpus.py at each of their sizes, reporting
+wall time, peak RSS and the time spent in each phase (parse, load, execute);
+each run gets a freshly spawned process so peak RSS is its own
+
+    python benchmarks/bench_macro.py
+    python benchmarks/bench_macro.py binary_tree shapes --sizes 100,200
+    python benchmarks/bench_macro.py --output macro.json
+
+Every run's output is checked against the program's Python model
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+from corpus import CORPUS
+from interpreterv3 import Interpreter
+
+
+def run(name: str, size: int) -> dict:
+    program = CORPUS[name]
+    interpreter = Interpreter(console_output=False, inp=program.inputs(size))
+    start = time.perf_counter()
+    tokens = interpreter.parse(string_to_program(program.source))
+    parsed = time.perf_counter()
+    interpreter.load(tokens)
+    loaded = time.perf_counter()
+    interpreter.execute()
+    executed = time.perf_counter()
+    if interpreter.get_output() != program.expected(size):
+        raise AssertionError(f"{name} printed the wrong output at size {size}")
+    return {
+        'size': size,
+        'wall': executed - start,
+        'parse': parsed - start,
+        'load': loaded - parsed,
+        'execute': executed - loaded,
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+
+def measure(name: str, size: int) -> dict:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run, (name, size))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('programs', nargs='*',
+                        help=f"programs to run (default: all of "
+                             f"{', '.join(CORPUS)})")
+    parser.add_argument('--sizes',
+                        help="comma-separated sizes to use instead of each "
+                             "program's own")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    args = parser.parse_args()
+    for name in args.programs:
+        if name not in CORPUS:
+            parser.error(f"unknown program: {name}")
+
+    results = {}
+    for name in args.programs or list(CORPUS):
+        print(name)
+        sizes = (tuple(map(int, args.sizes.split(','))) if args.sizes
+                 else CORPUS[name].sizes)
+        results[name] = []
+        for size in sizes:
+            result = measure(name, size)
+            results[name].append(result)
+            print(f"  {size:>6}: {result['wall']:7.3f} s "
+                  f"(parse {result['parse'] * 1e3:6.1f} ms, "
+                  f"load {result['load'] * 1e3:6.1f} ms, "
+                  f"execute {result['execute']:7.3f} s), "
+                  f"peak RSS {result['peak_rss'] / 2 ** 20:6.1f} MiB")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
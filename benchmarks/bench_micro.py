@@ -0,0 +1,357 @@
+"""
+Times a Brewin micro-program for each interpreter hot path against every
+interpreter version whose syntax can express it, and saves the results as
+JSON so a change can be compared against an earlier run
+
+    python benchmarks/bench_micro.py --output before.json
+    python benchmarks/bench_micro.py --baseline before.json --output after.json
+
+Each program loops a fixed number of times (scaled with --scale) and prints
+a final value; the versions running the same benchmark must agree on it
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+
+
+VERSIONS = ('v1', 'v2', 'v3')
+REPEAT = 5
+TYPED_CALL = '''
+(class main
+  (field int i 0)
+  (method int inc ((int x)) (return (+ x 1)))
+  (method void main ()
+    (begin
+      (while (< i {n}) (set i (call me inc i)))
+      (print i)
+    )
+  )
+)
+'''
+TYPED_FIELDS = '''
+(class main
+  (field int i 0)
+  (field int x 0)
+  (field bool flag false)
+  (method void main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set x i)
+          (set flag (! flag))
+          (set i (+ x 1))
+        )
+      )
+      (print i flag)
+    )
+  )
+)
+'''
+TYPED_ARITHMETIC = '''
+(class main
+  (field int i 0)
+  (field int x 0)
+  (method void main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set x (+ (* i 3) (% (- i 7) 5)))
+          (set i (+ i 1))
+        )
+      )
+      (print x)
+    )
+  )
+)
+'''
+TYPED_STRINGS = '''
+(class main
+  (field int i 0)
+  (field string s "")
+  (method void main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set s (+ s "a"))
+          (set i (+ i 1))
+        )
+      )
+      (print (== s ""))
+    )
+  )
+)
+'''
+BENCHMARKS = {
+    'method_call': dict(n=2000, programs={
+        'v1': '''
+(class main
+  (field i 0)
+  (method inc (x) (return (+ x 1)))
+  (method main ()
+    (begin
+      (while (< i {n}) (set i (call me inc i)))
+      (print i)
+    )
+  )
+)
+''',
+        'v2': TYPED_CALL,
+        'v3': TYPED_CALL,
+    }),
+    'new_deep_inheritance': dict(n=500, programs={
+        version: '''
+(class a0 (field int x 0))
+(class a1 inherits a0 (field int x 1))
+(class a2 inherits a1 (field int x 2))
+(class a3 inherits a2 (field int x 3))
+(class a4 inherits a3 (field int x 4))
+(class a5 inherits a4 (field int x 5))
+(class a6 inherits a5 (field int x 6))
+(class a7 inherits a6 (field int x 7))
+(class main
+  (field int i 0)
+  (field a0 o null)
+  (method void main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set o (new a7))
+          (set i (+ i 1))
+        )
+      )
+      (print (!= o null))
+    )
+  )
+)
+''' for version in ('v2', 'v3')
+    }),
+    'field_get_set': dict(n=2000, programs={
+        'v1': '''
+(class main
+  (field i 0)
+  (field x 0)
+  (field flag false)
+  (method main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set x i)
+          (set flag (! flag))
+          (set i (+ x 1))
+        )
+      )
+      (print i flag)
+    )
+  )
+)
+''',
+        'v2': TYPED_FIELDS,
+        'v3': TYPED_FIELDS,
+    }),
+    'let_in_loop': dict(n=2000, programs={
+        version: '''
+(class main
+  (method void main ()
+    (let ((int i 0))
+      (while (< i {n})
+        (let ((int x 0) (string s "tea"))
+          (set x i)
+          (set i (+ x 1))
+        )
+      )
+      (print i)
+    )
+  )
+)
+''' for version in ('v2', 'v3')
+    }),
+    'int_arithmetic': dict(n=2000, programs={
+        'v1': '''
+(class main
+  (field i 0)
+  (field x 0)
+  (method main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set x (+ (* i 3) (% (- i 7) 5)))
+          (set i (+ i 1))
+        )
+      )
+      (print x)
+    )
+  )
+)
+''',
+        'v2': TYPED_ARITHMETIC,
+        'v3': TYPED_ARITHMETIC,
+    }),
+    'string_concat': dict(n=2000, programs={
+        'v1': '''
+(class main
+  (field i 0)
+  (field s "")
+  (method main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set s (+ s "a"))
+          (set i (+ i 1))
+        )
+      )
+      (print (== s ""))
+    )
+  )
+)
+''',
+        'v2': TYPED_STRINGS,
+        'v3': TYPED_STRINGS,
+    }),
+    'throw_try': dict(n=1000, programs={
+        'v3': '''
+(class main
+  (field int i 0)
+  (method void main ()
+    (begin
+      (while (< i {n})
+        (try
+          (throw "spilled")
+          (set i (+ i 1))
+        )
+      )
+      (print i)
+    )
+  )
+)
+''',
+    }),
+    'template_instantiation': dict(n=500, programs={
+        'v3': '''
+(tclass box (field_type)
+  (field field_type value)
+  (method field_type get () (return value))
+)
+(class main
+  (field int i 0)
+  (field box@int b)
+  (method void main ()
+    (begin
+      (while (< i {n})
+        (begin
+          (set b (new box@int))
+          (set i (+ i 1))
+        )
+      )
+      (print (call b get))
+    )
+  )
+)
+''',
+    }),
+}
+
+
+def time_program(version: str, source: str, n: int, repeat: int) -> dict:
+    interpreter = importlib.import_module(f'interpreter{version}').Interpreter(
+        console_output=False, inp=[]
+    )
+    program = string_to_program(source.format(n=n))
+
+    def run():
+        interpreter.reset()
+        interpreter.run(program)
+
+    times = timeit.repeat(run, number=1, repeat=repeat)
+    return {
+        'iterations': n,
+        'min': min(times),
+        'median': statistics.median(times),
+        'output': interpreter.get_output(),
+    }
+
+
+def run_benchmarks(names: list[str], versions: list[str], scale: float,
+                   repeat: int) -> dict:
+    results = {}
+    for name in names:
+        benchmark = BENCHMARKS[name]
+        n = max(1, int(benchmark['n'] * scale))
+        results[name] = {}
+        for version, source in benchmark['programs'].items():
+            if version in versions:
+                results[name][version] = time_program(version, source, n,
+                                                      repeat)
+        outputs = {version: result.pop('output')
+                   for version, result in results[name].items()}
+        if len(set(map(tuple, outputs.values()))) > 1:
+            raise AssertionError(f"{name}: versions disagree: {outputs}")
+    return results
+
+
+def report(results: dict, baseline: dict | None):
+    for name, timings in results.items():
+        print(name)
+        for version, result in timings.items():
+            per_loop = result['min'] / result['iterations']
+            line = (f"  {version}: {result['min'] * 1e3:9.2f} ms, "
+                    f"{per_loop * 1e6:8.2f} us/iteration")
+            try:
+                before = baseline[name][version]
+            except (TypeError, KeyError):
+                pass
+            else:
+                if before['iterations'] == result['iterations']:
+                    line += f", {result['min'] / before['min']:5.2f}x baseline"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('benchmarks', nargs='*',
+                        help=f"benchmarks to run (default: all of "
+                             f"{', '.join(BENCHMARKS)})")
+    parser.add_argument('--versions', default=','.join(VERSIONS),
+                        help="comma-separated interpreter versions")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="multiplier for every iteration count")
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline',
+                        help="JSON file from an earlier run to compare with")
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    results = run_benchmarks(args.benchmarks or list(BENCHMARKS),
+                             args.versions.split(','), args.scale, args.repeat)
+    report(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'scale': args.scale,
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Compares loading a program from source (parsing it and preparing it) with
+restoring it from a snapshot, for the programs in corpus.py and sprawl, a
+generated program of many classes whose loading outweighs running it,
+reporting the best of several loads of each and the snapshot's size
+
+    python benchmarks/bench_snapshot.py
+    python benchmarks/bench_snapshot.py sprawl --classes 5000 --repeat 3
+
+Every program is run once loaded each way, and its output checked against the
+program's Python model
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+from corpus import CORPUS, Program
+from interpreterv3 import Interpreter
+
+
+CUP = '''
+(class cup{i}
+  (field int n {i})
+  (field box@int kept null)
+  (method int get () (return n))
+  (method int mix ((int a) (int b))
+    (let ((int t 0))
+      (set t (+ a b))
+      (if (> t {i}) (return (- t {i})) (return (+ t n)))
+    )
+  )
+  (method void swirl ((int turns))
+    (while (> turns 0)
+      (begin
+        (set n (+ n 1))
+        (set n (- n 1))
+        (set turns (- turns 1))
+      )
+    )
+  )
+)
+'''
+
+BOX = '''
+(tclass box (field_type)
+  (field field_type value)
+  (method void put ((field_type v)) (set value v))
+  (method field_type get () (return value))
+)
+'''
+
+
+def sprawl(classes: int) -> str:
+    """
+    Program of classes classes, whose main adds up what each one's get gives
+    """
+    return BOX + ''.join(CUP.format(i=i) for i in range(classes)) + '''
+(class main
+  (field int total 0)
+  (method void main ()
+    (begin
+''' + ''.join(f'      (set total (+ total (call (new cup{i}) get)))\n'
+              for i in range(classes)) + '''      (print total)
+    )
+  )
+)
+'''
+
+
+def cold(source: list[str]):
+    return Interpreter(console_output=False).prepare(source)
+
+
+def best(load, repeat: int) -> tuple[float, object]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        menu = load()
+        times.append(time.perf_counter() - start)
+    return min(times), menu
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('programs', nargs='*',
+                        help=f"programs to load (default: all of "
+                             f"{', '.join(CORPUS)}, sprawl)")
+    parser.add_argument('--classes', type=int, default=2000,
+                        help="classes in sprawl")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="loads of each program to take the best of")
+    args = parser.parse_args()
+
+    programs = CORPUS | {'sprawl': Program(
+        'sprawl', sprawl(args.classes), (0,), lambda n: [],
+        lambda n: [str(args.classes * (args.classes - 1) // 2)]
+    )}
+    for name in args.programs:
+        if name not in programs:
+            parser.error(f"unknown program: {name}")
+
+    print(f"{'program':<16} {'source':>9} {'snapshot':>9} {'speedup':>8} "
+          f"{'size':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.programs or list(programs):
+            program = programs[name]
+            size = program.sizes[0]
+            path = os.path.join(directory, f'{name}.snapshot')
+            Interpreter(console_output=False).snapshot(
+                string_to_program(program.source), path
+            )
+
+            loaded, prepared = best(
+                lambda: cold(string_to_program(program.source)), args.repeat
+            )
+            restored, snapshot = best(lambda: Interpreter.restore(path),
+                                      args.repeat)
+            for menu in (prepared, snapshot):
+                interpreter = Interpreter(console_output=False)
+                interpreter.run_prepared(menu, program.inputs(size))
+                if interpreter.get_output() != program.expected(size):
+                    raise AssertionError(f"{name} printed the wrong output")
+            print(f"{name:<16} {loaded * 1e3:>7.2f}ms {restored * 1e3:>7.2f}ms "
+                  f"{loaded / restored:>7.1f}x "
+                  f"{os.path.getsize(path) / 2 ** 10:>6.0f}KiB")
+
+
+if __name__ == '__main__':
+    main()
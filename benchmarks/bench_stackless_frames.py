@@ -0,0 +1,81 @@
+"""
+Measures what each Brewin call frame costs in stackless mode, as the growth
+in peak resident memory per frame between recursion depths; each run gets a
+freshly spawned process
+
+max_depth caps the number of frames, not bytes, so the cost per frame is what
+turns a memory budget into a max_depth, e.g. a budget of 64 MiB at the
+3.4 KiB a frame measured here is a max_depth of about 19000
+
+Depths can be given on the command line, e.g.
+    python benchmarks/bench_stackless_frames.py 1000 100000
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+
+
+DEPTHS = (1_000, 50_000, 200_000)
+PROGRAM = string_to_program('''
+(class main
+  (method int dive ((int n))
+    (if (== n 0)
+      (return 0)
+      (return (+ 1 (call me dive (- n 1))))
+    )
+  )
+  (method void main ()
+    (let ((int n 0))
+      (inputi n)
+      (print (call me dive n))
+    )
+  )
+)
+''')
+
+
+def run(depth: int) -> int:
+    interpreter = Interpreter(console_output=False, inp=[str(depth)],
+                              stackless=True)
+    interpreter.run(PROGRAM)
+    assert interpreter.get_output() == [str(depth)]
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(depth: int) -> int:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run, (depth,))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('depths', nargs='*', type=int, default=DEPTHS,
+                        help=f"recursion depths to run, at least two "
+                             f"(default: {' '.join(map(str, DEPTHS))})")
+    args = parser.parse_args()
+    if len(args.depths) < 2:
+        parser.error("need at least two depths to tell the cost of a frame")
+
+    peaks = {}
+    for depth in sorted(args.depths):
+        peaks[depth] = measure(depth)
+        print(f"{depth:>9} frames: peak RSS {peaks[depth] / 2 ** 20:8.1f} MiB")
+    shallowest, deepest = min(peaks), max(peaks)
+    per_frame = ((peaks[deepest] - peaks[shallowest])
+                 / (deepest - shallowest))
+    print(f"about {per_frame / 1024:.2f} KiB a frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Measures the peak resident memory of tail-recursive Brewin loops at
+increasing iteration counts, with and without tail calls, to show that tail
+calls run in constant space; each run gets a freshly spawned process
+
+The loops are a method calling itself, one inherited by a child class, and
+two methods calling each other; the script fails if a loop's peak with tail
+calls grows by more than GROWTH from the fewest iterations to the most
+
+Iteration counts can be given on the command line, e.g.
+    python benchmarks/bench_tail_calls.py 1000 200000
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+
+
+ITERATIONS = (1_000, 10_000, 200_000, 1_000_000)
+NESTED_LIMIT = 100_000
+GROWTH = 16 * 1024
+PROGRAMS = {
+    'self': (string_to_program('''
+(class main
+  (method int count ((int n) (int total))
+    (if (== n 0)
+      (return total)
+      (return (call me count (- n 1) (+ total 1)))
+    )
+  )
+  (method void main ()
+    (let ((int n 0))
+      (inputi n)
+      (print (call me count n 0))
+    )
+  )
+)
+'''), str),
+    'inherited': (string_to_program('''
+(class tally
+  (method int get () (return 0))
+)
+(class counter inherits tally
+  (method int count ((int n) (int total))
+    (if (== n 0)
+      (return total)
+      (return (call me count (- n 1) (+ total 1)))
+    )
+  )
+)
+(class main
+  (method void main ()
+    (let ((int n 0))
+      (inputi n)
+      (print (call (new counter) count n 0))
+    )
+  )
+)
+'''), str),
+    'even/odd': (string_to_program('''
+(class main
+  (method bool even ((int n))
+    (if (== n 0) (return true) (return (call me odd (- n 1))))
+  )
+  (method bool odd ((int n))
+    (if (== n 0) (return false) (return (call me even (- n 1))))
+  )
+  (method void main ()
+    (let ((int n 0))
+      (inputi n)
+      (print (call me even n))
+    )
+  )
+)
+'''), lambda n: 'false' if n % 2 else 'true'),
+}
+MODES = {
+    'tail calls': dict(tail_calls=True),
+    'stackless, tail calls': dict(stackless=True, tail_calls=True),
+    'stackless, no tail calls': dict(stackless=True),
+}
+
+
+def run(name: str, iterations: int, options: dict) -> tuple[float, int]:
+    program, expected = PROGRAMS[name]
+    interpreter = Interpreter(console_output=False, inp=[str(iterations)],
+                              **options)
+    start = time.perf_counter()
+    interpreter.run(program)
+    elapsed = time.perf_counter() - start
+    assert interpreter.get_output() == [expected(iterations)]
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(name: str, iterations: int, options: dict) -> tuple[float, int]:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run, (name, iterations, options))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('iterations', nargs='*', type=int, default=ITERATIONS,
+                        help=f"iteration counts to run (default: "
+                             f"{' '.join(map(str, ITERATIONS))})")
+    args = parser.parse_args()
+
+    grown = []
+    for name in PROGRAMS:
+        for mode, options in MODES.items():
+            print(f"{name}, {mode}")
+            peaks = []
+            for n in args.iterations:
+                if not options.get('tail_calls') and n > NESTED_LIMIT:
+                    print(f"  {n:>9}: skipped, one frame per iteration")
+                    continue
+                elapsed, peak = measure(name, n, options)
+                peaks.append(peak)
+                print(f"  {n:>9}: peak RSS {peak / 1024:8.1f} MiB, "
+                      f"{elapsed:7.2f} s")
+            if options.get('tail_calls') and peaks[-1] - peaks[0] > GROWTH:
+                grown.append(f"{name}, {mode}")
+    if grown:
+        sys.exit(f"peak RSS grew with tail calls: {'; '.join(grown)}")
+
+
+if __name__ == '__main__':
+    main()
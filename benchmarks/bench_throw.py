@@ -0,0 +1,94 @@
+"""
+Times Brewin throw/try round trips at increasing call depths, next to the same
+dive unwound with plain returns, and fails if a throw costs more than
+TOLERANCES allows at any depth
+
+A thrown exception travels up through the same statement protocol as a
+return, so the unwinding itself costs the same; each round trip still pays a
+fixed few microseconds more, as try and throw are matched last by
+evaluate_statement where begin and return come early, and the thrown string
+is looked up as a variable before it is taken as a constant. That fixed cost
+shows most at shallow depths, so the tolerance is looser there
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+
+
+ROUNDS = 200
+REPEAT = 9
+# the most a throw round trip may cost, as a multiple of the returning one
+TOLERANCES = {1: 1.75, 10: 1.4, 25: 1.3, 50: 1.3}
+PROGRAM = '''
+(class main
+  (method void dive ((int n))
+    (if (== n 0)
+      {bottom}
+      (call me dive (- n 1))
+    )
+  )
+  (method void main ()
+    (let ((int depth 0) (int i 0))
+      (inputi depth)
+      (while (< i {rounds})
+        {round}
+      )
+    )
+  )
+)
+'''
+THROWING = string_to_program(PROGRAM.format(
+    bottom='(throw "bottom")',
+    rounds=ROUNDS,
+    round='(try (call me dive depth) (set i (+ i 1)))'
+))
+RETURNING = string_to_program(PROGRAM.format(
+    bottom='(return)',
+    rounds=ROUNDS,
+    round='(begin (call me dive depth) (set i (+ i 1)))'
+))
+
+
+def runner(program, depth):
+    interpreter = Interpreter(console_output=False, inp=[str(depth)])
+
+    def run():
+        interpreter.reset()
+        interpreter.run(program)
+
+    return run
+
+
+def time_programs(depth) -> tuple[float, float]:
+    """Best time per round of each program, timed in turns so that any drift
+    in the machine's speed falls on both alike"""
+    throw, back = runner(THROWING, depth), runner(RETURNING, depth)
+    throwing = returning = float('inf')
+    for _ in range(REPEAT):
+        throwing = min(throwing, timeit.timeit(throw, number=1))
+        returning = min(returning, timeit.timeit(back, number=1))
+    return throwing / ROUNDS, returning / ROUNDS
+
+
+def main():
+    over = []
+    for depth, tolerance in TOLERANCES.items():
+        throwing, returning = time_programs(depth)
+        ratio = throwing / returning
+        print(f"depth {depth:>3}: throw {throwing * 1e6:8.1f} us, "
+              f"return {returning * 1e6:8.1f} us, "
+              f"ratio {ratio:.2f} (at most {tolerance:.2f})")
+        if ratio > tolerance:
+            over.append(f"depth {depth}")
+    if over:
+        sys.exit(f"throws cost more than allowed at {', '.join(over)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,596 @@
+"""
+Realistic Brewin programs for the macro benchmarks, each with a size knob
+
+Every program reads its size (and any data) from deterministic input, and
+carries a plain Python model of itself that gives the output it must print
+at that size
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Program:
+    name: str
+    source: str
+    sizes: tuple[int, ...]
+    inputs: Callable[[int], list[str]]
+    expected: Callable[[int], list[str]]
+
+
+def lcg(seed: int):
+    while True:
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        yield seed
+
+
+LINKED_LIST = '''
+(tclass node (field_type)
+  (field field_type value)
+  (field node@field_type next null)
+  (method void set_up ((field_type v) (node@field_type rest))
+    (begin
+      (set value v)
+      (set next rest)
+    )
+  )
+  (method field_type get_value () (return value))
+  (method node@field_type get_next () (return next))
+  (method void set_next ((node@field_type rest)) (set next rest))
+)
+
+(tclass list (field_type)
+  (field node@field_type head null)
+  (field int size 0)
+  (method void push ((field_type v))
+    (let ((node@field_type fresh null))
+      (set fresh (new node@field_type))
+      (call fresh set_up v head)
+      (set head fresh)
+      (set size (+ size 1))
+    )
+  )
+  (method void reverse ()
+    (let ((node@field_type previous null) (node@field_type current null)
+          (node@field_type following null))
+      (set current head)
+      (while (!= current null)
+        (begin
+          (set following (call current get_next))
+          (call current set_next previous)
+          (set previous current)
+          (set current following)
+        )
+      )
+      (set head previous)
+    )
+  )
+  (method node@field_type first () (return head))
+  (method int get_size () (return size))
+)
+
+(class main
+  (field list@int numbers)
+  (field list@string words)
+  (method int sum ((node@int current))
+    (let ((int total 0))
+      (while (!= current null)
+        (begin
+          (set total (+ total (call current get_value)))
+          (set current (call current get_next))
+        )
+      )
+      (return total)
+    )
+  )
+  (method void main ()
+    (let ((int n 0) (int i 0))
+      (inputi n)
+      (set numbers (new list@int))
+      (set words (new list@string))
+      (while (< i n)
+        (begin
+          (call numbers push (% (* i 7) 13))
+          (call words push "word")
+          (set i (+ i 1))
+        )
+      )
+      (print (call (call numbers first) get_value))
+      (call numbers reverse)
+      (print (call (call numbers first) get_value))
+      (print (call me sum (call numbers first)))
+      (print (call words get_size))
+    )
+  )
+)
+'''
+
+
+def linked_list(n: int) -> list[str]:
+    values = [i * 7 % 13 for i in range(n)]
+    return [str(values[-1]), str(values[0]), str(sum(values)), str(n)]
+
+
+BINARY_TREE = '''
+(tclass tree (key_type)
+  (field key_type key)
+  (field tree@key_type left null)
+  (field tree@key_type right null)
+  (method void set_key ((key_type k)) (set key k))
+  (method void insert ((key_type k))
+    (if (< k key)
+      (if (== left null)
+        (begin
+          (set left (new tree@key_type))
+          (call left set_key k)
+        )
+        (call left insert k)
+      )
+      (if (== right null)
+        (begin
+          (set right (new tree@key_type))
+          (call right set_key k)
+        )
+        (call right insert k)
+      )
+    )
+  )
+  (method int count ()
+    (let ((int total 1))
+      (if (!= left null) (set total (+ total (call left count))))
+      (if (!= right null) (set total (+ total (call right count))))
+      (return total)
+    )
+  )
+  (method int height ()
+    (let ((int lower 0) (int upper 0))
+      (if (!= left null) (set lower (call left height)))
+      (if (!= right null) (set upper (call right height)))
+      (if (> lower upper) (return (+ lower 1)) (return (+ upper 1)))
+    )
+  )
+  (method key_type smallest ()
+    (if (== left null) (return key) (return (call left smallest)))
+  )
+)
+
+(class main
+  (field int seed 42)
+  (method int next_key ()
+    (begin
+      (set seed (% (+ (* seed 1103515245) 12345) 2147483648))
+      (return (% seed 100000))
+    )
+  )
+  (method void main ()
+    (let ((int n 0) (int i 1) (tree@int root null))
+      (inputi n)
+      (set root (new tree@int))
+      (call root set_key (call me next_key))
+      (while (< i n)
+        (begin
+          (call root insert (call me next_key))
+          (set i (+ i 1))
+        )
+      )
+      (print (call root count))
+      (print (call root height))
+      (print (call root smallest))
+    )
+  )
+)
+'''
+
+
+def binary_tree(n: int) -> list[str]:
+    keys = lcg(42)
+    root = [next(keys) % 100000, None, None]
+    height = 1
+    for _ in range(n - 1):
+        key = next(keys) % 100000
+        tree, depth = root, 1
+        while True:
+            depth += 1
+            side = 1 if key < tree[0] else 2
+            if tree[side] is None:
+                tree[side] = [key, None, None]
+                break
+            tree = tree[side]
+        height = max(height, depth)
+    smallest = root
+    while smallest[1] is not None:
+        smallest = smallest[1]
+    return [str(n), str(height), str(smallest[0])]
+
+
+FIBONACCI = '''
+(class main
+  (method int fib ((int n))
+    (if (< n 2)
+      (return n)
+      (return (+ (call me fib (- n 1)) (call me fib (- n 2))))
+    )
+  )
+  (method void main ()
+    (let ((int n 0))
+      (inputi n)
+      (print (call me fib n))
+    )
+  )
+)
+'''
+
+
+def fibonacci(n: int) -> list[str]:
+    previous, current = 0, 1
+    for _ in range(n):
+        previous, current = current, previous + current
+    return [str(previous)]
+
+
+ACKERMANN = '''
+(class main
+  (method int ack ((int m) (int n))
+    (if (== m 0)
+      (return (+ n 1))
+      (if (== n 0)
+        (return (call me ack (- m 1) 1))
+        (return (call me ack (- m 1) (call me ack m (- n 1))))
+      )
+    )
+  )
+  (method void main ()
+    (let ((int n 0))
+      (inputi n)
+      (print (call me ack 2 n))
+    )
+  )
+)
+'''
+
+STRING_BUILDER = '''
+(class builder
+  (field string text "")
+  (method void append ((string piece)) (set text (+ text piece)))
+  (method string build () (return text))
+)
+
+(class main
+  (method string repeat ((string piece) (int times))
+    (let ((string result "") (string square ""))
+      (set square piece)
+      (while (> times 0)
+        (begin
+          (if (== (% times 2) 1) (set result (+ result square)))
+          (set square (+ square square))
+          (set times (/ times 2))
+        )
+      )
+      (return result)
+    )
+  )
+  (method void main ()
+    (let ((int n 0) (int i 0) (builder b null))
+      (inputi n)
+      (set b (new builder))
+      (while (< i n)
+        (begin
+          (if (== (% i 3) 0)
+            (call b append "fizz")
+            (call b append ".")
+          )
+          (set i (+ i 1))
+        )
+      )
+      (print (call b build))
+      (print (call me repeat "ab" n))
+    )
+  )
+)
+'''
+
+
+def string_builder(n: int) -> list[str]:
+    return [''.join('fizz' if i % 3 == 0 else '.' for i in range(n)),
+            'ab' * n]
+
+
+RPN_PARSER = '''
+(tclass node (field_type)
+  (field field_type value)
+  (field node@field_type next null)
+  (method void set_up ((field_type v) (node@field_type rest))
+    (begin
+      (set value v)
+      (set next rest)
+    )
+  )
+  (method field_type get_value () (return value))
+  (method node@field_type get_next () (return next))
+)
+
+(class operands
+  (field node@int top null)
+  (field int depth 0)
+  (method void push ((int v))
+    (let ((node@int fresh null))
+      (set fresh (new node@int))
+      (call fresh set_up v top)
+      (set top fresh)
+      (set depth (+ depth 1))
+    )
+  )
+  (method int pop ()
+    (let ((int v 0))
+      (if (== top null) (throw "stack underflow"))
+      (set v (call top get_value))
+      (set top (call top get_next))
+      (set depth (- depth 1))
+      (return v)
+    )
+  )
+  (method int get_depth () (return depth))
+)
+
+(class main
+  (method int digit ((string token))
+    (begin
+      (if (== token "0") (return 0))
+      (if (== token "1") (return 1))
+      (if (== token "2") (return 2))
+      (if (== token "3") (return 3))
+      (if (== token "4") (return 4))
+      (if (== token "5") (return 5))
+      (if (== token "6") (return 6))
+      (if (== token "7") (return 7))
+      (if (== token "8") (return 8))
+      (if (== token "9") (return 9))
+      (throw (+ "not a token: " token))
+    )
+  )
+  (method void apply ((operands stack) (string token))
+    (let ((int right 0) (int left 0))
+      (set right (call stack pop))
+      (set left (call stack pop))
+      (if (== token "+")
+        (call stack push (+ left right))
+        (if (== token "-")
+          (call stack push (- left right))
+          (call stack push (* left right))
+        )
+      )
+    )
+  )
+  (method int evaluate ((node@string tokens))
+    (let ((operands stack null) (string token ""))
+      (set stack (new operands))
+      (while (!= tokens null)
+        (begin
+          (set token (call tokens get_value))
+          (if (| (== token "+") (| (== token "-") (== token "*")))
+            (call me apply stack token)
+            (call stack push (call me digit token))
+          )
+          (set tokens (call tokens get_next))
+        )
+      )
+      (if (!= (call stack get_depth) 1) (throw "leftover operands"))
+      (return (call stack pop))
+    )
+  )
+  (method node@string read_tokens ()
+    (let ((int count 0) (string token "") (node@string tokens null)
+          (node@string fresh null))
+      (inputi count)
+      (while (> count 0)
+        (begin
+          (inputs token)
+          (set fresh (new node@string))
+          (call fresh set_up token tokens)
+          (set tokens fresh)
+          (set count (- count 1))
+        )
+      )
+      (return tokens)
+    )
+  )
+  (method void main ()
+    (let ((int n 0) (int errors 0))
+      (inputi n)
+      (while (> n 0)
+        (begin
+          (try
+            (print (call me evaluate (call me read_tokens)))
+            (begin
+              (print "error: " exception)
+              (set errors (+ errors 1))
+            )
+          )
+          (set n (- n 1))
+        )
+      )
+      (print errors " errors")
+    )
+  )
+)
+'''
+
+
+def rpn_expressions(n: int) -> list[list[str]]:
+    """
+    Tokens of each expression in evaluation order; every fifth expression is
+    broken in one of three ways
+    """
+    numbers = lcg(7)
+    expressions = []
+    for i in range(n):
+        tokens = [str(next(numbers) % 10)]
+        for _ in range(next(numbers) % 4 + 1):
+            tokens += [str(next(numbers) % 10), '+-*'[next(numbers) % 3]]
+        if i % 5 == 4:
+            match i % 3:
+                case 0:
+                    tokens[-2] = 'x'
+                case 1:
+                    tokens.append('+')
+                case 2:
+                    tokens.insert(0, '1')
+        expressions.append(tokens)
+    return expressions
+
+
+def rpn_inputs(n: int) -> list[str]:
+    # read_tokens conses each token onto the front of its list, so they are
+    # fed back to front
+    inputs = [str(n)]
+    for tokens in rpn_expressions(n):
+        inputs += [str(len(tokens)), *reversed(tokens)]
+    return inputs
+
+
+def rpn_parser(n: int) -> list[str]:
+    output, errors = [], 0
+    for tokens in rpn_expressions(n):
+        stack = []
+        try:
+            for token in tokens:
+                if token in ('+', '-', '*'):
+                    if len(stack) < 2:
+                        raise ValueError("stack underflow")
+                    right, left = stack.pop(), stack.pop()
+                    stack.append({'+': left + right, '-': left - right,
+                                  '*': left * right}[token])
+                elif token.isdigit():
+                    stack.append(int(token))
+                else:
+                    raise ValueError(f"not a token: {token}")
+            if len(stack) != 1:
+                raise ValueError("leftover operands")
+            output.append(str(stack[0]))
+        except ValueError as e:
+            output.append(f"error: {e}")
+            errors += 1
+    return output + [f"{errors} errors"]
+
+
+SHAPES = '''
+(class shape
+  (field int size 0)
+  (method void set_size ((int s)) (set size s))
+  (method int get_size () (return size))
+  (method int area () (return 0))
+  (method int perimeter () (return 0))
+  (method string name () (return "shape"))
+)
+
+(class square inherits shape
+  (method int area ()
+    (return (* (call me get_size) (call me get_size)))
+  )
+  (method int perimeter () (return (* 4 (call me get_size))))
+  (method string name () (return "square"))
+)
+
+(class cube inherits square
+  (method int area () (return (* 6 (call super area))))
+  (method int perimeter () (return (* 3 (call super perimeter))))
+  (method string name () (return "cube"))
+)
+
+(class rectangle inherits shape
+  (method int area ()
+    (return (* (call me get_size) (+ (call me get_size) 1)))
+  )
+  (method int perimeter () (return (+ (* 4 (call me get_size)) 2)))
+  (method string name () (return "rectangle"))
+)
+
+(class triangle inherits shape
+  (method int area ()
+    (return (/ (* (* 3 (call me get_size)) (* 4 (call me get_size))) 2))
+  )
+  (method int perimeter () (return (* 12 (call me get_size))))
+  (method string name () (return "triangle"))
+)
+
+(tclass node (field_type)
+  (field field_type value)
+  (field node@field_type next null)
+  (method void set_up ((field_type v) (node@field_type rest))
+    (begin
+      (set value v)
+      (set next rest)
+    )
+  )
+  (method field_type get_value () (return value))
+  (method node@field_type get_next () (return next))
+)
+
+(class main
+  (method shape make ((int kind))
+    (begin
+      (if (== kind 0) (return (new square)))
+      (if (== kind 1) (return (new cube)))
+      (if (== kind 2) (return (new rectangle)))
+      (return (new triangle))
+    )
+  )
+  (method void main ()
+    (let ((int n 0) (int i 0) (shape s null) (node@shape shapes null)
+          (node@shape fresh null) (int area 0) (int perimeter 0)
+          (int squares 0))
+      (inputi n)
+      (while (< i n)
+        (begin
+          (set s (call me make (% i 4)))
+          (call s set_size (+ (% i 10) 1))
+          (set fresh (new node@shape))
+          (call fresh set_up s shapes)
+          (set shapes fresh)
+          (set i (+ i 1))
+        )
+      )
+      (while (!= shapes null)
+        (begin
+          (set s (call shapes get_value))
+          (set area (+ area (call s area)))
+          (set perimeter (+ perimeter (call s perimeter)))
+          (if (== (call s name) "square") (set squares (+ squares 1)))
+          (set shapes (call shapes get_next))
+        )
+      )
+      (print area " " perimeter " " squares)
+    )
+  )
+)
+'''
+
+
+def shapes(n: int) -> list[str]:
+    area = perimeter = squares = 0
+    for i in range(n):
+        kind, size = i % 4, i % 10 + 1
+        area += (size * size, 6 * size * size, size * (size + 1),
+                 6 * size * size)[kind]
+        perimeter += (4 * size, 12 * size, 4 * size + 2, 12 * size)[kind]
+        squares += kind == 0
+    return [f"{area} {perimeter} {squares}"]
+
+
+CORPUS = {program.name: program for program in (
+    Program('linked_list', LINKED_LIST, (100, 1000, 4000),
+            lambda n: [str(n)], linked_list),
+    Program('binary_tree', BINARY_TREE, (100, 500, 2000),
+            lambda n: [str(n)], binary_tree),
+    Program('fibonacci', FIBONACCI, (10, 14, 18),
+            lambda n: [str(n)], fibonacci),
+    Program('ackermann', ACKERMANN, (5, 15, 30),
+            lambda n: [str(n)], lambda n: [str(2 * n + 3)]),
+    Program('string_builder', STRING_BUILDER, (100, 1000, 4000),
+            lambda n: [str(n)], string_builder),
+    Program('rpn_parser', RPN_PARSER, (20, 100, 500),
+            rpn_inputs, rpn_parser),
+    Program('shapes', SHAPES, (100, 1000, 4000),
+            lambda n: [str(n)], shapes),
+)}
@@ -0,0 +1,66 @@
+"""
+Profiles a Brewin program at the Brewin level, printing the time spent in each
+method and line and optionally saving collapsed stacks for a flamegraph
+
+    python benchmarks/profile_program.py binary_tree --size 1000
+    python benchmarks/profile_program.py program.brewin --input input.txt \\
+        --collapsed program.folded
+    flamegraph.pl program.folded > program.svg
+
+The program is either the name of one in corpus.py or a file of Brewin
+source, whose input (if any) is read one line per inputi/inputs
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bparser import string_to_program
+from corpus import CORPUS
+from interpreterv3 import Interpreter
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('program', help="corpus program name or source file")
+    parser.add_argument('--size', type=int,
+                        help="size to run a corpus program at (default: its "
+                             "largest)")
+    parser.add_argument('--input', help="file of input lines for a source file")
+    parser.add_argument('--collapsed',
+                        help="write collapsed stacks to this file")
+    parser.add_argument('--limit', type=int, default=20,
+                        help="methods and lines to list")
+    parser.add_argument('--stackless', action='store_true')
+    parser.add_argument('--tail-calls', action='store_true')
+    args = parser.parse_args()
+
+    if args.program in CORPUS:
+        program = CORPUS[args.program]
+        size = args.size or program.sizes[-1]
+        source, inp = program.source, program.inputs(size)
+    else:
+        with open(args.program) as f:
+            source = f.read()
+        inp = []
+        if args.input:
+            with open(args.input) as f:
+                inp = f.read().splitlines()
+
+    interpreter = Interpreter(console_output=False, inp=inp,
+                              stackless=args.stackless,
+                              tail_calls=args.tail_calls, profile=True)
+    interpreter.run(string_to_program(source))
+    print(interpreter.taster.report(args.limit))
+    if args.collapsed:
+        with open(args.collapsed, 'w') as f:
+            f.write(interpreter.taster.collapsed() + '\n')
+
+
+if __name__ == '__main__':
+    main()
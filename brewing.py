@@ -0,0 +1,2500 @@
+"""
+Engine shared by the v1, v2 and v3 interpreters: loading classes, boxed
+values and the operators on them, and the evaluators, plain and stackless
+
+Each interpreter module is a dialect front-end on top of this: a Barista
+naming its Dialect, which says what that version of Brewin allows on top of
+the untyped core of v1 (types, inheritance, let, default values, templates,
+exceptions), along with whatever options only that version offers
+
+Reference:
+
+Barista - interpreter of a dialect;
+Dialect - what a version of Brewin allows;
+
+Recipe - class definition;
+fragrance - class;
+flavor - secondary class;
+cuppa - object;
+tea - new object/copy of class definition;
+cup_of_the_day - main object;
+
+Formula - template definition;
+
+Instruction - method;
+brew - object's method;
+steep - copy of method;
+recommended_brew - main object's method;
+service - result of a method call;
+order - result of a statement;
+
+Tin - variable;
+can - instantiated Tin;
+bag - copy of variable;
+
+Ingredient - boxed value;
+beans - instantiated Ingredient;
+Pour - string built up by +;
+milk - secondary instantiated Ingredient;
+grounds - value;
+cream - secondary value;
+leaf - copy of field value;
+roast - value after unary operation;
+blend - value after binary operation;
+
+Plate - stack frame;
+Tray - what a run carries to every stack frame;
+Watch - what is watching a run;
+
+Mug - method call frame on the explicit stack;
+percolate - run on the explicit stack;
+
+Refill - keyword of a call in tail position;
+Kettle - keyword of a let, with its variables planned;
+Shot - operator of an int-only operation;
+refill - run tail calls in the calling frame;
+Tab - return checks left pending by tail calls;
+
+Complaint - boxed exception;
+"""
+
+from typing import Callable, Union, Tuple, Any, NamedTuple
+import collections
+import copy
+import functools
+import operator
+import pprint
+import sys
+
+from intbase import InterpreterBase, ErrorType
+from bparser import BParser, StringWithLineNumber as SWLN
+from sinks import console_sink
+from tracing import Hooks, print_event
+
+
+InputFun = Callable[[], str]
+OutputFun = Callable[[str], None] | None
+ErrorFun = Callable[[ErrorType, str, int], None]
+BrewinTypes = Union[SWLN, int, str, bool, 'Recipe', None]
+isSWLN = lambda token: isinstance(token, SWLN)
+T2L = (lambda template: [SWLN(btype, template.line_num) for btype
+                         in template.split(InterpreterBase.TYPE_CONCAT_CHAR)])
+isVarType = (lambda token, me, classes:
+             token in {InterpreterBase.INT_DEF, InterpreterBase.STRING_DEF,
+                       InterpreterBase.BOOL_DEF, me.name}.union(classes))
+isMethodType = (lambda token, me, classes:
+                token in {InterpreterBase.INT_DEF, InterpreterBase.STRING_DEF,
+                          InterpreterBase.BOOL_DEF, InterpreterBase.VOID_DEF,
+                          me.name}.union(classes))
+debug = lambda *values: print(*values, file=sys.stderr, flush=True)
+THROWING = object()
+REFILLING = object()
+
+
+class Dialect(NamedTuple):
+    """
+    What a version of Brewin allows on top of the untyped core: classes of
+    fields and methods, and the statements and expressions of v1
+
+    typed is whether fields, parameters, methods and let variables declare
+    types, which are then checked; untyped ones have None for their type
+
+    arity is the error a call with the wrong number of arguments raises
+    """
+    typed: bool
+    inheritance: bool
+    lets: bool
+    defaults: bool
+    templates: bool
+    exceptions: bool
+    arity: ErrorType
+
+
+class Barista(InterpreterBase):
+    """
+    Interpreter of the Brewin dialect its front-end names in DIALECT
+    """
+    DIALECT: Dialect
+    stackless = False
+    max_depth = None
+    tail_calls = False
+
+    def __init__(self, console_output=True, inp=None, trace_output=False,
+                 sink=None, source=None):
+        """
+        Printed lines go to sink (see sinks), by default written to stdout if
+        console_output is set and all kept for get_output
+
+        Lines for inputi and inputs come from source (see sources) if given,
+        otherwise from inp or stdin as InterpreterBase.get_input reads them
+
+        With trace_output set, the program's tokens and classes are written to
+        stderr as it loads, and each event of the run as it happens; other
+        callbacks can be registered on hooks (see tracing)
+        """
+        super().__init__(console_output, inp)
+        self.trace_output = trace_output
+        self.sink = console_sink(console_output) if sink is None else sink
+        self.source = super().get_input if source is None else source
+        self.hooks = Hooks()
+        if trace_output:
+            self.hooks.add(print_event)
+
+    def run(self, program: list[str]):
+        self.load(self.parse(program))
+        self.execute()
+
+    def parse(self, program: list[str]) -> list:
+        well_formed, tokens = BParser.parse(program)
+
+        if not well_formed:
+            super().error(ErrorType.SYNTAX_ERROR, tokens)
+
+        if self.trace_output:
+            debug("Line numbers:")
+            pprint.pprint(tokens, stream=sys.stderr)
+            debug()
+
+        return tokens
+
+    def load(self, tokens: list, waiter: Any = None):
+        """
+        Loads the classes and templates of a parsed program, whose errors
+        are reported through waiter if given, instead of this interpreter
+        """
+        dialect = self.DIALECT
+        self.init(waiter)
+
+        for class_def in tokens:
+            match class_def:
+                case [InterpreterBase.CLASS_DEF, name, *_] if isSWLN(name):
+                    self.classes[name] = None
+                case [InterpreterBase.TEMPLATE_CLASS_DEF, name, *_
+                      ] if dialect.templates and isSWLN(name):
+                    self.templates[name] = None
+                case _:
+                    super().error(ErrorType.SYNTAX_ERROR,
+                                  f"Not a class: {class_def}")
+
+        if self.tail_calls:
+            mark_tail_calls(tokens)
+        if dialect.typed:
+            mark_int_operations(tokens)
+
+        for class_def in tokens:
+            match class_def:
+                case [InterpreterBase.CLASS_DEF, name,
+                      InterpreterBase.INHERITS_DEF, parent_name, *body
+                      ] if (dialect.inheritance and isSWLN(name)
+                            and isSWLN(parent_name)):
+                    self.add_class(name, parent_name, body)
+                case [InterpreterBase.CLASS_DEF, name, *body] if isSWLN(name):
+                    self.add_class(name, None, body)
+                case [InterpreterBase.TEMPLATE_CLASS_DEF, name, field_types,
+                      *body] if isSWLN(name) and all(map(isSWLN, field_types)):
+                    self.add_template(name, field_types, body)
+                case _:
+                    super().error(ErrorType.SYNTAX_ERROR,
+                                  f"Not a class: {class_def}")
+
+        if self.trace_output:
+            debug("Parsed classes:")
+            for recipe in self.classes.values():
+                debug(f"  class {recipe.name}")
+                debug("  fields:")
+                for name, ingredient in recipe.fields.items():
+                    debug(f"    {name}={ingredient.value}")
+                debug("  methods:")
+                for instruction in recipe.methods.values():
+                    debug(f"    {instruction.name}({instruction.formals})=")
+                    debug(f"{pprint.pformat(instruction.statement)}")
+            debug("\nStarting execution...")
+
+    def execute(self):
+        try:
+            self.serve_main()
+        finally:
+            self.sink.flush()
+
+    def watchers(self) -> list:
+        """
+        What is to watch the next run, innermost first (see Watch)
+        """
+        tracer = self.hooks.tracer()
+        return [] if tracer is None else [tracer]
+
+    def serve_main(self):
+        try:
+            cup_of_the_day = copy.copy(
+                self.classes[InterpreterBase.MAIN_CLASS_DEF]
+            )
+        except KeyError:
+            super().error(ErrorType.TYPE_ERROR, "Main class not found")
+
+        watchers = self.watchers()
+        tray = Tray(self.source,
+                    None if self.sink.discards else self.sink.write,
+                    super().error, Watch(*watchers) if watchers else None)
+        try:
+            if self.stackless:
+                service = percolate(cup_of_the_day,
+                                    InterpreterBase.MAIN_FUNC_DEF, (),
+                                    first_call=True, me=cup_of_the_day,
+                                    exception=None, max_depth=self.max_depth,
+                                    tray=tray)
+            else:
+                service = cup_of_the_day.call_method(
+                    InterpreterBase.MAIN_FUNC_DEF,
+                    first_call=True,
+                    me=cup_of_the_day,
+                    exception=None,
+                    tray=tray
+                )
+        except KeyError:
+            super().error(ErrorType.NAME_ERROR, "Main method not found",
+                          cup_of_the_day.name.line_num)
+        except ValueError:
+            super().error(ErrorType.NAME_ERROR,
+                          "Main method cannot accept arguments",
+                          (cup_of_the_day.methods[InterpreterBase.MAIN_FUNC_DEF]
+                           .name.line_num))
+        except NameError as e:
+            super().error(ErrorType.NAME_ERROR, str(e),
+                          (cup_of_the_day.methods[InterpreterBase.MAIN_FUNC_DEF]
+                           .name.line_num))
+        except TypeError as e:
+            super().error(ErrorType.TYPE_ERROR, str(e),
+                          (cup_of_the_day.methods[InterpreterBase.MAIN_FUNC_DEF]
+                           .name.line_num))
+
+        if type(service) is Complaint:
+            raise service
+
+    def reset(self):
+        super().reset()
+        self.sink.clear()
+
+    def get_input(self):
+        return self.source()
+
+    def output(self, val):
+        self.sink.write(val)
+
+    def get_output(self):
+        return self.sink.lines()
+
+    def init(self, waiter: Any = None):
+        self.classes: dict[SWLN, Recipe | None] = {}
+        self.templates: dict[SWLN, Formula | None] = {}
+        self.errors = waiter.error if waiter else super().error
+
+    def stock(self):
+        """
+        Makes every template instantiation the loaded classes name, and those
+        the instantiations name in turn, so that running the program never
+        adds to classes
+
+        An instantiation that cannot be made is left for the run to report,
+        as it would be without stocking
+        """
+        stocked = set(self.classes)
+        pending = list(self.classes.values())
+        while pending:
+            for token in pending.pop().tokens():
+                if (token in stocked
+                        or InterpreterBase.TYPE_CONCAT_CHAR not in token):
+                    continue
+                stocked.add(token)
+                temp_name, *types = T2L(token)
+                formula = self.templates.get(temp_name)
+                if (formula is None or len(types) != len(formula.field_types)
+                        or not all(isVarType(btype, formula, self.classes)
+                                   for btype in types)):
+                    continue
+                try:
+                    pending.append(formula.compile(*types))
+                except RuntimeError:
+                    self.error_type = self.error_line = None
+
+    def add_class(self, name: SWLN, parent_name: SWLN | None, body: list):
+        if name in self.classes and self.classes[name]:
+            super().error(ErrorType.TYPE_ERROR, f"Duplicate classes: {name}",
+                          name.line_num)
+        self.classes[name] = Recipe(name, parent_name, body, self.classes,
+                                    self.templates, self.DIALECT, self.errors,
+                                    self.trace_output)
+
+    def add_template(self, name: SWLN, field_types: list[SWLN], body: list):
+        if name in self.templates and self.templates[name]:
+            super().error(ErrorType.TYPE_ERROR, f"Duplicate templates: {name}",
+                          name.line_num)
+        self.templates[name] = Formula(name, field_types, body, self.classes,
+                                       self.templates, self.DIALECT,
+                                       self.errors, self.trace_output)
+
+
+class Recipe:
+    """
+    Class definition
+    """
+    def __init__(self, name: SWLN, parent_name: SWLN | None, body: list,
+                 classes: dict[SWLN, 'Recipe'],
+                 templates: dict[SWLN, 'Formula'], dialect: Dialect,
+                 error: ErrorFun, trace_output: bool) -> None:
+        self.name = name
+        self.classes = classes
+        self.templates = templates
+        self.dialect = dialect
+        self.error = error
+        self.trace_output = trace_output
+        self.fields: dict[SWLN, Tin] = {}
+        self.methods: dict[SWLN, Instruction] = {}
+
+        if parent_name:
+            try:
+                self.parent = copy.copy(classes[parent_name])
+            except KeyError:
+                self.error(ErrorType.TYPE_ERROR,
+                           f"Class {parent_name} not defined above",
+                           parent_name.line_num)
+        else:
+            self.parent = None
+
+        for definition in body:
+            match definition:
+                case [InterpreterBase.FIELD_DEF, name, value
+                      ] if not dialect.typed and isSWLN(name) and isSWLN(value):
+                    self.add_field(name, None, value)
+                case [InterpreterBase.METHOD_DEF, name, list(params), statement
+                      ] if (not dialect.typed and isSWLN(name)
+                            and all(map(isSWLN, params))):
+                    self.add_method(name, None, dict.fromkeys(params),
+                                    statement)
+                case [InterpreterBase.FIELD_DEF, btype, name, value
+                      ] if (dialect.typed and isSWLN(btype) and isSWLN(name)
+                            and isSWLN(value)):
+                    self.add_field(name, btype, value)
+                case [InterpreterBase.FIELD_DEF, btype, name
+                      ] if dialect.defaults and isSWLN(btype) and isSWLN(name):
+                    temp_name, *types = T2L(btype)
+                    match btype:
+                        case InterpreterBase.INT_DEF:
+                            self.add_field(name, btype, 0)
+                        case InterpreterBase.STRING_DEF:
+                            self.add_field(name, btype, "")
+                        case InterpreterBase.BOOL_DEF:
+                            self.add_field(name, btype, False)
+                        case class_name if isVarType(class_name, self,
+                                                     self.classes):
+                            self.add_field(name, btype, None)
+                        case class_name if temp_name in self.templates:
+                            try:
+                                self.templates[temp_name].compile(*types)
+                            except ValueError:
+                                self.error(ErrorType.TYPE_ERROR,
+                                           f"Template created with wrong "
+                                           f"number of types: {temp_name}",
+                                           temp_name.line_num)
+                            self.add_field(name, btype, None)
+                        case _:
+                            self.error(ErrorType.TYPE_ERROR,
+                                       f"Class {btype} not defined above",
+                                       btype.line_num)
+                case [InterpreterBase.METHOD_DEF, btype, name, params,
+                      statement] if (dialect.typed and isSWLN(btype)
+                                     and isSWLN(name)):
+                    self.add_method(name, btype, params, statement)
+                case _:
+                    self.error(ErrorType.SYNTAX_ERROR,
+                               f"Not a field or method: {definition}")
+
+        try:
+            self.rank = classes[self.name].rank
+            self.lineage = classes[self.name].lineage
+        except (KeyError, AttributeError):
+            self.rank = (list(classes).index(self.name)
+                         if self.name in classes else len(classes))
+            self.lineage = ((1 << self.rank)
+                            | (self.parent.lineage if self.parent else 0))
+
+    def __copy__(self):
+        tea = Recipe(self.name, self.parent.name if self.parent else None, [],
+                     self.classes, self.templates, self.dialect, self.error,
+                     self.trace_output)
+        for name, bag in self.fields.items():
+            beans = Ingredient(bag.value.value, self.error, self.trace_output)
+            beans.btype = bag.value.btype
+            tea.fields[name] = Tin.bound(name, bag.btype, beans, bag.check,
+                                         self.classes, self.templates,
+                                         self.error, self.trace_output)
+        # shared, so that no object refers back to itself through its methods
+        tea.methods = self.methods
+        return tea
+
+    def __str__(self) -> str:
+        return f'<class {self.name}>'
+
+    def add_field(self, name: SWLN, btype: SWLN | None, value: BrewinTypes):
+        if name in self.fields:
+            self.error(ErrorType.NAME_ERROR,
+                       f"Duplicate fields in {self.name}: {name}",
+                       name.line_num)
+        try:
+            beans = Ingredient(value, self.error, self.trace_output)
+        except ValueError:
+            self.error(ErrorType.SYNTAX_ERROR, f"Not a valid value: {value}",
+                       value.line_num)
+        try:
+            self.fields[name] = Tin(name, btype, beans, self, self.classes,
+                                    self.templates, self.error,
+                                    self.trace_output)
+        except TypeError as e:
+            self.error(ErrorType.TYPE_ERROR, str(e), value.line_num)
+
+    def add_method(self, name: SWLN, btype: SWLN | None,
+                   params: dict[SWLN, SWLN | None] | Any, statement):
+        if name in self.methods:
+            self.error(ErrorType.NAME_ERROR,
+                       f"Duplicate methods in {self.name}: {name}",
+                       name.line_num)
+        self.methods[name] = Instruction(name, btype, params, statement, self,
+                                         self.classes, self.templates,
+                                         self.error, self.trace_output)
+
+    def tokens(self):
+        """
+        Every token of the class's own fields and methods
+        """
+        for can in self.fields.values():
+            if can.btype is not None:
+                yield can.btype
+        for instruction in self.methods.values():
+            if instruction.btype is not None:
+                yield instruction.btype
+            statements = [instruction.statement,
+                          *filter(None, instruction.formals.values())]
+            while statements:
+                statement = statements.pop()
+                if isSWLN(statement):
+                    yield statement
+                else:
+                    statements.extend(statement)
+
+    def is_instance(self, class_name: SWLN) -> bool:
+        flavor = self.classes.get(class_name)
+        if flavor is None:
+            return self.name == class_name
+        return bool(self.lineage >> flavor.rank & 1)
+
+    def is_related(self, flavor: 'Recipe') -> bool:
+        """
+        Whether objects of the two classes can be compared; in an untyped
+        dialect any two can
+        """
+        return bool(not self.dialect.typed
+                    or self.lineage >> flavor.rank & 1
+                    or flavor.lineage >> self.rank & 1)
+
+    def find_method(self, name: SWLN, args: tuple['Ingredient', ...],
+                    first_call: bool, me: 'Recipe'
+                    ) -> tuple['Recipe', 'Instruction', dict[SWLN, 'Tin'],
+                               'Recipe']:
+        """
+        Finds and binds the method the same way call_method does, without
+        running it
+
+        Returns the class the method was found in, the method, its parameters
+        and the object it runs as
+
+        Throws KeyError if method not found
+
+        Throws ValueError on wrong number of arguments
+
+        Throws NameError on wrong type passed in
+        """
+        recipe = self
+        me = self if first_call else me
+        while recipe.parent:
+            try:
+                parameters = recipe.methods[name].bind(args)
+                break
+            except (KeyError, ValueError, NameError, TypeError):
+                recipe = recipe.parent
+        else:
+            parameters = recipe.methods[name].bind(args)
+        return recipe, recipe.methods[name], parameters, me
+
+    def call_method(self, name: SWLN, *args: 'Ingredient', first_call: bool,
+                    me: 'Recipe', exception: Union['Ingredient', None],
+                    tray: 'Tray') -> Union['Ingredient', 'Complaint', None]:
+        """
+        Runs the method for the run tray belongs to
+
+        Returns the unraised Complaint if the method throws
+
+        Throws KeyError if method not found
+
+        Throws ValueError on wrong number of arguments
+
+        Throws NameError on wrong type passed in
+
+        Throws TypeError on wrong type returned
+        """
+        if self.parent:
+            try:
+                return self.methods[name].call(*args, recipe=self,
+                                               me=self if first_call else me,
+                                               exception=exception, tray=tray)
+            except (KeyError, ValueError, NameError, TypeError):
+                pass
+            return self.parent.call_method(name, *args, first_call=False,
+                                           me=self if first_call else me,
+                                           exception=exception, tray=tray)
+        else:
+            return self.methods[name].call(*args, recipe=self,
+                                           me=self if first_call else me,
+                                           exception=exception, tray=tray)
+
+
+class Formula():
+    """
+    Template definition
+    """
+    def __init__(self, name: SWLN, field_types: list[SWLN], body: list,
+                 classes: dict[SWLN, Recipe], templates: dict[SWLN, 'Formula'],
+                 dialect: Dialect, error: ErrorFun, trace_output: bool) -> None:
+        self.name = name
+        self.field_types = field_types
+        self.body = body
+        self.classes = classes
+        self.templates = templates
+        self.dialect = dialect
+        self.error = error
+        self.trace_output = trace_output
+
+    def substitute_types(self, body, type_map: dict[SWLN, SWLN]):
+        if isSWLN(body):
+            if body in type_map:
+                return type_map[body]
+            elif len(l := T2L(body)) > 1:
+                return SWLN(
+                    InterpreterBase.TYPE_CONCAT_CHAR.join(
+                        self.substitute_types(t, type_map) for t in l
+                    ),
+                    body.line_num
+                )
+            else:
+                return body
+        return [ self.substitute_types(part, type_map) for part in body ]
+
+    def compile(self, *types: SWLN) -> Recipe:
+        """
+        Throws ValueError on wrong number of types
+        """
+        name = SWLN(InterpreterBase.TYPE_CONCAT_CHAR.join([self.name, *types]),
+                    self.name.line_num)
+        if name in self.classes:
+            return self.classes[name]
+        if self.trace_output:
+            debug(f"Compiling {name}")
+        if self.trace_output:
+            debug(f"{self.name} got {types=}")
+        for btype in types:
+            if self.trace_output:
+                debug(f"{self.name} got type {btype}")
+            if not isVarType(btype, self, self.classes):
+                self.error(ErrorType.TYPE_ERROR,
+                           f"Class {btype} not defined above", btype.line_num)
+        type_map = {field_type: btype for field_type, btype
+                    in zip(self.field_types, types, strict=True)}
+        if self.trace_output:
+            debug(f"{self.name}@{'@'.join(types)} type map: {type_map}")
+        body = self.substitute_types(self.body, type_map)
+        if self.trace_output:
+            debug(f"Body parsed from {self.name}@{'@'.join(types)}:")
+            debug(pprint.pformat(body))
+        cuppa = Recipe(name, None, body, self.classes, self.templates,
+                       self.dialect, self.error, self.trace_output)
+        self.classes[name] = cuppa
+        return cuppa
+
+
+class Tin:
+    """
+    Variable definition
+    """
+    def __init__(self, name: SWLN, btype: SWLN | None,
+                 boxed_value: 'Ingredient', me: Recipe,
+                 classes: dict[SWLN, Recipe], templates: dict[SWLN, Formula],
+                 error: ErrorFun, trace_output: bool) -> None:
+        """
+        Throws TypeError on incompatible type
+        """
+        self.name = name
+        self.classes = classes
+        self.templates = templates
+        self.error = error
+        self.trace_output = trace_output
+
+        if btype is None or isVarType(btype, me, classes):
+            self.btype = btype
+        elif (temp_name := T2L(btype)[0]) in templates:
+            try:
+                templates[temp_name].compile(*T2L(btype)[1:])
+            except ValueError:
+                self.error(ErrorType.TYPE_ERROR,
+                           f"Template created with wrong number of types: "
+                           f"{temp_name}",
+                           temp_name.line_num)
+            self.btype = btype
+        else:
+            self.error(ErrorType.TYPE_ERROR, f"Class {btype} not defined above",
+                       btype.line_num)
+
+        self.check = assignment_check(self.btype, classes)
+        self.set_value(boxed_value)
+
+    @classmethod
+    def bound(cls, name: SWLN, btype: SWLN | None, boxed_value: 'Ingredient',
+              check: Callable[['Ingredient'], None],
+              classes: dict[SWLN, Recipe], templates: dict[SWLN, Formula],
+              error: ErrorFun, trace_output: bool) -> 'Tin':
+        """
+        Makes a Tin for a value already passed through check, skipping the
+        type resolution done by __init__
+        """
+        can = cls.__new__(cls)
+        can.name = name
+        can.classes = classes
+        can.templates = templates
+        can.error = error
+        can.trace_output = trace_output
+        can.btype = btype
+        can.check = check
+        can.value = boxed_value
+        return can
+
+    def set_value(self, boxed_value: 'Ingredient'):
+        """
+        Throws TypeError on incompatible type
+        """
+        self.check(boxed_value)
+        self.value = boxed_value
+
+
+def remade(factory: Callable[..., Callable]) -> Callable[..., Callable]:
+    """
+    Has every function factory makes carry how to make it again, as remake,
+    so that a snapshot can store it
+    """
+    @functools.wraps(factory)
+    def make(*args) -> Callable:
+        made = factory(*args)
+        made.remake = make, args
+        return made
+    return make
+
+
+PRIMITIVE_TYPES = {InterpreterBase.INT_DEF: int,
+                   InterpreterBase.STRING_DEF: str,
+                   InterpreterBase.BOOL_DEF: bool}
+
+
+@remade
+def assignment_check(btype: SWLN | None, classes: dict[SWLN, Recipe]
+                     ) -> Callable[['Ingredient'], None]:
+    """
+    Precomputes the type check for storing into a variable of type btype
+
+    The check tags a fitting boxed value with btype, and throws TypeError on
+    incompatible type; an untyped variable takes any value as it is
+    """
+    match btype:
+        case None:
+            def check(boxed_value: Ingredient):
+                pass
+        case InterpreterBase.INT_DEF | InterpreterBase.STRING_DEF \
+                | InterpreterBase.BOOL_DEF:
+            grounds_type = PRIMITIVE_TYPES[btype]
+
+            def check(boxed_value: Ingredient):
+                # a Pour is a string, without joining its pieces to check
+                if (type(boxed_value) is Pour and grounds_type is str
+                        or type(boxed_value.value) is grounds_type):
+                    boxed_value.btype = btype
+                    return
+                raise TypeError(assignment_error(boxed_value.value, btype))
+        case class_name:
+            def check(boxed_value: Ingredient):
+                grounds = boxed_value.value
+                if grounds is None:
+                    if (boxed_value.btype and boxed_value.btype in classes
+                        and not classes[boxed_value.btype]
+                                    .is_instance(class_name)):
+                        raise TypeError(f"Class {boxed_value.btype} not "
+                                        f"derived from {class_name}")
+                    boxed_value.btype = btype
+                    return
+                try:
+                    if grounds.is_instance(class_name):
+                        boxed_value.btype = btype
+                        return
+                    raise TypeError(f"Class {grounds.name} not derived from "
+                                    f"{class_name}")
+                except AttributeError:
+                    pass
+                raise TypeError(assignment_error(grounds, btype))
+    return check
+
+
+def assignment_error(grounds: BrewinTypes, btype: SWLN) -> str:
+    match grounds:
+        case int():
+            return (f"Cannot assign value of type {InterpreterBase.INT_DEF} "
+                    f"to variable of type {btype}")
+        case str():
+            return (f"Cannot assign value of type {InterpreterBase.STRING_DEF} "
+                    f"to variable of type {btype}")
+        case bool():
+            return (f"Cannot assign value of type {InterpreterBase.BOOL_DEF} "
+                    f"to variable of type {btype}")
+        case _:
+            return f"Cannot assign object to variable of type {btype}"
+
+
+@remade
+def return_check(btype: SWLN | None, classes: dict[SWLN, Recipe]
+                 ) -> Callable[['Ingredient'], 'Ingredient']:
+    """
+    Precomputes the type check for returning from a method of type btype
+
+    The check tags a fitting boxed value with btype and returns it, and
+    throws TypeError on wrong type returned; an untyped method returns any
+    value as it is
+    """
+    match btype:
+        case None:
+            def check(beans: Ingredient) -> Ingredient:
+                return beans
+        case InterpreterBase.INT_DEF | InterpreterBase.STRING_DEF \
+                | InterpreterBase.BOOL_DEF:
+            grounds_type = PRIMITIVE_TYPES[btype]
+
+            def check(beans: Ingredient) -> Ingredient:
+                if (type(beans) is Pour and grounds_type is str
+                        or type(beans.value) is grounds_type):
+                    beans.btype = btype
+                    return beans
+                raise TypeError(return_error(beans.value, btype))
+        case InterpreterBase.VOID_DEF:
+            def check(beans: Ingredient) -> Ingredient:
+                raise TypeError(f"Cannot return any value from method of "
+                                f"type {InterpreterBase.VOID_DEF}")
+        case class_name:
+            def check(beans: Ingredient) -> Ingredient:
+                grounds = beans.value
+                if grounds is None:
+                    if (beans.btype and beans.btype in classes
+                        and not classes[beans.btype].is_instance(class_name)):
+                        raise TypeError(f"Class {beans.btype} not derived "
+                                        f"from {class_name}")
+                    beans.btype = btype
+                    return beans
+                try:
+                    if grounds.is_instance(class_name):
+                        beans.btype = btype
+                        return beans
+                    raise TypeError(f"Returned object class {grounds.name} "
+                                    f"not derived from {class_name}")
+                except AttributeError:
+                    pass
+                raise TypeError(return_error(grounds, btype))
+    return check
+
+
+def return_error(grounds: BrewinTypes, btype: SWLN) -> str:
+    match grounds:
+        case int():
+            return (f"Cannot return value of type {InterpreterBase.INT_DEF} "
+                    f"from method of type {btype}")
+        case str():
+            return (f"Cannot return value of type {InterpreterBase.STRING_DEF} "
+                    f"from method of type {btype}")
+        case bool():
+            return (f"Cannot return value of type {InterpreterBase.BOOL_DEF} "
+                    f"from method of type {btype}")
+        case _:
+            return f"Cannot return object from method of type {btype}"
+
+
+@remade
+def default_value(btype: SWLN | None, error: ErrorFun, trace_output: bool
+                  ) -> Callable[[], Union['Ingredient', None]]:
+    """
+    Precomputes what a method of type btype returns when it returns nothing;
+    an untyped method returns no value, as a void one does
+    """
+    match btype:
+        case None | InterpreterBase.VOID_DEF:
+            return lambda: None
+        case InterpreterBase.INT_DEF:
+            grounds = 0
+        case InterpreterBase.STRING_DEF:
+            grounds = ""
+        case InterpreterBase.BOOL_DEF:
+            grounds = False
+        case class_name:
+            grounds = None
+
+    def default() -> Ingredient:
+        beans = Ingredient(grounds, error, trace_output)
+        beans.btype = btype
+        return beans
+    return default
+
+
+class Instruction:
+    """
+    Method definition
+    """
+    def __init__(self, name: SWLN, btype: SWLN | None,
+                 params: dict[SWLN, SWLN | None] | Any, statement, me: Recipe,
+                 classes: dict[SWLN, Recipe], templates: dict[SWLN, Formula],
+                 error: ErrorFun, trace_output: bool) -> None:
+        self.name = name
+        self.statement = statement
+        self.me = me
+        self.classes = classes
+        self.templates = templates
+        self.dialect = me.dialect
+        self.error = error
+        self.trace_output = trace_output
+        self.formals: dict[SWLN, SWLN | None] = {}
+
+        if btype is None or isMethodType(btype, me, classes):
+            self.btype = btype
+        elif (temp_name := T2L(btype)[0]) in templates:
+            try:
+                templates[temp_name].compile(*T2L(btype)[1:])
+            except ValueError:
+                self.error(ErrorType.TYPE_ERROR,
+                           f"Template created with wrong number of types: "
+                           f"{temp_name}",
+                           temp_name.line_num)
+            self.btype = btype
+        else:
+            self.error(ErrorType.TYPE_ERROR, f"Class {btype} not defined above",
+                       btype.line_num)
+
+        if type(params) == dict:
+            self.formals = params
+        else:
+            for param in params:
+                match param:
+                    case [btype, formal] if isSWLN(btype) and isSWLN(formal):
+                        self.add_parameter(formal, btype)
+                    case _:
+                        error(ErrorType.SYNTAX_ERROR,
+                              f"Malformed parameter: {param}", name.line_num)
+
+        self.plan = [(formal, btype, assignment_check(btype, classes))
+                     for formal, btype in self.formals.items()]
+        mark_lets(statement, me, classes)
+        self.check_return = return_check(self.btype, classes)
+        self.default = default_value(self.btype, error, trace_output)
+
+    def call(self, *args: 'Ingredient', recipe: Recipe, me: Recipe,
+             exception: Union['Ingredient', None], tray: 'Tray'
+             ) -> Union['Ingredient', 'Complaint', None]:
+        """
+        Runs the method on recipe, the part of me it was found in
+
+        Returns the unraised Complaint if the method throws
+
+        Throws ValueError on wrong number of arguments
+
+        Throws NameError on wrong type passed in
+
+        Throws TypeError on wrong type returned
+        """
+        parameters = self.bind(args)
+        order = evaluate_statement(self.statement,
+                                   Plate(me, exception, parameters, self,
+                                         recipe, tray))
+        if order[0] is REFILLING:
+            order = refill(order[1], self.dialect, tray)
+        return self.serve(*order)
+
+    def bind(self, args: tuple['Ingredient', ...]) -> dict[SWLN, Tin]:
+        """
+        Throws ValueError on wrong number of arguments
+
+        Throws NameError on wrong type passed in
+        """
+        if len(args) != len(self.plan):
+            raise ValueError(f"{self.name} takes {len(self.plan)} arguments")
+        parameters = {}
+        for (formal, btype, check), actual in zip(self.plan, args):
+            try:
+                check(actual)
+            except TypeError as e:
+                raise NameError(str(e))
+            parameters[formal] = Tin.bound(formal, btype, actual, check,
+                                           self.classes, self.templates,
+                                           self.error, self.trace_output)
+        return parameters
+
+    def serve(self, is_return: Any,
+              beans: Union['Ingredient', 'Complaint', None]
+              ) -> Union['Ingredient', 'Complaint', None]:
+        """
+        Turns the order left by the method body into the method's result
+
+        Throws TypeError on wrong type returned
+        """
+        if is_return is THROWING:
+            return beans
+        if is_return and beans:
+            return self.check_return(beans)
+        return self.default()
+
+    def add_parameter(self, name: SWLN, btype: SWLN):
+        if name in self.formals:
+            self.error(ErrorType.NAME_ERROR,
+                       f"Duplicate parameters in {self.name}: name",
+                       name.line_num)
+        temp_name, *types = T2L(btype)
+        if isVarType(btype, self.me, self.classes):
+            self.formals[name] = btype
+        elif temp_name in self.templates:
+            try:
+                self.templates[temp_name].compile(*types)
+            except ValueError:
+                self.error(ErrorType.TYPE_ERROR,
+                           f"Template created with wrong number of types: "
+                           f"{temp_name}",
+                           temp_name.line_num)
+            self.formals[name] = btype
+        else:
+            self.error(ErrorType.TYPE_ERROR, f"Class {btype} not defined above",
+                       btype.line_num)
+
+
+class Tray(NamedTuple):
+    """
+    What one run of a program carries down to the Plate of every call it
+    makes, so that runs sharing the program's classes stay apart: where its
+    input comes from, its output goes (None if nowhere) and its errors go
+
+    watch is what is watching the run, or None if nothing is
+    """
+    get_input: InputFun
+    output: OutputFun
+    error: ErrorFun
+    watch: Union['Watch', None]
+
+
+class Watch:
+    """
+    What is watching a run, made of watchers each of which may have:
+
+    wrap_statement, taking a statement evaluator (statement, stack) -> order
+    and giving back one to use in its place;
+
+    wrap_steps, the same for the generators percolate runs;
+
+    made, called with each object new makes, its line and the Plate making it;
+
+    plated, called with each Plate made for a call
+
+    The first watcher's wrappers are innermost, nearest the plain evaluators
+    """
+    def __init__(self, *watchers: Any) -> None:
+        def statement(statement, stack: Plate) -> tuple:
+            return evaluate_statement(statement, stack, True)
+
+        def steps(statement, stack: Plate):
+            return percolate_statement(statement, stack, True)
+
+        self.watchers = watchers
+        for watcher in watchers:
+            if hasattr(watcher, 'wrap_statement'):
+                statement = watcher.wrap_statement(statement)
+            if hasattr(watcher, 'wrap_steps'):
+                steps = watcher.wrap_steps(steps)
+        self.statement = statement
+        self.steps = steps
+        self.making = [watcher for watcher in watchers
+                       if hasattr(watcher, 'made')]
+        self.plating = [watcher for watcher in watchers
+                        if hasattr(watcher, 'plated')]
+
+    def made(self, cuppa: 'Recipe', line_num: int, stack: 'Plate'):
+        for watcher in self.making:
+            watcher.made(cuppa, line_num, stack)
+
+    def plated(self, stack: 'Plate'):
+        for watcher in self.plating:
+            watcher.plated(stack)
+
+
+class Plate:
+    """
+    Stack frame
+
+    One per method call, carrying everything the evaluator needs while the
+    method runs, so only the Plate is passed down from statement to
+    expression
+
+    Holds the local variables of every let in the method in a single array; a
+    let takes the slots from the end of the array onwards and gives them back
+    when it exits
+    """
+    __slots__ = ('me', 'super', 'exception', 'parameters', 'fields', 'classes',
+                 'templates', 'get_input', 'output', 'error', 'trace_output',
+                 'instruction', 'tray', 'watch', 'values', 'shadowed', 'slots',
+                 '__weakref__')
+
+    def __init__(self, me: Recipe, exception: Union['Ingredient', None],
+                 parameters: dict[SWLN, Tin], instruction: Instruction,
+                 recipe: Recipe, tray: Tray) -> None:
+        self.me = me
+        self.super = recipe.parent
+        self.exception = exception
+        self.parameters = parameters
+        self.fields = recipe.fields
+        self.classes = instruction.classes
+        self.templates = instruction.templates
+        self.get_input = tray.get_input
+        self.output = tray.output
+        self.error = tray.error
+        self.trace_output = instruction.trace_output
+        self.instruction = instruction
+        self.tray = tray
+        self.watch = tray.watch
+        self.values: list[Tin] = []
+        self.shadowed: list[int | None] = []
+        self.slots: dict[SWLN, int] = {}
+        if self.watch is not None:
+            self.watch.plated(self)
+
+    def add_variable(self, name: SWLN, btype: SWLN, value: BrewinTypes,
+                     start: int):
+        shadowed = self.slots.get(name)
+        if shadowed is not None and shadowed >= start:
+            self.error(ErrorType.NAME_ERROR,
+                       f"Duplicate local variable: {name}", name.line_num)
+        try:
+            beans = Ingredient(value, self.error, self.trace_output)
+        except ValueError:
+            self.error(ErrorType.SYNTAX_ERROR, f"Not a valid value: {value}",
+                       name.line_num)
+        try:
+            can = Tin(name, btype, beans, self.me, self.classes,
+                      self.templates, self.error, self.trace_output)
+        except TypeError as e:
+            self.error(ErrorType.TYPE_ERROR, str(e), btype.line_num)
+        self.slots[name] = len(self.values)
+        self.values.append(can)
+        self.shadowed.append(shadowed)
+
+    def add_planned(self, plan: list[tuple], start: int):
+        """
+        Makes a let's variables from its Kettle plan, as add_variable would
+        """
+        for name, btype, check, grounds in plan:
+            shadowed = self.slots.get(name)
+            if shadowed is not None and shadowed >= start:
+                self.error(ErrorType.NAME_ERROR,
+                           f"Duplicate local variable: {name}", name.line_num)
+            beans = Ingredient(grounds, self.error, self.trace_output)
+            try:
+                check(beans)
+            except TypeError as e:
+                self.error(ErrorType.TYPE_ERROR, str(e), btype.line_num)
+            self.slots[name] = len(self.values)
+            self.values.append(Tin.bound(name, btype, beans, check,
+                                         self.classes, self.templates,
+                                         self.error, self.trace_output))
+            self.shadowed.append(shadowed)
+
+    def add_variables(self, var_defs: list, keyword: SWLN) -> int:
+        """
+        Returns the first slot taken, to pass to clear once the let exits
+        """
+        start = len(self.values)
+        plan = getattr(keyword, 'plan', None)
+        if plan is not None:
+            self.add_planned(plan, start)
+            return start
+        line_num = keyword.line_num
+        for var_def in var_defs:
+            match var_def:
+                case [btype, name, value] if (isSWLN(btype) and isSWLN(name)
+                                              and isSWLN(value)):
+                    self.add_variable(name, btype, value, start)
+                case [btype, name] if (self.instruction.dialect.defaults
+                                       and isSWLN(btype) and isSWLN(name)):
+                    temp_name, *types = T2L(btype)
+                    match btype:
+                        case InterpreterBase.INT_DEF:
+                            self.add_variable(name, btype, 0, start)
+                        case InterpreterBase.STRING_DEF:
+                            self.add_variable(name, btype, "", start)
+                        case InterpreterBase.BOOL_DEF:
+                            self.add_variable(name, btype, False, start)
+                        case class_name if isVarType(class_name, self.me,
+                                                     self.classes):
+                            self.add_variable(name, btype, None, start)
+                        case class_name if temp_name in self.templates:
+                            try:
+                                self.templates[temp_name].compile(*types)
+                            except ValueError:
+                                self.error(ErrorType.TYPE_ERROR,
+                                           f"Template created with wrong "
+                                           f"number of types: {temp_name}",
+                                           temp_name.line_num)
+                            self.add_variable(name, btype, None, start)
+                        case _:
+                            self.error(ErrorType.TYPE_ERROR,
+                                       f"Class {btype} not defined above",
+                                       btype.line_num)
+                case _:
+                    self.error(ErrorType.SYNTAX_ERROR,
+                               f"Malformed local variable: {var_def}",
+                               line_num)
+        return start
+
+    def clear(self, start: int):
+        """
+        Gives back the slots from start onwards, uncovering any variables
+        they shadowed
+        """
+        for slot in range(len(self.values) - 1, start - 1, -1):
+            name = self.values[slot].name
+            shadowed = self.shadowed[slot]
+            if shadowed is None:
+                del self.slots[name]
+            else:
+                self.slots[name] = shadowed
+        del self.values[start:]
+        del self.shadowed[start:]
+
+    def get_variable(self, name: SWLN) -> Tin | None:
+        slot = self.slots.get(name)
+        if slot is None:
+            return None
+        return self.values[slot]
+
+
+class Ingredient:
+    """
+    Field definition
+    """
+    def __init__(self, value: BrewinTypes, error: ErrorFun,
+                 trace_output: bool) -> None:
+        """
+        Throws ValueError on invalid value
+        """
+        self.error = error
+        self.trace_output = trace_output
+        self.btype = None
+        self.is_super = False
+
+        match value:
+            case grounds if not isSWLN(grounds):
+                self.value = value
+            case InterpreterBase.NULL_DEF:
+                self.value = None
+            case InterpreterBase.TRUE_DEF:
+                self.value = True
+            case InterpreterBase.FALSE_DEF:
+                self.value = False
+            case str_or_int:
+                try:
+                    if str_or_int[0] == '"' and str_or_int[-1] == '"':
+                        self.value = str_or_int[1:-1]
+                    else:
+                        self.value = int(str_or_int)
+                except IndexError:
+                    self.error(ErrorType.SYNTAX_ERROR, "Blank value, somehow",
+                               value.line_num)
+
+    def __str__(self) -> str:
+        match self.value:
+            case True:
+                return InterpreterBase.TRUE_DEF
+            case False:
+                return InterpreterBase.FALSE_DEF
+            case None:
+                return InterpreterBase.NULL_DEF
+        return str(self.value)
+
+
+class Pour(Ingredient):
+    """
+    String value built up by +
+
+    Keeps the pieces and joins them only once the value is read, so a string
+    built from n appends costs O(n) instead of O(n^2); a Pour made by
+    appending to the last one made shares its list of pieces
+    """
+    def __init__(self, pieces: list[str], count: int, error: ErrorFun,
+                 trace_output: bool) -> None:
+        self.error = error
+        self.trace_output = trace_output
+        self.btype = None
+        self.is_super = False
+        self.pieces = pieces
+        self.count = count
+        self.flat = None
+
+    @property
+    def value(self) -> str:
+        if self.flat is None:
+            if self.count == len(self.pieces):
+                self.flat = ''.join(self.pieces)
+            else:
+                self.flat = ''.join(self.pieces[:self.count])
+        return self.flat
+
+    def pour(self, piece: str) -> 'Pour':
+        """
+        Appends piece, leaving this Pour as it was
+        """
+        if self.flat is not None:
+            pieces = [self.flat]
+        elif self.count == len(self.pieces):
+            pieces = self.pieces
+        else:
+            pieces = self.pieces[:self.count]
+        pieces.append(piece)
+        return Pour(pieces, len(pieces), self.error, self.trace_output)
+
+
+class Complaint(Exception):
+    """
+    Exception
+
+    Thrown Brewin exceptions are passed back up as values rather than raised;
+    see THROWING
+    """
+    def __init__(self, message: Ingredient) -> None:
+        """
+        Throws ValueError if message is not of type string
+        """
+        if type(message.value) != str:
+            raise ValueError(f"Non-string used as exception: {message}")
+
+        super().__init__(str(message))
+
+        self.message = message
+
+    def __str__(self) -> str:
+        return str(self.message)
+
+
+class Shot(SWLN):
+    """
+    Operator of an arithmetic operation or comparison whose operands are both
+    statically int, carrying the operation itself so that evaluating it skips
+    the search through apply_binary_operator
+
+    The operands are still checked to be ints before operate is applied; if
+    they are not, apply_binary_operator takes over as for any other operator
+    """
+    OPERATIONS = {
+        '+': operator.add,
+        '-': operator.sub,
+        '*': operator.mul,
+        '/': lambda left, right: int(left / right),
+        '%': operator.mod,
+        '<': operator.lt,
+        '>': operator.gt,
+        '<=': operator.le,
+        '>=': operator.ge,
+        '==': operator.eq,
+        '!=': operator.ne,
+    }
+
+    def __new__(cls, keyword: SWLN):
+        instance = super().__new__(cls, keyword, keyword.line_num)
+        instance.operate = cls.OPERATIONS[keyword]
+        return instance
+
+
+class Refill(SWLN):
+    """
+    Keyword of a call in tail position; returns is whether the call's value is
+    returned, as opposed to the call ending a void method
+    """
+    def __new__(cls, keyword: SWLN, returns: bool):
+        instance = super().__new__(cls, keyword, keyword.line_num)
+        instance.returns = returns
+        return instance
+
+
+class Kettle(SWLN):
+    """
+    Keyword of a let, carrying a (name, btype, check, grounds) for each of its
+    variables, as Instruction.plan does for parameters, so that running the
+    let only makes their values; plan is None for a let whose variables
+    cannot be planned while loading, which Plate.add_variables then makes
+    the long way
+    """
+    def __new__(cls, keyword: SWLN, plan: list[tuple] | None):
+        instance = super().__new__(cls, keyword, keyword.line_num)
+        instance.plan = plan
+        return instance
+
+
+def apply_unary_operator(unary_operator: SWLN, beans: Ingredient,
+                         error: ErrorFun, trace_output: bool) -> Ingredient:
+    grounds = beans.value
+    match unary_operator:
+        case '!' if type(grounds) == bool:
+            roast = bool(not grounds)
+        case _:
+            error(ErrorType.TYPE_ERROR,
+                f"No use of {unary_operator} is compatible with "
+                f"expression type: {type(grounds)}",
+                unary_operator.line_num)
+    return Ingredient(roast, error, trace_output)
+
+
+def apply_binary_operator(binary_operator: SWLN, beans: Ingredient,
+                          milk: Ingredient, classes: dict[SWLN, Recipe],
+                          error: ErrorFun, trace_output: bool) -> Ingredient:
+    cream = milk.value
+    if type(beans) is Pour and binary_operator == '+' and type(cream) == str:
+        return beans.pour(cream)
+    grounds = beans.value
+    if (type(binary_operator) is Shot and type(grounds) is int
+            and type(cream) is int):
+        return Ingredient(binary_operator.operate(grounds, cream), error,
+                          trace_output)
+    match binary_operator:
+        case '+'|'-'|'*'|'/'|'%'|'<'|'>'|'<='|'>='|'!='|'==' \
+                if type(grounds) == type(cream) == int:
+            blend = Shot.OPERATIONS[binary_operator](grounds, cream)
+        case '+' if type(grounds) == type(cream) == str:
+            return Pour([grounds, cream], 2, error, trace_output)
+        case '=='|'!='|'<'|'>'|'<='|'>=' \
+                if type(grounds) == type(cream) == str:
+            blend = Shot.OPERATIONS[binary_operator](grounds, cream)
+        case '!='|'==' if type(grounds) == type(cream) == bool:
+            blend = Shot.OPERATIONS[binary_operator](grounds, cream)
+        case '&' if type(grounds) == type(cream) == bool:
+            blend = bool(grounds and cream)
+        case '|' if type(grounds) == type(cream) == bool:
+            blend = bool(grounds or cream)
+        case '==' if ((grounds is None or isinstance(grounds, Recipe))
+                      and (cream is None or isinstance(cream, Recipe))):
+            if beans.btype:
+                fragrance = classes[beans.btype]
+            else:
+                fragrance = grounds
+            if milk.btype:
+                flavor = classes[milk.btype]
+            else:
+                flavor = milk
+            try:
+                if not fragrance.is_related(flavor):
+                    error(ErrorType.TYPE_ERROR,
+                          f"Classes {fragrance.name} and {flavor.name} "
+                          f"are not related",
+                          binary_operator.line_num)
+            except AttributeError:
+                pass
+            blend = bool(grounds is cream)
+        case '!=' if ((grounds is None or isinstance(grounds, Recipe))
+                      and (cream is None or isinstance(cream, Recipe))):
+            if beans.btype:
+                fragrance = classes[beans.btype]
+            else:
+                fragrance = grounds
+            if milk.btype:
+                flavor = classes[milk.btype]
+            else:
+                flavor = milk
+            try:
+                if not fragrance.is_related(flavor):
+                    error(ErrorType.TYPE_ERROR,
+                          f"Classes {fragrance.name} and {flavor.name} "
+                          f"are not related",
+                          binary_operator.line_num)
+            except AttributeError:
+                pass
+            blend = bool(grounds is not cream)
+        case _:
+            error(ErrorType.TYPE_ERROR,
+                f"No use of {binary_operator} is compatible with "
+                f"expression types: {type(grounds)}, {type(cream)}",
+                binary_operator.line_num)
+    return Ingredient(blend, error, trace_output)
+
+
+def find_variable(variable: SWLN, stack: Plate) -> Tin:
+    if can := stack.get_variable(variable):
+        return can
+    elif variable in stack.parameters:
+        return stack.parameters[variable]
+    elif variable in stack.fields:
+        return stack.fields[variable]
+    stack.error(ErrorType.NAME_ERROR, f"Variable not found: {variable}",
+                variable.line_num)
+
+
+def evaluate_expression(expression, stack: Plate) -> Ingredient | Complaint:
+    """
+    Guaranteed to return a boxed value (or throw a Brewin error if unable to),
+    unless a method called along the way threw, in which case the Complaint is
+    returned instead
+    """
+    match expression:
+        case [Shot() as shot, left_expression, right_expression]:
+            beans = evaluate_expression(left_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            milk = evaluate_expression(right_expression, stack)
+            if type(milk) is Complaint:
+                return milk
+            grounds = beans.value
+            cream = milk.value
+            if type(grounds) is int and type(cream) is int:
+                return Ingredient(shot.operate(grounds, cream), stack.error,
+                                  stack.trace_output)
+            return apply_binary_operator(shot, beans, milk, stack.classes,
+                                         stack.error, stack.trace_output)
+        case InterpreterBase.ME_DEF:
+            return Ingredient(stack.me, stack.error, stack.trace_output)
+        case InterpreterBase.SUPER_DEF if stack.instruction.dialect.inheritance:
+            if stack.super:
+                beans = Ingredient(stack.super, stack.error, stack.trace_output)
+                beans.is_super = True
+                return beans
+            else:
+                stack.error(ErrorType.TYPE_ERROR, "Class is not inherited",
+                            expression.line_num)
+        case InterpreterBase.EXCEPTION_VARIABLE_DEF \
+                if stack.instruction.dialect.exceptions:
+            if stack.exception:
+                return stack.exception
+            else:
+                stack.error(ErrorType.NAME_ERROR,
+                            "No exception has been thrown yet",
+                            expression.line_num)
+        case variable if (isSWLN(variable)
+                          and (can := stack.get_variable(variable))):
+            return can.value
+        case variable if isSWLN(variable) and variable in stack.parameters:
+            return stack.parameters[variable].value
+        case variable if isSWLN(variable) and variable in stack.fields:
+            return stack.fields[variable].value
+        case const if isSWLN(const):
+            try:
+                return Ingredient(const, stack.error, stack.trace_output)
+            except ValueError:
+                stack.error(ErrorType.NAME_ERROR,
+                            f"Variable not found: {const}", const.line_num)
+        case [InterpreterBase.CALL_DEF, obj_expression, method, *arguments
+              ] if isSWLN(method):
+            beans = evaluate_expression(obj_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            cuppa = beans.value
+            if cuppa is None:
+                stack.error(ErrorType.FAULT_ERROR,
+                            f"Trying to dereference nullptr",
+                            expression[0].line_num)
+            args = []
+            for argument in arguments:
+                milk = evaluate_expression(argument, stack)
+                if type(milk) is Complaint:
+                    return milk
+                args.append(milk)
+            try:
+                service = cuppa.call_method(
+                    method,
+                    *args,
+                    first_call=not beans.is_super,
+                    me=stack.me,
+                    exception=stack.exception,
+                    tray=stack.tray
+                )
+            except (KeyError, AttributeError, ValueError, NameError,
+                    TypeError) as e:
+                report_call_error(e, expression, stack.error,
+                                  stack.instruction.dialect)
+            if service is None:
+                stack.error(ErrorType.TYPE_ERROR,
+                            f"Method did not return a value: {method}",
+                            expression[0].line_num)
+            else:
+                return service
+        case [InterpreterBase.NEW_DEF, name] if isSWLN(name):
+            name, *types = T2L(name)
+            if types:
+                try:
+                    cuppa = stack.templates[name].compile(*types)
+                except KeyError:
+                    stack.error(ErrorType.TYPE_ERROR,
+                                f"Could not find template: {name}",
+                                expression[0].line_num)
+                except ValueError:
+                    stack.error(ErrorType.TYPE_ERROR,
+                                f"Template created with wrong number of types: "
+                                f"{name}",
+                                name.line_num)
+            else:
+                try:
+                    cuppa = stack.classes[name]
+                except KeyError:
+                    stack.error(ErrorType.TYPE_ERROR,
+                                f"Could not find class: {name}",
+                                expression[0].line_num)
+            beans = Ingredient(copy.copy(cuppa), stack.error,
+                               stack.trace_output)
+            if stack.watch is not None:
+                stack.watch.made(beans.value, expression[0].line_num, stack)
+            return beans
+        case [unary_operator, sub_expression] if isSWLN(unary_operator):
+            beans = evaluate_expression(sub_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            return apply_unary_operator(unary_operator, beans, stack.error,
+                                        stack.trace_output)
+        case [binary_operator, left_expression, right_expression
+              ] if isSWLN(binary_operator):
+            beans = evaluate_expression(left_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            milk = evaluate_expression(right_expression, stack)
+            if type(milk) is Complaint:
+                return milk
+            return apply_binary_operator(binary_operator, beans, milk,
+                                         stack.classes, stack.error,
+                                         stack.trace_output)
+        case _:
+            stack.error(ErrorType.SYNTAX_ERROR,
+                        f"Not a valid expression: {expression}")
+
+
+def evaluate_statement(statement, stack: Plate, watched: bool = False
+                       ) -> Tuple[bool, None | Ingredient]:
+    """
+    Returns a tuple of the form (<if the method is returning>, <the boxed value
+    of the return, if there is one>)
+
+    A thrown exception is returned as (THROWING, <the Complaint>), which the
+    enclosing statements pass up like a return until a try catches it
+
+    A call marked as a tail call is not made; it is returned as (REFILLING,
+    <the call request>) for refill to make in place of the current method
+
+    If the run is watched, the statement goes through its Watch first, which
+    hands it back with watched set
+    """
+    if stack.watch is not None and not watched:
+        return stack.watch.statement(statement, stack)
+    match statement:
+        case [InterpreterBase.BEGIN_DEF, *sub_statements] if sub_statements:
+            for sub_statement in sub_statements:
+                latest_order = evaluate_statement(sub_statement, stack)
+                if latest_order[0]:
+                    return latest_order
+        case [InterpreterBase.CALL_DEF, expression, method, *arguments
+              ] if isSWLN(method):
+            beans = evaluate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            cuppa = beans.value
+            if cuppa is None:
+                stack.error(ErrorType.FAULT_ERROR,
+                            f"Trying to dereference nullptr",
+                            statement[0].line_num)
+            args = []
+            for argument in arguments:
+                milk = evaluate_expression(argument, stack)
+                if type(milk) is Complaint:
+                    return THROWING, milk
+                args.append(milk)
+            if type(statement[0]) is Refill:
+                return REFILLING, (statement, cuppa, method, tuple(args),
+                                   not beans.is_super, stack.me,
+                                   stack.exception)
+            try:
+                service = cuppa.call_method(
+                    method,
+                    *args,
+                    first_call=not beans.is_super,
+                    me=stack.me,
+                    exception=stack.exception,
+                    tray=stack.tray
+                )
+            except (KeyError, AttributeError, ValueError, NameError,
+                    TypeError) as e:
+                report_call_error(e, statement, stack.error,
+                                  stack.instruction.dialect)
+            if type(service) is Complaint:
+                return THROWING, service
+        case [InterpreterBase.IF_DEF, expression, true_statement]:
+            beans = evaluate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            condition = beans.value
+            if type(condition) != bool:
+                stack.error(ErrorType.TYPE_ERROR,
+                            "Condition did not evaluate to boolean",
+                            statement[0].line_num)
+            if condition:
+                order = evaluate_statement(true_statement, stack)
+                if order[0]:
+                    return order
+        case [InterpreterBase.IF_DEF, expression, true_statement,
+              false_statement]:
+            beans = evaluate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            condition = beans.value
+            if type(condition) != bool:
+                stack.error(ErrorType.TYPE_ERROR,
+                            "Condition did not evaluate to boolean",
+                            statement[0].line_num)
+            if condition:
+                order = evaluate_statement(true_statement, stack)
+                if order[0]:
+                    return order
+            else:
+                order = evaluate_statement(false_statement, stack)
+                if order[0]:
+                    return order
+        case [InterpreterBase.INPUT_INT_DEF, variable] if isSWLN(variable):
+            can = find_variable(variable, stack)
+            try:
+                beans = Ingredient(int(stack.get_input()), stack.error,
+                                   stack.trace_output)
+            except ValueError:
+                stack.error(ErrorType.TYPE_ERROR,
+                        "Could not convert input to integer",
+                        statement[0].line_num)
+            except TypeError:
+                stack.error(ErrorType.TYPE_ERROR, "Expected input but got none",
+                        statement[0].line_num)
+            try:
+                can.set_value(beans)
+            except TypeError as e:
+                stack.error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
+        case [InterpreterBase.INPUT_STRING_DEF, variable] if isSWLN(variable):
+            can = find_variable(variable, stack)
+            beans = Ingredient(str(stack.get_input()), stack.error,
+                               stack.trace_output)
+            try:
+                can.set_value(beans)
+            except TypeError as e:
+                stack.error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
+        case [InterpreterBase.PRINT_DEF, *arguments]:
+            pieces = []
+            for argument in arguments:
+                beans = evaluate_expression(argument, stack)
+                if type(beans) is Complaint:
+                    return THROWING, beans
+                if stack.output is not None:
+                    pieces.append(str(beans))
+            if stack.output is not None:
+                stack.output(''.join(pieces))
+        case [InterpreterBase.RETURN_DEF]:
+            return True, None
+        case [InterpreterBase.RETURN_DEF, expression]:
+            if type(statement[0]) is Refill:
+                return evaluate_statement(expression, stack)
+            beans = evaluate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            return True, beans
+        case [InterpreterBase.SET_DEF, variable, expression
+              ] if isSWLN(variable):
+            can = find_variable(variable, stack)
+            beans = evaluate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            try:
+                can.set_value(beans)
+            except TypeError as e:
+                stack.error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
+        case [InterpreterBase.WHILE_DEF, expression, statement_to_run]:
+            while True:
+                beans = evaluate_expression(expression, stack)
+                if type(beans) is Complaint:
+                    return THROWING, beans
+                condition = beans.value
+                if type(condition) != bool:
+                    stack.error(ErrorType.TYPE_ERROR,
+                                "Condition did not evaluate to boolean",
+                                statement[0].line_num)
+                if not condition:
+                    break
+                latest_order = evaluate_statement(statement_to_run, stack)
+                if latest_order[0]:
+                    return latest_order
+        case [InterpreterBase.LET_DEF, var_defs, *sub_statements
+              ] if sub_statements and stack.instruction.dialect.lets:
+            start = stack.add_variables(var_defs, statement[0])
+            try:
+                for sub_statement in sub_statements:
+                    latest_order = evaluate_statement(sub_statement, stack)
+                    if latest_order[0]:
+                        return latest_order
+            finally:
+                stack.clear(start)
+        case [InterpreterBase.THROW_DEF, exception_expression
+              ] if stack.instruction.dialect.exceptions:
+            beans = evaluate_expression(exception_expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            try:
+                return THROWING, Complaint(beans)
+            except ValueError as e:
+                stack.error(ErrorType.TYPE_ERROR, str(e), statement[0].line_num)
+        case [InterpreterBase.TRY_DEF, try_statement, catch_statement
+              ] if stack.instruction.dialect.exceptions:
+            order = evaluate_statement(try_statement, stack)
+            if order[0] is THROWING:
+                caught = stack.exception
+                stack.exception = order[1].message
+                try:
+                    order = evaluate_statement(catch_statement, stack)
+                finally:
+                    stack.exception = caught
+            if order[0]:
+                return order
+        case _:
+            stack.error(ErrorType.SYNTAX_ERROR,
+                        f"Not a valid statement: {statement}")
+    return False, None
+
+
+def mark_int_operations(tokens: list):
+    """
+    Swaps the operator of every arithmetic operation or comparison whose
+    operands are both statically int for a Shot token
+
+    An operand is statically int if it is an int constant, a field, parameter
+    or let variable declared int, a call on me to a method of the class
+    declared int, or an arithmetic operation on two such operands
+    """
+    for class_def in tokens:
+        fields = {}
+        returns = {}
+        for definition in class_def:
+            match definition:
+                case [InterpreterBase.FIELD_DEF, btype, name, *_
+                      ] if isSWLN(btype) and isSWLN(name):
+                    fields[name] = btype
+                case [InterpreterBase.METHOD_DEF, btype, name, *_
+                      ] if isSWLN(btype) and isSWLN(name):
+                    returns[name] = btype
+        for definition in class_def:
+            match definition:
+                case [InterpreterBase.METHOD_DEF, btype, name, params,
+                      statement] if isSWLN(btype) and isSWLN(name):
+                    parameters = {param[1]: param[0] for param in params
+                                  if len(param) == 2}
+                    mark_int_statement(
+                        statement,
+                        collections.ChainMap(parameters, fields),
+                        returns
+                    )
+
+
+def mark_int_statement(statement, scope: collections.ChainMap,
+                       returns: dict[SWLN, SWLN]):
+    """
+    Marks the int operations in a statement; scope maps the names in reach to
+    their declared types, and returns the methods of the class to theirs
+    """
+    match statement:
+        case [InterpreterBase.LET_DEF, var_defs, *sub_statements]:
+            scope = scope.new_child({var_def[1]: var_def[0]
+                                     for var_def in var_defs
+                                     if len(var_def) >= 2})
+            for sub_statement in sub_statements:
+                mark_int_statement(sub_statement, scope, returns)
+        case [InterpreterBase.BEGIN_DEF | InterpreterBase.TRY_DEF,
+              *sub_statements]:
+            for sub_statement in sub_statements:
+                mark_int_statement(sub_statement, scope, returns)
+        case [InterpreterBase.IF_DEF | InterpreterBase.WHILE_DEF, condition,
+              *sub_statements]:
+            mark_int_expression(condition, scope, returns)
+            for sub_statement in sub_statements:
+                mark_int_statement(sub_statement, scope, returns)
+        case [InterpreterBase.SET_DEF, _, expression]:
+            mark_int_expression(expression, scope, returns)
+        case [InterpreterBase.PRINT_DEF | InterpreterBase.RETURN_DEF
+              | InterpreterBase.THROW_DEF, *expressions]:
+            for expression in expressions:
+                mark_int_expression(expression, scope, returns)
+        case [InterpreterBase.CALL_DEF, *_]:
+            mark_int_expression(statement, scope, returns)
+
+
+def mark_int_expression(expression, scope: collections.ChainMap,
+                        returns: dict[SWLN, SWLN]) -> SWLN | None:
+    """
+    Marks the int operations in an expression, returning its static type if
+    it is known to be int
+    """
+    match expression:
+        case variable if isSWLN(variable):
+            if variable in scope:
+                return scope[variable]
+            try:
+                int(variable)
+            except ValueError:
+                return None
+            return InterpreterBase.INT_DEF
+        case [InterpreterBase.CALL_DEF, obj_expression, method, *arguments]:
+            for argument in [obj_expression, *arguments]:
+                mark_int_expression(argument, scope, returns)
+            if obj_expression == InterpreterBase.ME_DEF:
+                return returns.get(method)
+        case [binary_operator, left_expression, right_expression
+              ] if isSWLN(binary_operator):
+            left = mark_int_expression(left_expression, scope, returns)
+            right = mark_int_expression(right_expression, scope, returns)
+            if (binary_operator in Shot.OPERATIONS
+                    and left == right == InterpreterBase.INT_DEF):
+                expression[0] = Shot(binary_operator)
+                if binary_operator in ('+', '-', '*', '/', '%'):
+                    return InterpreterBase.INT_DEF
+        case [_, sub_expression]:
+            mark_int_expression(sub_expression, scope, returns)
+    return None
+
+
+def mark_lets(statement, me: Recipe, classes: dict[SWLN, Recipe]):
+    """
+    Swaps the keyword of every let in a method's statement for a Kettle token
+    """
+    if not isinstance(statement, list):
+        return
+    if (len(statement) > 1 and isSWLN(statement[0])
+            and statement[0] == InterpreterBase.LET_DEF):
+        statement[0] = Kettle(statement[0], plan_let(statement[1], me,
+                                                     classes))
+    for part in statement:
+        mark_lets(part, me, classes)
+
+
+LET_DEFAULTS = {InterpreterBase.INT_DEF: 0, InterpreterBase.STRING_DEF: "",
+                InterpreterBase.BOOL_DEF: False}
+
+
+def plan_let(var_defs: Any, me: Recipe, classes: dict[SWLN, Recipe]
+             ) -> list[tuple] | None:
+    """
+    The Kettle plan for a let's variables, or None if making one could fail
+    or need a template instantiated, which is left to the run to do
+    """
+    if not isinstance(var_defs, list):
+        return None
+    plan = []
+    for var_def in var_defs:
+        match var_def:
+            case [btype, name, value] if (isSWLN(btype) and isSWLN(name)
+                                          and isSWLN(value)):
+                try:
+                    grounds = Ingredient(value, None, False).value
+                except ValueError:
+                    return None
+            case [btype, name] if (me.dialect.defaults and isSWLN(btype)
+                                   and isSWLN(name)):
+                grounds = LET_DEFAULTS.get(btype)
+            case _:
+                return None
+        if not isVarType(btype, me, classes):
+            return None
+        plan.append((name, btype, assignment_check(btype, classes), grounds))
+    return plan
+
+
+def mark_tail_calls(tokens: list):
+    """
+    Swaps the keyword of every call in tail position for a Refill token:
+    (return (call ...)) anywhere outside a try block, and a call left as the
+    last statement of a void method
+    """
+    for class_def in tokens:
+        for definition in class_def:
+            match definition:
+                case [InterpreterBase.METHOD_DEF, btype, name, _, statement
+                      ] if isSWLN(btype) and isSWLN(name):
+                    mark_tail_statement(statement,
+                                        btype == InterpreterBase.VOID_DEF)
+
+
+def mark_tail_statement(statement, last: bool):
+    """
+    Marks the tail calls in a statement; last is whether a call statement
+    here would be the last thing its void method does
+    """
+    match statement:
+        case [InterpreterBase.RETURN_DEF,
+              [InterpreterBase.CALL_DEF, _, method, *_] as expression
+              ] if isSWLN(method):
+            statement[0] = Refill(statement[0], True)
+            expression[0] = Refill(expression[0], True)
+        case [InterpreterBase.CALL_DEF, _, method, *_
+              ] if isSWLN(method) and last:
+            statement[0] = Refill(statement[0], False)
+        case [InterpreterBase.BEGIN_DEF | InterpreterBase.LET_DEF as keyword,
+              *sub_statements]:
+            if keyword == InterpreterBase.LET_DEF:
+                sub_statements = sub_statements[1:]
+            for i, sub_statement in enumerate(sub_statements, 1):
+                mark_tail_statement(sub_statement,
+                                    last and i == len(sub_statements))
+        case [InterpreterBase.IF_DEF, _, *branches] if len(branches) <= 2:
+            for branch in branches:
+                mark_tail_statement(branch, last)
+        case [InterpreterBase.WHILE_DEF, _, body]:
+            mark_tail_statement(body, False)
+        case [InterpreterBase.TRY_DEF, _, catch_statement]:
+            mark_tail_statement(catch_statement, last)
+
+
+def report_call_error(e: Exception, expression: list, error: ErrorFun,
+                      dialect: Dialect):
+    """
+    Reports a failed call the way evaluate_expression does for the call
+    expression, or throws e back if it is not a call failure
+    """
+    method = expression[2]
+    match e:
+        case KeyError():
+            error(ErrorType.NAME_ERROR,
+                  f"Object does not have method: {method}", method.line_num)
+        case AttributeError():
+            error(ErrorType.TYPE_ERROR, f"Method being called on non-object",
+                  expression[0].line_num)
+        case ValueError():
+            error(dialect.arity,
+                  f"Method called with wrong number of arguments: {method}",
+                  expression[0].line_num)
+        case NameError():
+            error(ErrorType.NAME_ERROR, str(e), expression[0].line_num)
+        case TypeError():
+            error(ErrorType.TYPE_ERROR, str(e), expression[0].line_num)
+    raise e
+
+
+def refill(request: tuple, dialect: Dialect, tray: Tray) -> tuple:
+    """
+    Makes a tail call, and the tail calls it makes in turn, in a loop instead
+    of recursing
+
+    request is (<call statement>, cuppa, method, args, first_call, me,
+    exception), as left by evaluate_statement
+
+    Returns the order for the method that made the first tail call to serve
+    """
+    pending = Tab()
+    while True:
+        expression, cuppa, method, args, first_call, me, exception = request
+        try:
+            recipe, instruction, parameters, me = cuppa.find_method(
+                method, args, first_call, me
+            )
+        except (KeyError, AttributeError, ValueError, NameError,
+                TypeError) as e:
+            report_call_error(e, expression, tray.error, dialect)
+        order = evaluate_statement(instruction.statement,
+                                   Plate(me, exception, parameters,
+                                         instruction, recipe, tray))
+        if order[0] is not REFILLING:
+            break
+        pending.add((request, recipe, instruction, me), order[1])
+        request = order[1]
+    service = serve_tail_call((request, recipe, instruction, me), order, tray)
+    return settle(pending, request, service, tray)
+
+
+class Tab:
+    """
+    Return checks left pending by a chain of tail calls, outermost first
+
+    Each check is keyed by the call that reached its method, the method, and
+    the tail call the method ended in, which together decide all the check
+    does; a check that may fall back on an ancestor's method needs that
+    call's arguments as well, so it gets a key of its own
+    """
+    __slots__ = ('calls', 'keys', 'last')
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.keys: list = []
+        self.last: dict = {}
+
+    def __reversed__(self):
+        return reversed(self.calls)
+
+    def add(self, call: tuple, request: tuple):
+        """
+        Queues the return check of a method that ended in the tail call
+        request
+
+        Checks repeating the cycle of checks just before them are dropped, as
+        running a cycle again on its own result changes nothing; so a loop of
+        tail calls through any number of methods stays in constant space. A
+        cycle mixing tail calls that return a value with ones that do not is
+        kept, as is one through methods returning different classes, since
+        whether a null passes their checks depends on the order they run in
+        """
+        key = tab_key(call, request)
+        start = self.last.get(key)
+        if start is not None:
+            period = len(self.keys) - start
+            first = start + 1 - period
+            cycle = self.keys[first:start + 1]
+            if (first >= 0 and cycle == self.keys[start + 1:] + [key]
+                    and repeatable(cycle)):
+                del self.calls[start + 1:], self.keys[start + 1:]
+                for i in range(first, start + 1):
+                    self.last[self.keys[i]] = i
+                return
+        if type(key) is tuple:
+            self.last[key] = len(self.keys)
+        self.calls.append(call)
+        self.keys.append(key)
+
+
+def tab_key(call: tuple, request: tuple) -> Union[tuple, object]:
+    """
+    What a pending return check is the same check as; see Tab
+    """
+    (expression, _, method, *_), recipe, instruction, _ = call
+    parent = recipe.parent
+    while parent:
+        if method in parent.methods:
+            return object()
+        parent = parent.parent
+    return (id(expression), id(request[0]), instruction,
+            request[0][0].returns)
+
+
+def repeatable(cycle: list[tuple]) -> bool:
+    """
+    Whether running a cycle of Tab keys twice in a row is the same as once
+    """
+    classes = {instruction.btype for _, _, instruction, _ in cycle
+               if instruction.btype not in PRIMITIVE_TYPES
+               and instruction.btype not in (None, InterpreterBase.VOID_DEF)}
+    return (len(classes) <= 1
+            and len({returns for *_, returns in cycle}) == 1)
+
+
+def serve_tail_call(call: tuple, order: tuple, tray: Tray
+                    ) -> Union[Ingredient, Complaint, None]:
+    """
+    Serves a method reached through a tail call, falling back on the parent's
+    method the way Recipe.call_method does if the returned type is wrong
+    """
+    request, recipe, instruction, me = call
+    expression, _, method, args, _, _, exception = request
+    try:
+        try:
+            return instruction.serve(*order)
+        except TypeError:
+            if not recipe.parent:
+                raise
+        return recipe.parent.call_method(method, *args, first_call=False,
+                                         me=me, exception=exception, tray=tray)
+    except (KeyError, AttributeError, ValueError, NameError, TypeError) as e:
+        report_call_error(e, expression, tray.error, instruction.dialect)
+
+
+def settle(pending: Tab, request: tuple,
+           service: Union[Ingredient, Complaint, None], tray: Tray) -> tuple:
+    """
+    Hands the result of the last call in a tail call chain back through the
+    return checks left pending, innermost first
+
+    Returns the order for the method that made the first tail call to serve
+    """
+    for call in reversed(pending):
+        order = tail_order(request, service, tray.error)
+        if order[0] is THROWING:
+            return order
+        service = serve_tail_call(call, order, tray)
+        request = call[0]
+    return tail_order(request, service, tray.error)
+
+
+def tail_order(request: tuple, service: Union[Ingredient, Complaint, None],
+               error: ErrorFun) -> tuple:
+    """
+    The order the calling method would have been left with had the tail call
+    been made in place
+    """
+    expression = request[0]
+    if type(service) is Complaint:
+        return THROWING, service
+    if not expression[0].returns:
+        return False, None
+    if service is None:
+        error(ErrorType.TYPE_ERROR,
+              f"Method did not return a value: {expression[2]}",
+              expression[0].line_num)
+    return True, service
+
+
+class Mug:
+    """
+    Method call frame on the explicit stack
+    """
+    __slots__ = ('recipe', 'name', 'args', 'me', 'exception', 'tray',
+                 'instruction', 'steps', 'request', 'base', 'pending')
+
+    def __init__(self, cuppa: Recipe, name: SWLN, args: tuple[Ingredient, ...],
+                 first_call: bool, me: Recipe, exception: Ingredient | None,
+                 tray: Tray) -> None:
+        """
+        Finds and binds the method the same way Recipe.call_method does
+
+        Throws KeyError if method not found
+
+        Throws ValueError on wrong number of arguments
+
+        Throws NameError on wrong type passed in
+        """
+        recipe, instruction, parameters, me = cuppa.find_method(name, args,
+                                                                first_call, me)
+
+        self.recipe = recipe
+        self.name = name
+        self.args = args
+        self.me = me
+        self.exception = exception
+        self.tray = tray
+        self.instruction = instruction
+        self.request = None
+        self.base = None
+        self.pending = None
+        self.steps = percolate_statement(instruction.statement,
+                                         Plate(me, exception, parameters,
+                                               instruction, recipe, tray))
+
+    def refill(self) -> 'Mug':
+        """
+        Retries the call further up the parent chain, as Recipe.call_method
+        does when a method fails
+        """
+        return Mug(self.recipe.parent, self.name, self.args, False, self.me,
+                   self.exception, self.tray)
+
+    def pour(self, request: tuple) -> 'Mug':
+        """
+        Makes the tail call this Mug's method finished with, in a Mug that
+        takes its place on the stack
+
+        The Mug that started the chain is kept as base, to serve the last
+        result; the return checks of the ones in between wait in pending
+        """
+        expression, cuppa, name, args, first_call, me, exception = request
+        try:
+            cup = Mug(cuppa, name, args, first_call, me, exception, self.tray)
+        except (KeyError, AttributeError, ValueError, NameError,
+                TypeError) as e:
+            report_call_error(e, expression, self.tray.error,
+                              self.instruction.dialect)
+        cup.request = request
+        if self.base is None:
+            cup.base, cup.pending = self, Tab()
+        else:
+            cup.base, cup.pending = self.base, self.pending
+            cup.pending.add((self.request, self.recipe, self.instruction,
+                             self.me), request)
+        return cup
+
+    def settle(self, order: tuple) -> tuple:
+        """
+        Serves the last method of a tail call chain and runs the return checks
+        left pending, giving back the order for the base Mug to serve
+        """
+        service = serve_tail_call((self.request, self.recipe, self.instruction,
+                                   self.me), order, self.tray)
+        return settle(self.pending, self.request, service, self.tray)
+
+
+def percolate(cuppa: Recipe, name: SWLN, args: tuple[Ingredient, ...],
+              first_call: bool, me: Recipe, exception: Ingredient | None,
+              max_depth: int | None, tray: Tray
+              ) -> Union[Ingredient, Complaint, None]:
+    """
+    Runs a method call like Recipe.call_method, except that nested Brewin
+    calls are pushed onto a list of Mugs instead of recursing in Python
+
+    Method bodies run as percolate_statement generators, which yield each call
+    they make as a (cuppa, method, args, first_call, me, exception) request and
+    get its result (or the Python exception it raised) sent back in
+
+    A tail call replaces the Mug that made it instead of being pushed
+
+    Throws RecursionError if the stack grows past max_depth Mugs; the cap is
+    a count of frames, not of the memory they take
+    """
+    mugs = [Mug(cuppa, name, args, first_call, me, exception, tray)]
+    service = failure = None
+    while True:
+        mug = mugs[-1]
+        try:
+            if failure is None:
+                request = mug.steps.send(service)
+            else:
+                request = mug.steps.throw(failure)
+        except StopIteration as done:
+            order = done.value
+            try:
+                if order[0] is REFILLING:
+                    mugs[-1] = mug.pour(order[1])
+                    service = failure = None
+                    continue
+                if mug.base is not None:
+                    order = mug.settle(order)
+                    mug = mug.base
+                service, failure = mug.instruction.serve(*order), None
+            except Exception as e:
+                service, failure = None, e
+        except Exception as e:
+            service, failure = None, e
+        else:
+            service = failure = None
+            try:
+                mugs.append(Mug(*request, tray))
+            except Exception as e:
+                failure = e
+            if max_depth is not None and len(mugs) > max_depth:
+                raise RecursionError(f"Brewin call stack deeper than "
+                                     f"{max_depth} calls")
+            continue
+
+        mugs.pop()
+        if (isinstance(failure, (KeyError, ValueError, NameError, TypeError))
+                and mug.recipe.parent and mug.base is None):
+            try:
+                mugs.append(mug.refill())
+                failure = None
+                continue
+            except Exception as e:
+                failure = e
+        if not mugs:
+            if failure is not None:
+                raise failure
+            return service
+
+
+def percolate_expression(expression, stack: Plate):
+    """
+    Generator counterpart of evaluate_expression, driven by percolate
+
+    Anything that cannot contain a method call is handed to
+    evaluate_expression
+    """
+    match expression:
+        case [InterpreterBase.CALL_DEF, obj_expression, method, *arguments
+              ] if isSWLN(method):
+            beans = yield from percolate_expression(obj_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            cuppa = beans.value
+            if cuppa is None:
+                stack.error(ErrorType.FAULT_ERROR,
+                            f"Trying to dereference nullptr",
+                            expression[0].line_num)
+            args = []
+            for argument in arguments:
+                milk = yield from percolate_expression(argument, stack)
+                if type(milk) is Complaint:
+                    return milk
+                args.append(milk)
+            try:
+                service = yield (cuppa, method, tuple(args), not beans.is_super,
+                                 stack.me, stack.exception)
+            except (KeyError, AttributeError, ValueError, NameError,
+                    TypeError) as e:
+                report_call_error(e, expression, stack.error,
+                                  stack.instruction.dialect)
+            if service is None:
+                stack.error(ErrorType.TYPE_ERROR,
+                            f"Method did not return a value: {method}",
+                            expression[0].line_num)
+            else:
+                return service
+        case [InterpreterBase.NEW_DEF, name] if isSWLN(name):
+            return evaluate_expression(expression, stack)
+        case [unary_operator, sub_expression] if isSWLN(unary_operator):
+            beans = yield from percolate_expression(sub_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            return apply_unary_operator(unary_operator, beans, stack.error,
+                                        stack.trace_output)
+        case [binary_operator, left_expression, right_expression
+              ] if isSWLN(binary_operator):
+            beans = yield from percolate_expression(left_expression, stack)
+            if type(beans) is Complaint:
+                return beans
+            milk = yield from percolate_expression(right_expression, stack)
+            if type(milk) is Complaint:
+                return milk
+            return apply_binary_operator(binary_operator, beans, milk,
+                                         stack.classes, stack.error,
+                                         stack.trace_output)
+        case _:
+            return evaluate_expression(expression, stack)
+
+
+def percolate_statement(statement, stack: Plate, watched: bool = False):
+    """
+    Generator counterpart of evaluate_statement, driven by percolate
+
+    Anything that cannot contain a method call is handed to evaluate_statement
+    """
+    if stack.watch is not None and not watched:
+        return (yield from stack.watch.steps(statement, stack))
+    match statement:
+        case [InterpreterBase.BEGIN_DEF, *sub_statements] if sub_statements:
+            for sub_statement in sub_statements:
+                latest_order = yield from percolate_statement(sub_statement,
+                                                              stack)
+                if latest_order[0]:
+                    return latest_order
+        case [InterpreterBase.CALL_DEF, expression, method, *arguments
+              ] if isSWLN(method):
+            beans = yield from percolate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            cuppa = beans.value
+            if cuppa is None:
+                stack.error(ErrorType.FAULT_ERROR,
+                            f"Trying to dereference nullptr",
+                            statement[0].line_num)
+            args = []
+            for argument in arguments:
+                milk = yield from percolate_expression(argument, stack)
+                if type(milk) is Complaint:
+                    return THROWING, milk
+                args.append(milk)
+            if type(statement[0]) is Refill:
+                return REFILLING, (statement, cuppa, method, tuple(args),
+                                   not beans.is_super, stack.me,
+                                   stack.exception)
+            try:
+                service = yield (cuppa, method, tuple(args), not beans.is_super,
+                                 stack.me, stack.exception)
+            except (KeyError, AttributeError, ValueError, NameError,
+                    TypeError) as e:
+                report_call_error(e, statement, stack.error,
+                                  stack.instruction.dialect)
+            if type(service) is Complaint:
+                return THROWING, service
+        case [InterpreterBase.IF_DEF, expression, true_statement,
+              *false_statement] if len(false_statement) <= 1:
+            beans = yield from percolate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            condition = beans.value
+            if type(condition) != bool:
+                stack.error(ErrorType.TYPE_ERROR,
+                            "Condition did not evaluate to boolean",
+                            statement[0].line_num)
+            if condition:
+                order = yield from percolate_statement(true_statement, stack)
+                if order[0]:
+                    return order
+            elif false_statement:
+                order = yield from percolate_statement(false_statement[0],
+                                                       stack)
+                if order[0]:
+                    return order
+        case [InterpreterBase.PRINT_DEF, *arguments]:
+            pieces = []
+            for argument in arguments:
+                beans = yield from percolate_expression(argument, stack)
+                if type(beans) is Complaint:
+                    return THROWING, beans
+                if stack.output is not None:
+                    pieces.append(str(beans))
+            if stack.output is not None:
+                stack.output(''.join(pieces))
+        case [InterpreterBase.RETURN_DEF, expression]:
+            if type(statement[0]) is Refill:
+                return (yield from percolate_statement(expression, stack))
+            beans = yield from percolate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            return True, beans
+        case [InterpreterBase.SET_DEF, variable, expression
+              ] if isSWLN(variable):
+            can = find_variable(variable, stack)
+            beans = yield from percolate_expression(expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            try:
+                can.set_value(beans)
+            except TypeError as e:
+                stack.error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
+        case [InterpreterBase.WHILE_DEF, expression, statement_to_run]:
+            while True:
+                beans = yield from percolate_expression(expression, stack)
+                if type(beans) is Complaint:
+                    return THROWING, beans
+                condition = beans.value
+                if type(condition) != bool:
+                    stack.error(ErrorType.TYPE_ERROR,
+                                "Condition did not evaluate to boolean",
+                                statement[0].line_num)
+                if not condition:
+                    break
+                latest_order = yield from percolate_statement(
+                    statement_to_run, stack
+                )
+                if latest_order[0]:
+                    return latest_order
+        case [InterpreterBase.LET_DEF, var_defs, *sub_statements
+              ] if sub_statements and stack.instruction.dialect.lets:
+            start = stack.add_variables(var_defs, statement[0])
+            try:
+                for sub_statement in sub_statements:
+                    latest_order = yield from percolate_statement(
+                        sub_statement, stack
+                    )
+                    if latest_order[0]:
+                        return latest_order
+            finally:
+                stack.clear(start)
+        case [InterpreterBase.THROW_DEF, exception_expression
+              ] if stack.instruction.dialect.exceptions:
+            beans = yield from percolate_expression(exception_expression, stack)
+            if type(beans) is Complaint:
+                return THROWING, beans
+            try:
+                return THROWING, Complaint(beans)
+            except ValueError as e:
+                stack.error(ErrorType.TYPE_ERROR, str(e), statement[0].line_num)
+        case [InterpreterBase.TRY_DEF, try_statement, catch_statement
+              ] if stack.instruction.dialect.exceptions:
+            order = yield from percolate_statement(try_statement, stack)
+            if order[0] is THROWING:
+                caught = stack.exception
+                stack.exception = order[1].message
+                try:
+                    order = yield from percolate_statement(catch_statement,
+                                                           stack)
+                finally:
+                    stack.exception = caught
+            if order[0]:
+                return order
+        case _:
+            return evaluate_statement(statement, stack, True)
+    return False, None
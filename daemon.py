@@ -0,0 +1,337 @@
+"""
+Long-lived interpreter server on a Unix domain socket, keeping programs loaded
+between requests
+
+    python daemon.py serve --socket /tmp/brewin.sock --cache-mb 256 --workers 8
+    python daemon.py run program.brewin --socket /tmp/brewin.sock < input.txt
+
+Each request carries a program's source, its input lines and options for the
+interpreter (see OPTIONS), plus an optional timeout; the reply is the result
+batch.attempt gives, with whether the loaded program came from the cache.
+Loaded programs are kept in an LRU cache keyed by a hash of their source,
+evicting the least recently used once their estimated size passes the limit
+
+Messages are JSON, each preceded by its length as a 4-byte big-endian integer;
+a connection can carry any number of requests, one after another. The server
+waits on all its connections at once and loads each request's program itself,
+so the cache keeps it; the run happens in a worker forked from the server,
+which shares the loaded program with it, so up to workers requests run at a
+time while the server goes on taking requests from other connections
+"""
+
+from types import FunctionType, MethodType, ModuleType
+from typing import Any, Callable
+import argparse
+import collections
+import gc
+import hashlib
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+import time
+
+from batch import attempt
+from bparser import string_to_program
+from interpreterv3 import Interpreter, Menu
+from sinks import Sink
+
+
+OPTIONS = ('stackless', 'max_depth', 'tail_calls', 'budget', 'deadline',
+           'weigh', 'heap_limit', 'object_limit')
+LENGTH = struct.Struct('>I')
+REAP_INTERVAL = 0.01
+
+
+def send_message(connection: socket.socket, message: Any):
+    data = json.dumps(message).encode()
+    connection.sendall(LENGTH.pack(len(data)) + data)
+
+
+def receive_message(connection: socket.socket) -> Any:
+    """
+    Returns None once the other end has closed the connection
+    """
+    header = receive_exactly(connection, LENGTH.size)
+    if header is None:
+        return None
+    data = receive_exactly(connection, LENGTH.unpack(header)[0])
+    if data is None:
+        raise ConnectionError("Connection closed mid-message")
+    return json.loads(data)
+
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes | None:
+    chunks = []
+    while size:
+        chunk = connection.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def footprint(menu: Menu) -> int:
+    """
+    Estimated bytes held by a loaded program: everything reachable from its
+    classes and templates, short of modules, types and the globals of
+    functions
+    """
+    seen = set()
+    stack = [dict(menu.classes), dict(menu.templates)]
+    size = 0
+    while stack:
+        thing = stack.pop()
+        if id(thing) in seen or isinstance(thing, (type, ModuleType)):
+            continue
+        seen.add(id(thing))
+        size += sys.getsizeof(thing)
+        if isinstance(thing, FunctionType):
+            stack.extend(cell.cell_contents for cell in thing.__closure__ or ())
+        elif isinstance(thing, MethodType):
+            stack.append(thing.__self__)
+        else:
+            stack.extend(gc.get_referents(thing))
+    return size
+
+
+class Pantry:
+    """
+    LRU cache of loaded programs, holding at most capacity bytes of them (as
+    footprint estimates) besides the most recent
+    """
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.menus: collections.OrderedDict[tuple, tuple[Menu, int]] = \
+            collections.OrderedDict()
+        self.size = 0
+
+    def get(self, key: tuple) -> Menu | None:
+        if key not in self.menus:
+            return None
+        self.menus.move_to_end(key)
+        return self.menus[key][0]
+
+    def put(self, key: tuple, menu: Menu):
+        size = footprint(menu)
+        self.menus[key] = menu, size
+        self.size += size
+        while self.size > self.capacity and len(self.menus) > 1:
+            _, (_, size) = self.menus.popitem(last=False)
+            self.size -= size
+
+
+class Server:
+    def __init__(self, path: str, capacity: int,
+                 workers: int | None = None) -> None:
+        self.path = path
+        self.pantry = Pantry(capacity)
+        self.workers = workers or os.cpu_count() or 1
+
+    def load(self, request: dict) -> dict | Callable[[], dict]:
+        """
+        Loads the request's program, unless the pantry has it already, and
+        gives back what runs it and returns the reply, or the reply if the
+        program failed to load
+
+        Throws KeyError or TypeError on a malformed request
+        """
+        source = request['source']
+        options = {option: request.get('options', {}).get(option)
+                   for option in OPTIONS}
+        lines = iter(request.get('input', []))
+        interpreter = Interpreter(console_output=False, sink=Sink(log=[]),
+                                  source=lambda: next(lines, None),
+                                  stackless=bool(options['stackless']),
+                                  max_depth=options['max_depth'],
+                                  tail_calls=bool(options['tail_calls']),
+                                  budget=options['budget'],
+                                  deadline=options['deadline'],
+                                  weigh=bool(options['weigh']),
+                                  heap_limit=options['heap_limit'],
+                                  object_limit=options['object_limit'])
+        key = (hashlib.sha256(source.encode()).hexdigest(),
+               interpreter.tail_calls)
+        menu = self.pantry.get(key)
+        cached = menu is not None
+
+        if menu is None:
+            def prepare():
+                nonlocal menu
+                menu = interpreter.prepare(string_to_program(source))
+
+            loaded = attempt(interpreter, prepare, request.get('timeout'))
+            if menu is None:
+                return loaded | {'cached': False}
+            self.pantry.put(key, menu)
+
+        return lambda: attempt(interpreter,
+                               lambda: interpreter.run_prepared(menu),
+                               request.get('timeout')) | {'cached': cached}
+
+    def serve(self, request: dict) -> dict:
+        """
+        Serves the request in this process
+        """
+        try:
+            run = self.load(request)
+        except (KeyError, TypeError) as e:
+            return {'status': 'bad request', 'message': str(e)}
+        return run() if callable(run) else run
+
+    def take(self, connection: socket.socket) -> int | None:
+        """
+        Takes the next request off connection, replying to it here if it
+        could not be loaded, and otherwise forking a worker to run it and
+        reply, whose pid is given back
+
+        Throws ConnectionError once the other end has gone
+        """
+        request = receive_message(connection)
+        if request is None:
+            raise ConnectionError("Connection closed")
+        try:
+            run = self.load(request)
+        except (KeyError, TypeError) as e:
+            run = {'status': 'bad request', 'message': str(e)}
+        if not callable(run):
+            send_message(connection, run)
+            return None
+        gc.freeze()
+        pid = os.fork()
+        if pid:
+            gc.unfreeze()
+            return pid
+        try:
+            send_message(connection, run())
+        finally:
+            os._exit(0)
+
+    def serve_forever(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        selector = selectors.DefaultSelector()
+        running: dict[int, socket.socket] = {}
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(self.path)
+            listener.listen()
+            selector.register(listener, selectors.EVENT_READ)
+            try:
+                while True:
+                    if len(running) >= self.workers:
+                        time.sleep(REAP_INTERVAL)
+                        events = []
+                    else:
+                        events = selector.select(REAP_INTERVAL if running
+                                                 else None)
+                    for key, _ in events:
+                        if len(running) >= self.workers:
+                            break
+                        if key.fileobj is listener:
+                            connection, _ = listener.accept()
+                            selector.register(connection,
+                                              selectors.EVENT_READ)
+                            continue
+                        connection = key.fileobj
+                        selector.unregister(connection)
+                        try:
+                            pid = self.take(connection)
+                        except (ConnectionError, ValueError):
+                            connection.close()
+                            continue
+                        if pid is None:
+                            selector.register(connection,
+                                              selectors.EVENT_READ)
+                        else:
+                            running[pid] = connection
+                    while running and (pid := os.waitpid(-1, os.WNOHANG)[0]):
+                        selector.register(running.pop(pid),
+                                          selectors.EVENT_READ)
+            finally:
+                selector.close()
+                os.remove(self.path)
+
+
+class Client:
+    """
+    Connection to a server, for any number of runs
+    """
+    def __init__(self, path: str) -> None:
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(path)
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def run(self, source: str, inp: list[str] = (),
+            timeout: float | None = None, **options) -> dict:
+        """
+        Runs source on the server, reading inp, with options for the
+        interpreter (see OPTIONS)
+        """
+        send_message(self.connection, {
+            'source': source,
+            'input': list(inp),
+            'options': options,
+            'timeout': timeout,
+        })
+        reply = receive_message(self.connection)
+        if reply is None:
+            raise ConnectionError("Server closed the connection")
+        return reply
+
+    def close(self):
+        self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--socket', default='/tmp/brewin.sock',
+                        help="path of the server's socket")
+    commands = parser.add_subparsers(dest='command', required=True)
+    server = commands.add_parser('serve')
+    server.add_argument('--cache-mb', type=float, default=256,
+                        help="MiB of loaded programs to keep")
+    server.add_argument('--workers', type=int,
+                        help="requests to run at a time (default: one per "
+                             "CPU)")
+    client = commands.add_parser('run')
+    client.add_argument('program', help="source file to run")
+    client.add_argument('--timeout', type=float,
+                        help="seconds the program may run for")
+    client.add_argument('--budget', type=int,
+                        help="statements the program may run")
+    client.add_argument('--stackless', action='store_true')
+    client.add_argument('--tail-calls', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        Server(args.socket, int(args.cache_mb * 2 ** 20),
+               args.workers).serve_forever()
+        return
+
+    with open(args.program) as f:
+        source = f.read()
+    inp = [] if sys.stdin.isatty() else sys.stdin.read().splitlines()
+    with Client(args.socket) as client:
+        result = client.run(source, inp, args.timeout,
+                            budget=args.budget, stackless=args.stackless,
+                            tail_calls=args.tail_calls)
+    for line in result['output']:
+        print(line)
+    if result['status'] != 'ok':
+        print(f"{result['status']}: {result['message']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Golden-output corpus of the Brewin programs in the unit tests
+
+    python golden.py extract
+    python golden.py run --workers 8 --slowest 10
+
+extract runs the unit tests, recording every program they run on an
+interpreter with the default settings, and writes each one from a passing test
+to tests/golden/v<version>/ as <name>.brewin, with its input in <name>.in, its
+output in <name>.out and, if it failed, its ErrorType and line in <name>.err
+
+run shards the corpus across a pool of processes, which import the
+interpreters once and run program after program, and reports any whose output
+or error differs from what was recorded, along with the time each took
+"""
+
+from typing import Callable
+import argparse
+import importlib
+import os
+import sys
+import time
+import unittest
+
+from batch import ERROR, OK, Job, load_jobs, run_batch
+from intbase import InterpreterBase
+from sinks import Sink
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(ROOT, 'tests', 'golden')
+VERSIONS = (1, 2, 3)
+
+
+def read_lines(path: str) -> list[str]:
+    with open(path) as f:
+        return f.read().split('\n')[:-1]
+
+
+def write_lines(path: str, lines: list[str]):
+    with open(path, 'w') as f:
+        f.writelines(f'{line}\n' for line in lines)
+
+
+def is_plain(interpreter: InterpreterBase) -> bool:
+    """
+    Whether interpreter runs programs as one with the default settings would
+    """
+    return (type(interpreter.sink) is Sink
+            and type(interpreter.sink.log) is list
+            and getattr(interpreter.source, '__func__', None)
+            is InterpreterBase.get_input
+            and not interpreter.hooks
+            and not any(getattr(interpreter, setting, None) for setting in
+                        ('stackless', 'max_depth', 'tail_calls', 'profile'))
+            and not any(callable(getattr(type(interpreter), name, None))
+                        for name in vars(interpreter)))
+
+
+def recording(run: Callable, version: int, runs: list) -> Callable:
+    def recorded_run(self, program: list[str]):
+        record = is_plain(self)
+        printed = len(self.get_output())
+        error = None
+        try:
+            run(self, program)
+        except RuntimeError:
+            error_type, error_line = self.get_error_type_and_line()
+            record = record and error_type is not None
+            error = error_type, error_line
+            raise
+        except BaseException:
+            record = False
+            raise
+        finally:
+            if record:
+                runs.append((version, list(program), list(self.inp or []),
+                             self.get_output()[printed:], error))
+    return recorded_run
+
+
+def extract() -> dict[int, int]:
+    """
+    Rewrites the corpus from the unit tests, returning the number of programs
+    for each version
+    """
+    modules = {version: importlib.import_module(f'interpreterv{version}')
+               for version in VERSIONS}
+    runs = []
+    plain_runs = {version: modules[version].Barista.run
+                  for version in VERSIONS}
+    # the dialects share brewing.Barista.run unless they override it
+    owned = {version: 'run' in vars(modules[version].Barista)
+             for version in VERSIONS}
+    for version in VERSIONS:
+        modules[version].Barista.run = recording(plain_runs[version], version,
+                                                 runs)
+    programs = {}
+    try:
+        for version in VERSIONS:
+            suite = unittest.defaultTestLoader.discover(
+                os.path.join(ROOT, 'tests', f'v{version}'), top_level_dir=ROOT
+            )
+            for test in iterate(suite):
+                method = getattr(type(test), test._testMethodName)
+                name = f'{method.__module__.rsplit(".", 1)[-1]}.' \
+                       f'{method.__qualname__}'
+                runs.clear()
+                result = unittest.TestResult()
+                test(result)
+                if not result.wasSuccessful():
+                    continue
+                for number, run in enumerate(runs, 1):
+                    key = repr(run[:3])
+                    if key not in programs:
+                        programs[key] = (
+                            name if len(runs) == 1 else f'{name}-{number}',
+                            *run
+                        )
+    finally:
+        for version in VERSIONS:
+            if owned[version]:
+                modules[version].Barista.run = plain_runs[version]
+            else:
+                del modules[version].Barista.run
+
+    counts = {}
+    for version in VERSIONS:
+        directory = os.path.join(CORPUS, f'v{version}')
+        os.makedirs(directory, exist_ok=True)
+        for entry in os.listdir(directory):
+            os.remove(os.path.join(directory, entry))
+        counts[version] = 0
+    for name, version, program, inp, output, error in programs.values():
+        path = os.path.join(CORPUS, f'v{version}', name)
+        write_lines(f'{path}.brewin', program)
+        if inp:
+            write_lines(f'{path}.in', inp)
+        write_lines(f'{path}.out', output)
+        if error:
+            error_type, error_line = error
+            write_lines(f'{path}.err', [
+                error_type.name if error_line is None
+                else f'{error_type.name} {error_line}'
+            ])
+        counts[version] += 1
+    return counts
+
+
+def iterate(suite: unittest.TestSuite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iterate(test)
+        else:
+            yield test
+
+
+def load_corpus(versions=VERSIONS) -> list[Job]:
+    return [job for version in versions
+            for job in load_jobs(os.path.join(CORPUS, f'v{version}'), version)]
+
+
+def check(result: dict) -> str | None:
+    """
+    How result differs from what was recorded for its program, if it does
+    """
+    path = os.path.splitext(result['program'])[0]
+    expected = read_lines(f'{path}.out')
+    if result['output'] != expected:
+        return f"printed {result['output']}, expected {expected}"
+    error = (read_lines(f'{path}.err')[0].split()
+             if os.path.exists(f'{path}.err') else None)
+    if result['status'] == OK and error is None:
+        return None
+    if result['status'] == ERROR and error is not None:
+        got = [result['error_type'], str(result['error_line'])][:len(error)]
+        if got == error:
+            return None
+        return f"failed with {' '.join(got)}, expected {' '.join(error)}"
+    return (f"{result['status']} ({result['message']}), expected "
+            f"{' '.join(error) if error else 'no error'}")
+
+
+def run(jobs: list[Job], workers: int | None = None,
+        timeout: float | None = None) -> tuple[list[dict], dict[str, str]]:
+    """
+    Runs jobs in shards of about a quarter of each worker's share, returning
+    their results and the differences found, by job name
+    """
+    shard = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+    results = run_batch(jobs, workers, timeout, chunksize=shard)
+    failures = {}
+    for result in results:
+        if difference := check(result):
+            failures[f"v{result['version']}/{result['name']}"] = difference
+    return results, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('extract')
+    runner = commands.add_parser('run')
+    runner.add_argument('--versions', default='1,2,3',
+                        help="comma-separated interpreter versions")
+    runner.add_argument('--workers', type=int,
+                        help="processes to run (default: one per CPU)")
+    runner.add_argument('--timeout', type=float, default=10,
+                        help="seconds each program may run for")
+    runner.add_argument('--slowest', type=int, default=0,
+                        help="list the times of this many slowest programs")
+    args = parser.parse_args()
+
+    if args.command == 'extract':
+        for version, count in extract().items():
+            print(f"v{version}: {count} programs")
+        return
+
+    versions = tuple(map(int, args.versions.split(',')))
+    if any(version not in VERSIONS for version in versions):
+        parser.error(f"versions must be among {VERSIONS}")
+    start = time.perf_counter()
+    results, failures = run(load_corpus(versions), args.workers, args.timeout)
+    for result in sorted(results, key=lambda result: -result['time']
+                         )[:args.slowest]:
+        print(f"{result['time'] * 1e3:8.1f} ms  "
+              f"v{result['version']}/{result['name']}")
+    for name, difference in failures.items():
+        print(f"FAIL {name}: {difference}")
+    print(f"{len(results)} programs, {len(failures)} failed in "
+          f"{time.perf_counter() - start:.2f} s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,1292 +1,629 @@
 """
+Version 3 of Brewin: version 2 with templates, exceptions and default values,
+on the engine in brewing, and the options only this interpreter offers
+
 Reference:
 
 Barista - Interpreter;
 
-Recipe - class definition;
-fragrance - class;
-flavor - secondary class;
-cuppa - object;
-tea - new object/copy of class definition;
-cup_of_the_day - main object;
-
-Formula - template definition;
-
-Instruction - method;
-brew - object's method;
-steep - copy of method;
-recommended_brew - main object's method;
-service - result of a method call;
-order - result of a statement;
-
-Tin - variable;
-can - instantiated Tin;
-bag - copy of variable;
+Menu - prepared program;
+Waiter - prepared program's input, output and errors;
+Snapshot - prepared program saved to a file;
 
-Ingredient - boxed value;
-beans - instantiated Ingredient;
-milk - secondary instantiated Ingredient;
-grounds - value;
-cream - secondary value;
-leaf - copy of field value;
-roast - value after unary operation;
-blend - value after binary operation;
-
-Plate - stack frame;
-
-Complaint - boxed exception;
+Taster - profiler;
+Timer - statement budget and deadline;
+Overbrewed - run past its budget, deadline or heap limits;
+Scale - heap accounting;
 
 bear - Brewin error;
 rare - RuntimeError;
+
+The classes, methods, variables and values a program is loaded into are named
+as listed in brewing
 """
 
-from typing import Callable, Union, Tuple, Any
-import copy
+from typing import Callable, Any, Mapping, NamedTuple
+from types import FunctionType, MappingProxyType
+import contextlib
+import contextvars
+import functools
+import gc
+import hashlib
 import sys
-import pprint
-
-from intbase import InterpreterBase, ErrorType
-from bparser import BParser, StringWithLineNumber as SWLN
-
-
-InputFun = Callable[[], str]
-OutputFun = Callable[[str], None]
-ErrorFun = Callable[[ErrorType, str, int], None]
-BrewinTypes = Union[SWLN, int, str, bool, 'Recipe', None]
-isSWLN = lambda token: isinstance(token, SWLN)
-T2L = (lambda template: [SWLN(btype, template.line_num) for btype
-                         in template.split(InterpreterBase.TYPE_CONCAT_CHAR)])
-isVarType = (lambda token, me, classes:
-             token in {InterpreterBase.INT_DEF, InterpreterBase.STRING_DEF,
-                       InterpreterBase.BOOL_DEF, me.name}.union(classes))
-isMethodType = (lambda token, me, classes:
-                token in {InterpreterBase.INT_DEF, InterpreterBase.STRING_DEF,
-                          InterpreterBase.BOOL_DEF, InterpreterBase.VOID_DEF,
-                          me.name}.union(classes))
-debug = lambda *values: print(*values, file=sys.stderr, flush=True)
-
-
-class Barista(InterpreterBase):
+import pickle
+import time
+import weakref
+
+from intbase import ErrorType
+from bparser import StringWithLineNumber as SWLN
+import brewing
+from brewing import (Dialect, Ingredient, Shot, Refill, Kettle, Recipe,
+                     Formula, Plate, Complaint)
+
+
+class Barista(brewing.Barista):
     """
     Interpreter
     """
-    def __init__(self, console_output=True, inp=None, trace_output=False):
-        super().__init__(console_output, inp)
-        self.trace_output = trace_output
-
-    def run(self, program: list[str]):
-        well_formed, tokens = BParser.parse(program)
-
-        if not well_formed:
-            super().error(ErrorType.SYNTAX_ERROR, tokens)
-
-        if self.trace_output:
-            debug("Line numbers:")
-            pprint.pprint(tokens, stream=sys.stderr)
-            debug()
-
-        self.init()
-
-        for class_def in tokens:
-            match class_def:
-                case [InterpreterBase.CLASS_DEF, name, *_] if isSWLN(name):
-                    self.classes[name] = None
-                case [InterpreterBase.TEMPLATE_CLASS_DEF, name, *_
-                      ] if isSWLN(name):
-                    self.templates[name] = None
-                case _:
-                    super().error(ErrorType.SYNTAX_ERROR,
-                                  f"Not a class: {class_def}")
-
-        for class_def in tokens:
-            match class_def:
-                case [InterpreterBase.CLASS_DEF, name,
-                      InterpreterBase.INHERITS_DEF, parent_name,
-                      *body] if isSWLN(name) and isSWLN(parent_name):
-                    self.add_class(name, parent_name, body)
-                case [InterpreterBase.CLASS_DEF, name, *body] if isSWLN(name):
-                    self.add_class(name, None, body)
-                case [InterpreterBase.TEMPLATE_CLASS_DEF, name, field_types,
-                      *body] if isSWLN(name) and all(map(isSWLN, field_types)):
-                    self.add_template(name, field_types, body)
-                case _:
-                    super().error(ErrorType.SYNTAX_ERROR,
-                                  f"Not a class: {class_def}")
-
-        if self.trace_output:
-            debug("Parsed classes:")
-            for recipe in self.classes.values():
-                debug(f"  class {recipe.name}")
-                debug("  fields:")
-                for name, ingredient in recipe.fields.items():
-                    debug(f"    {name}={ingredient.value}")
-                debug("  methods:")
-                for instruction in recipe.methods.values():
-                    debug(f"    {instruction.name}({instruction.formals})=")
-                    debug(f"{pprint.pformat(instruction.statement)}")
-            debug("\nStarting execution...")
+    DIALECT = Dialect(typed=True, inheritance=True, lets=True, defaults=True,
+                      templates=True, exceptions=True,
+                      arity=ErrorType.NAME_ERROR)
+
+    def __init__(self, console_output=True, inp=None, trace_output=False,
+                 stackless=False, max_depth=None, tail_calls=False,
+                 profile=False, sink=None, source=None, budget=None,
+                 deadline=None, weigh=False, heap_limit=None,
+                 object_limit=None):
+        """
+        console_output, inp, trace_output, sink and source are as for
+        brewing.Barista
 
-        try:
-            cup_of_the_day = copy.copy(
-                self.classes[InterpreterBase.MAIN_CLASS_DEF]
-            )
-        except KeyError:
-            super().error(ErrorType.TYPE_ERROR, "Main class not found")
+        With stackless set, Brewin method calls are kept on an explicit stack
+        instead of the Python one, so recursion depth is bounded only by
+        max_depth (or available memory, if max_depth is None); max_depth is a
+        number of frames rather than bytes, each frame taking a few KiB (see
+        benchmarks/bench_stackless_frames.py)
 
-        try:
-            cup_of_the_day.call_method(InterpreterBase.MAIN_FUNC_DEF,
-                                       first_call=True, me=cup_of_the_day,
-                                       exception=None)
-        except KeyError:
-            super().error(ErrorType.NAME_ERROR, "Main method not found",
-                          cup_of_the_day.name.line_num)
-        except ValueError:
-            super().error(ErrorType.NAME_ERROR,
-                          "Main method cannot accept arguments",
-                          (cup_of_the_day.methods[InterpreterBase.MAIN_FUNC_DEF]
-                           .name.line_num))
-        except NameError as e:
-            super().error(ErrorType.NAME_ERROR, str(e),
-                          (cup_of_the_day.methods[InterpreterBase.MAIN_FUNC_DEF]
-                           .name.line_num))
-        except TypeError as e:
-            super().error(ErrorType.TYPE_ERROR, str(e),
-                          (cup_of_the_day.methods[InterpreterBase.MAIN_FUNC_DEF]
-                           .name.line_num))
-
-    def init(self):
-        self.classes: dict[SWLN, Recipe | None] = {}
-        self.templates: dict[SWLN, Formula | None] = {}
-
-    def add_class(self, name: SWLN, parent_name: SWLN | None, body: list):
-        if name in self.classes and self.classes[name]:
-            super().error(ErrorType.TYPE_ERROR, f"Duplicate classes: {name}",
-                          name.line_num)
-        self.classes[name] = Recipe(name, parent_name, body, self.classes,
-                                    self.templates, super().get_input,
-                                    super().output, super().error,
-                                    self.trace_output)
-
-    def add_template(self, name: SWLN, field_types: list[SWLN], body: list):
-        if name in self.templates and self.templates[name]:
-            super().error(ErrorType.TYPE_ERROR, f"Duplicate templates: {name}",
-                          name.line_num)
-        self.templates[name] = Formula(name, field_types, body, self.classes,
-                                       self.templates, super().get_input,
-                                       super().output, super().error,
-                                       self.trace_output)
-
-
-class Ingredient:
-    """
-    Field definition
-    """
-    def __init__(self, value: BrewinTypes, error: ErrorFun,
-                 trace_output: bool) -> None:
+        With tail_calls set, (return (call ...)) and a call ending a void
+        method reuse the calling frame instead of nesting a new one
+
+        With profile set, each run leaves a Taster with the time spent in every
+        Brewin method and line in taster
+
+        With budget set, a run may execute that many statements at most, and
+        with deadline set, take that many seconds at most; a run going past
+        either raises Overbrewed (see Timer)
+
+        With weigh set, or heap_limit (estimated bytes) or object_limit
+        (objects made by new) set, each run leaves a Scale with the live and
+        peak objects and bytes it used in scale; a new going past either
+        limit raises Overbrewed
+        """
+        super().__init__(console_output, inp, trace_output, sink, source)
+        self.stackless = stackless
+        self.max_depth = max_depth
+        self.tail_calls = tail_calls
+        self.profile = profile
+        self.taster = None
+        self.budget = budget
+        self.deadline = deadline
+        self.timer = None
+        self.weigh = weigh
+        self.heap_limit = heap_limit
+        self.object_limit = object_limit
+        self.scale = None
+
+    def prepare(self, program: list[str]) -> 'Menu':
+        """
+        Loads program once for run_prepared to run any number of times, on
+        this interpreter or any other
+
+        The program keeps the tail_calls setting of this interpreter
+        """
+        waiter = Waiter()
+        with waiter.serving(self):
+            self.load(self.parse(program), waiter)
+            self.stock()
+        return Menu(MappingProxyType(self.classes),
+                    MappingProxyType(self.templates), waiter)
+
+    def snapshot(self, program: list[str], path: str) -> 'Menu':
         """
-        Throws ValueError on invalid value
+        Prepares program and saves it, loaded and ready to run, to the file
+        at path, for restore to load back in place of preparing it again
         """
-        self.error = error
-        self.trace_output = trace_output
-        self.btype = None
-        self.is_super = False
-
-        match value:
-            case grounds if not isSWLN(grounds):
-                if self.trace_output:
-                    debug(f"Raw value to Ingredient: {grounds}:{type(grounds)}")
-                self.value = value
-            case InterpreterBase.NULL_DEF:
-                self.value = None
-            case InterpreterBase.TRUE_DEF:
-                self.value = True
-            case InterpreterBase.FALSE_DEF:
-                self.value = False
-            case str_or_int:
-                try:
-                    if str_or_int[0] == '"' and str_or_int[-1] == '"':
-                        self.value = str_or_int[1:-1]
-                    else:
-                        self.value = int(str_or_int)
-                except IndexError:
-                    self.error(ErrorType.SYNTAX_ERROR, "Blank value, somehow",
-                               value.line_num)
-
-    def __str__(self) -> str:
-        match self.value:
-            case True:
-                return InterpreterBase.TRUE_DEF
-            case False:
-                return InterpreterBase.FALSE_DEF
-            case None:
-                return InterpreterBase.NULL_DEF
-        return str(self.value)
-
-
-class Recipe:
+        menu = self.prepare(program)
+        Snapshot.save(path, self.classes, self.templates, menu.waiter)
+        return menu
+
+    @staticmethod
+    def restore(path: str) -> 'Menu':
+        """
+        Loads a program saved by snapshot, for run_prepared to run
+
+        Throws StaleSnapshot if the file is not a snapshot written by this
+        version of the interpreter
+        """
+        return Snapshot.load(path)
+
+    def run_prepared(self, menu: 'Menu', inp: list[str] | None = None):
+        """
+        Runs a program loaded by prepare from a fresh main object, reading inp
+        if given
+
+        Output, input and errors are this interpreter's, as if it had loaded
+        the program itself
+        """
+        self.reset()
+        if inp is not None:
+            self.inp = inp
+        self.classes, self.templates = menu.classes, menu.templates
+        with menu.waiter.serving(self):
+            self.execute()
+
+    def watchers(self) -> list:
+        watchers = super().watchers()
+        if self.profile:
+            self.taster = Taster()
+            watchers.append(self.taster)
+        if self.budget is not None or self.deadline is not None:
+            self.timer = Timer(self.budget, self.deadline)
+            watchers.append(self.timer)
+        if (self.weigh or self.heap_limit is not None
+                or self.object_limit is not None):
+            self.scale = Scale(self.heap_limit, self.object_limit)
+            watchers.append(self.scale)
+        return watchers
+
+
+SERVING: contextvars.ContextVar[Barista] = contextvars.ContextVar('serving')
+
+
+class Waiter:
     """
-    Class definition
+    Carries the errors a prepared program's classes report to the interpreter
+    running it
+
+    Input and output go by each run's own Tray; the interpreter errors go to
+    is the one serving in the current thread (or other context), so any
+    number of threads can run the same program at once
     """
-    def __init__(self, name: SWLN, parent_name: SWLN | None, body: list,
-                 classes: dict[SWLN, 'Recipe'],
-                 templates: dict[SWLN, 'Formula'], get_input: InputFun,
-                 output: OutputFun, error: ErrorFun, trace_output: bool
-                 ) -> None:
-        self.name = name
-        self.classes = classes
-        self.templates = templates
-        self.get_input = get_input
-        self.output = output
-        self.error = error
-        self.trace_output = trace_output
-        self.fields: dict[SWLN, Tin] = {}
-        self.methods: dict[SWLN, Instruction] = {}
-
-        if parent_name:
-            try:
-                self.parent = copy.copy(classes[parent_name])
-            except KeyError:
-                self.error(ErrorType.TYPE_ERROR,
-                           f"Class {parent_name} not defined above",
-                           parent_name.line_num)
-        else:
-            self.parent = None
-
-        for definition in body:
-            match definition:
-                case [InterpreterBase.FIELD_DEF, btype, name, value
-                      ] if isSWLN(btype) and isSWLN(name) and isSWLN(value):
-                    self.add_field(name, btype, value)
-                case [InterpreterBase.FIELD_DEF, btype, name
-                      ] if isSWLN(btype) and isSWLN(name):
-                    temp_name, *types = T2L(btype)
-                    match btype:
-                        case InterpreterBase.INT_DEF:
-                            self.add_field(name, btype, 0)
-                        case InterpreterBase.STRING_DEF:
-                            self.add_field(name, btype, "")
-                        case InterpreterBase.BOOL_DEF:
-                            self.add_field(name, btype, False)
-                        case class_name if isVarType(class_name, self,
-                                                     self.classes):
-                            self.add_field(name, btype, None)
-                        case class_name if temp_name in self.templates:
-                            try:
-                                self.templates[temp_name].compile(*types)
-                            except ValueError:
-                                self.error(ErrorType.TYPE_ERROR,
-                                           f"Template created with wrong "
-                                           f"number of types: {temp_name}",
-                                           temp_name.line_num)
-                            self.add_field(name, btype, None)
-                        case _:
-                            self.error(ErrorType.TYPE_ERROR,
-                                       f"Class {btype} not defined above",
-                                       btype.line_num)
-                case [InterpreterBase.METHOD_DEF, btype, name, params,
-                      statement] if isSWLN(btype) and isSWLN(name):
-                    self.add_method(name, btype, params, statement)
-                case _:
-                    self.error(ErrorType.SYNTAX_ERROR,
-                               f"Not a field or method: {definition}")
-
-    def __copy__(self):
-        tea = Recipe(self.name, self.parent.name if self.parent else None, [],
-                     self.classes, self.templates, self.get_input, self.output,
-                     self.error, self.trace_output)
-        for name, bag in self.fields.items():
-            tea.add_field(name, bag.btype, bag.value.value)
-        for steep in self.methods.values():
-            tea.add_method(steep.name, steep.btype, steep.formals,
-                           steep.statement)
-        return tea
-
-    def __str__(self) -> str:
-        return f'<class {self.name}>'
-
-    def add_field(self, name: SWLN, btype: SWLN, value: BrewinTypes):
-        if name in self.fields:
-            self.error(ErrorType.NAME_ERROR,
-                       f"Duplicate fields in {self.name}: {name}",
-                       name.line_num)
-        try:
-            beans = Ingredient(value, self.error, self.trace_output)
-        except ValueError:
-            self.error(ErrorType.SYNTAX_ERROR, f"Not a valid value: {value}",
-                       value.line_num)
+    @contextlib.contextmanager
+    def serving(self, barista: Barista):
+        token = SERVING.set(barista)
         try:
-            self.fields[name] = Tin(name, btype, beans, self, self.classes,
-                                    self.templates, self.error,
-                                    self.trace_output)
-        except TypeError as e:
-            self.error(ErrorType.TYPE_ERROR, str(e), value.line_num)
-
-    def add_method(self, name: SWLN, btype: SWLN,
-                   params: dict[SWLN, SWLN] | Any, statement):
-        if name in self.methods:
-            self.error(ErrorType.NAME_ERROR,
-                       f"Duplicate methods in {self.name}: {name}",
-                       name.line_num)
-        self.methods[name] = Instruction(name, btype, params, statement, self,
-                                         self.classes, self.templates,
-                                         self.fields, self.get_input,
-                                         self.output, self.error,
-                                         self.trace_output)
-
-    def is_instance(self, class_name: SWLN) -> bool:
-        return (self.name == class_name
-                or (self.parent and self.parent.is_instance(class_name)))
-
-    def call_method(self, name: SWLN, *args: Ingredient, first_call: bool,
-                    me: 'Recipe', exception: Ingredient | None
-                    ) -> Ingredient | None:
-        """
-        Throws KeyError if method not found
+            yield
+        finally:
+            SERVING.reset(token)
 
-        Throws ValueError on wrong number of arguments
+    def error(self, error_type: ErrorType, description: str | None = None,
+              line_num: int | None = None):
+        SERVING.get().error(error_type, description, line_num)
 
-        Throws NameError on wrong type passed in
 
-        Throws TypeError on wrong type returned
-        """
-        if self.trace_output and first_call:
-            debug(f"First call, setting me={self.name}")
-        if self.parent:
-            try:
-                return self.methods[name].call(*args,
-                                               me=self if first_call else me,
-                                               exception=exception)
-            except (KeyError, ValueError, NameError, TypeError):
-                pass
-            return self.parent.call_method(name, *args, first_call=False,
-                                           me=self if first_call else me,
-                                           exception=exception)
-        else:
-            return self.methods[name].call(*args, me=self if first_call else me,
-                                           exception=exception)
+class Menu(NamedTuple):
+    """
+    Program loaded by Barista.prepare
 
+    Every template instantiation its classes name is made while preparing
+    it, so running it never changes them, and any number of interpreters can
+    run it at once
+    """
+    classes: Mapping[SWLN, 'Recipe']
+    templates: Mapping[SWLN, 'Formula']
+    waiter: Waiter
 
-class Formula():
+
+class StaleSnapshot(ValueError):
     """
-    Template definition
+    Snapshot not written by this version of the interpreter
     """
-    def __init__(self, name: SWLN, field_types: list[SWLN], body: list,
-                 classes: dict[SWLN, Recipe], templates: dict[SWLN, 'Formula'],
-                 get_input: InputFun, output: OutputFun, error: ErrorFun,
-                 trace_output: bool) -> None:
-        self.name = name
-        self.field_types = field_types
-        self.body = body
-        self.classes = classes
-        self.templates = templates
-        self.get_input = get_input
-        self.output = output
-        self.error = error
-        self.trace_output = trace_output
-
-    def substitute_types(self, body, type_map: dict[SWLN, SWLN]):
-        if isSWLN(body):
-            if body in type_map:
-                return type_map[body]
-            elif len(l := T2L(body)) > 1:
-                return SWLN(
-                    InterpreterBase.TYPE_CONCAT_CHAR.join(
-                        self.substitute_types(t, type_map) for t in l
-                    ),
-                    body.line_num
-                )
-            else:
-                return body
-        return [ self.substitute_types(part, type_map) for part in body ]
 
-    def compile(self, *types: SWLN) -> Recipe:
-        """
-        Throws ValueError on wrong number of types
-        """
-        name = SWLN(InterpreterBase.TYPE_CONCAT_CHAR.join([self.name, *types]),
-                    self.name.line_num)
-        if name in self.classes:
-            return self.classes[name]
-        if self.trace_output:
-            debug(f"Compiling {name}")
-        if self.trace_output:
-            debug(f"{self.name} got {types=}")
-        for btype in types:
-            if self.trace_output:
-                debug(f"{self.name} got type {btype}")
-            if not isVarType(btype, self, self.classes):
-                self.error(ErrorType.TYPE_ERROR,
-                           f"Class {btype} not defined above", btype.line_num)
-        type_map = {field_type: btype for field_type, btype
-                    in zip(self.field_types, types, strict=True)}
-        if self.trace_output:
-            debug(f"{self.name}@{'@'.join(types)} type map: {type_map}")
-        body = self.substitute_types(self.body, type_map)
-        if self.trace_output:
-            debug(f"Body parsed from {self.name}@{'@'.join(types)}:")
-            debug(pprint.pformat(body))
-        cuppa = Recipe(name, None, body, self.classes, self.templates,
-                       self.get_input, self.output, self.error,
-                       self.trace_output)
-        self.classes[name] = cuppa
-        return cuppa
-
-
-class Tin:
+
+class Snapshot(pickle.Pickler):
     """
-    Variable definition
+    Writes a program loaded by Barista.prepare to a file, for Barista.restore
+    to load back without parsing or loading it again
+
+    A snapshot is a header (MAGIC, VERSION and a fingerprint of the source of
+    the interpreter) followed by the program's classes, templates and waiter,
+    both pickled; a snapshot whose header does not match the interpreter
+    reading it raises StaleSnapshot. The fingerprint already turns away
+    snapshots from before any change to the interpreter; VERSION is for
+    changes to the layout of the file itself
+
+    Tokens keep their line numbers, and the checks precomputed by remade
+    factories are made again as the snapshot is read. Only restore snapshots
+    from a trusted source: reading one can run any code pickle can
     """
-    def __init__(self, name: SWLN, btype: SWLN, boxed_value: Ingredient,
-                 me: Recipe, classes: dict[SWLN, Recipe],
-                 templates: dict[SWLN, Formula], error: ErrorFun,
-                 trace_output: bool) -> None:
+    MAGIC = b'brewin-snapshot'
+    VERSION = 1
+
+    def reducer_override(self, obj: Any):
+        match obj:
+            case Shot():
+                return Shot, (SWLN(obj, obj.line_num),)
+            case Refill():
+                return Refill, (SWLN(obj, obj.line_num), obj.returns)
+            case Kettle():
+                return Kettle, (SWLN(obj, obj.line_num), obj.plan)
+            case SWLN():
+                # most of a snapshot, so rebuilt without calling SWLN.__new__
+                return (str.__new__, (SWLN, str(obj)),
+                        {'line_num': obj.line_num})
+            case FunctionType() if hasattr(obj, 'remake'):
+                return obj.remake
+        return NotImplemented
+
+    @staticmethod
+    @functools.cache
+    def fingerprint() -> str:
         """
-        Throws TypeError on incompatible type
+        Hash of the source of every module a snapshot's objects come from
         """
-        self.name = name
-        self.classes = classes
-        self.templates = templates
-        self.error = error
-        self.trace_output = trace_output
-
-        temp_name, *types = T2L(btype)
+        sha = hashlib.sha256()
+        for module in ('intbase', 'bparser', 'brewing', __name__):
+            with open(sys.modules[module].__file__, 'rb') as f:
+                sha.update(f.read())
+        return sha.hexdigest()
+
+    @classmethod
+    def header(cls) -> tuple[bytes, int, str]:
+        return cls.MAGIC, cls.VERSION, cls.fingerprint()
+
+    @classmethod
+    def save(cls, path: str, classes: dict[SWLN, 'Recipe'],
+             templates: dict[SWLN, 'Formula'], waiter: Waiter):
+        with open(path, 'wb') as f:
+            pickle.dump(cls.header(), f, pickle.HIGHEST_PROTOCOL)
+            cls(f, pickle.HIGHEST_PROTOCOL).dump((classes, templates, waiter))
+
+    @classmethod
+    def load(cls, path: str) -> Menu:
+        with open(path, 'rb') as f:
+            try:
+                header = pickle.load(f)
+            except (pickle.UnpicklingError, EOFError, ValueError):
+                header = None
+            if header != cls.header():
+                raise StaleSnapshot(f"Not a snapshot of this interpreter: "
+                                    f"{path}")
+            # the collector would only walk the new objects over and over
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                classes, templates, waiter = pickle.load(f)
+            finally:
+                if collecting:
+                    gc.enable()
+        return Menu(MappingProxyType(classes), MappingProxyType(templates),
+                    waiter)
 
-        if self.trace_output:
-            debug(f"Tin checking {btype=}")
 
-        if isVarType(btype, me, classes):
-            self.btype = btype
-        elif temp_name in templates:
-            try:
-                templates[temp_name].compile(*types)
-                if self.trace_output:
-                    debug(f"Tin compiled {btype=}")
-            except ValueError:
-                self.error(ErrorType.TYPE_ERROR,
-                           f"Template created with wrong number of types: "
-                           f"{temp_name}",
-                           temp_name.line_num)
-            self.btype = btype
-        else:
-            self.error(ErrorType.TYPE_ERROR, f"Class {btype} not defined above",
-                       btype.line_num)
+class Taster:
+    """
+    Profiler
 
-        if self.trace_output:
-            debug(f"Tin {self.name} declared {self.btype}")
+    Keeps a shadow stack of the Brewin methods running, and charges the time
+    between one statement event and the next to the innermost method, the line
+    it is on and the chain of methods that led there
 
-        self.set_value(boxed_value)
+    Exclusive time leaves out nested statements and calls; inclusive time is
+    counted once, however deeply a method or line recurses
 
-    def set_value(self, boxed_value: Ingredient):
-        """
-        Throws TypeError on incompatible type
-        """
-        grounds = boxed_value.value
-        if self.trace_output:
-            debug(f"Setting {self.btype=} var to {type(grounds)=}")
-        match self.btype:
-            case InterpreterBase.INT_DEF:
-                if type(grounds) == int:
-                    boxed_value.btype = self.btype
-                    self.value = boxed_value
-                    return
-            case InterpreterBase.STRING_DEF:
-                if type(grounds) == str:
-                    boxed_value.btype = self.btype
-                    self.value = boxed_value
-                    return
-            case InterpreterBase.BOOL_DEF:
-                if type(grounds) == bool:
-                    boxed_value.btype = self.btype
-                    self.value = boxed_value
-                    return
-            case class_name:
-                if grounds is None:
-                    if (boxed_value.btype and boxed_value.btype in self.classes
-                        and not self.classes[boxed_value.btype]
-                                    .is_instance(self.btype)):
-                        raise TypeError(f"Class {boxed_value.btype} not "
-                                        f"derived from {class_name}")
-                    boxed_value.btype = self.btype
-                    self.value = boxed_value
-                    return
-                try:
-                    if grounds.is_instance(class_name):
-                        boxed_value.btype = self.btype
-                        self.value = boxed_value
-                        return
-                    raise TypeError(f"Class {grounds.name} not derived from "
-                                    f"{class_name}")
-                except AttributeError:
-                    pass
-        match grounds:
-            case int():
-                raise TypeError(f"Cannot assign value of type "
-                                f"{InterpreterBase.INT_DEF} to variable of "
-                                f"type {self.btype}")
-            case str():
-                raise TypeError(f"Cannot assign value of type "
-                                f"{InterpreterBase.STRING_DEF} to variable of "
-                                f"type {self.btype}")
-            case bool():
-                raise TypeError(f"Cannot assign value of type "
-                                f"{InterpreterBase.BOOL_DEF} to variable of "
-                                f"type {self.btype}")
-            case _:
-                raise TypeError(f"Cannot assign object to variable of type "
-                                f"{self.btype}")
-
-
-class Instruction:
-    """
-    Method definition
+    One Taster watches one run (see brewing.Watch), timing the statements
+    its evaluators are handed
     """
-    def __init__(self, name: SWLN, btype: SWLN, params: dict[SWLN, SWLN] | Any,
-                 statement, me: Recipe, classes: dict[SWLN, Recipe],
-                 templates: dict[SWLN, Formula], fields: dict[SWLN, Tin],
-                 get_input: InputFun, output: OutputFun, error: ErrorFun,
-                 trace_output: bool) -> None:
-        self.name = name
-        self.statement = statement
-        self.me = me
-        self.classes = classes
-        self.templates = templates
-        self.fields = fields
-        self.get_input = get_input
-        self.output = output
-        self.error = error
-        self.trace_output = trace_output
-        self.formals: dict[SWLN, SWLN] = {}
-
-        temp_name, *types = T2L(btype)
-
-        if isMethodType(btype, me, classes):
-            self.btype = btype
-        elif temp_name in templates:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter
+                 ) -> None:
+        self.clock = clock
+        self.methods: dict[str, list] = {}
+        self.lines: dict[tuple[str, int | None], list] = {}
+        self.stacks: dict[tuple[str, ...], float] = {}
+        self.frames: list[list] = []
+        self.active: dict[str | tuple[str, int | None], int] = {}
+        self.last = clock()
+
+    def wrap_statement(self, evaluate: Callable) -> Callable:
+        def timed_statement(statement, stack: Plate):
+            sip = self.begin(statement, stack)
             try:
-                templates[temp_name].compile(*types)
-            except ValueError:
-                self.error(ErrorType.TYPE_ERROR,
-                           f"Template created with wrong number of types: "
-                           f"{temp_name}",
-                           temp_name.line_num)
-            self.btype = btype
-        else:
-            self.error(ErrorType.TYPE_ERROR, f"Class {btype} not defined above",
-                       btype.line_num)
-
-        if type(params) == dict:
-            self.formals = params
-        else:
-            for param in params:
-                match param:
-                    case [btype, formal] if isSWLN(btype) and isSWLN(formal):
-                        self.add_parameter(formal, btype)
-                    case _:
-                        error(ErrorType.SYNTAX_ERROR,
-                              f"Malformed parameter: {param}", name.line_num)
-
-    def call(self, *args: Ingredient, me: Recipe, exception: Ingredient | None
-             ) -> Ingredient | None:
+                return evaluate(statement, stack)
+            finally:
+                self.end(stack, *sip)
+        return timed_statement
+
+    def wrap_steps(self, percolate: Callable) -> Callable:
+        def timed_steps(statement, stack: Plate):
+            sip = self.begin(statement, stack)
+            try:
+                return (yield from percolate(statement, stack))
+            finally:
+                self.end(stack, *sip)
+        return timed_steps
+
+    def charge(self, now: float):
+        if self.frames:
+            _, label, path, line, _ = self.frames[-1]
+            elapsed = now - self.last
+            self.methods[label][2] += elapsed
+            self.lines[line][2] += elapsed
+            self.stacks[path] = self.stacks.get(path, 0.0) + elapsed
+        self.last = now
+
+    def begin(self, statement, stack: Plate) -> tuple:
         """
-        Throws ValueError on wrong number of arguments
-
-        Throws NameError on wrong type passed in
-
-        Throws TypeError on wrong type returned
+        A statement starts; a Plate not seen yet means a method has been
+        called
         """
+        frames = self.frames
+        entered = not frames or frames[-1][0] is not stack
+        now = self.clock()
+        self.charge(now)
+        if entered:
+            instruction = stack.instruction
+            label = f"{instruction.me.name}.{instruction.name}"
+            path = (frames[-1][2] if frames else ()) + (label,)
+            frames.append([stack, label, path, None, None])
+            self.methods.setdefault(label, [0, 0.0, 0.0])[0] += 1
+            self.active[label] = self.active.get(label, 0) + 1
+        frame = frames[-1]
         try:
-            parameters = {formal: Tin(formal, btype, actual, me,
-                                      self.classes, self.templates, self.error,
-                                      self.trace_output)
-                          for (formal, btype), actual
-                          in zip(self.formals.items(), args, strict=True)}
-        except TypeError as e:
-            raise NameError(str(e))
-
-        is_return, beans = evaluate_statement(self.statement, me,
-                                              self.me.parent, self.classes,
-                                              self.templates, exception, None,
-                                              parameters, self.fields,
-                                              self.get_input, self.output,
-                                              self.error, self.trace_output)
-        if is_return and beans:
-            grounds = beans.value
-            if self.trace_output:
-                debug(f"Returning {type(grounds)=} val from {self.btype=}")
-            match self.btype:
-                case InterpreterBase.INT_DEF:
-                    if type(grounds) == int:
-                        beans.btype = self.btype
-                        return beans
-                case InterpreterBase.STRING_DEF:
-                    if type(grounds) == str:
-                        beans.btype = self.btype
-                        return beans
-                case InterpreterBase.BOOL_DEF:
-                    if type(grounds) == bool:
-                        beans.btype = self.btype
-                        return beans
-                case InterpreterBase.VOID_DEF:
-                    raise TypeError(f"Cannot return any value from method of "
-                                    f"type {InterpreterBase.VOID_DEF}")
-                case class_name:
-                    if grounds is None:
-                        if (beans.btype and beans.btype in self.classes
-                            and not self.classes[beans.btype]
-                                        .is_instance(self.btype)):
-                            raise TypeError(f"Class {beans.btype} not derived "
-                                            f"from {class_name}")
-                        beans.btype = self.btype
-                        return beans
-                    try:
-                        if grounds.is_instance(class_name):
-                            beans.btype = self.btype
-                            return beans
-                        raise TypeError(f"Returned object class {grounds.name} "
-                                        f"not derived from {class_name}")
-                    except AttributeError:
-                        pass
-            match grounds:
-                case int():
-                    raise TypeError(f"Cannot return value of type "
-                                    f"{InterpreterBase.INT_DEF} from method of "
-                                    f"type {self.btype}")
-                case str():
-                    raise TypeError(f"Cannot return value of type "
-                                    f"{InterpreterBase.STRING_DEF} from method "
-                                    f"of type {self.btype}")
-                case bool():
-                    raise TypeError(f"Cannot return value of type "
-                                    f"{InterpreterBase.BOOL_DEF} from method "
-                                    f"of type {self.btype}")
-                case _:
-                    raise TypeError(f"Cannot return object from method of type "
-                                    f"{self.btype}")
-
-        match self.btype:
-            case InterpreterBase.INT_DEF:
-                beans = Ingredient(0, self.error, self.trace_output)
-                beans.btype = self.btype
-                return beans
-            case InterpreterBase.STRING_DEF:
-                beans = Ingredient("", self.error, self.trace_output)
-                beans.btype = self.btype
-                return beans
-            case InterpreterBase.BOOL_DEF:
-                beans = Ingredient(False, self.error, self.trace_output)
-                beans.btype = self.btype
-                return beans
-            case InterpreterBase.VOID_DEF:
-                return None
-            case class_name:
-                beans = Ingredient(None, self.error, self.trace_output)
-                beans.btype = self.btype
-                return beans
-
-    def add_parameter(self, name: SWLN, btype: SWLN):
-        if name in self.formals:
-            self.error(ErrorType.NAME_ERROR,
-                       f"Duplicate parameters in {self.name}: name",
-                       name.line_num)
-        temp_name, *types = T2L(btype)
-        if isVarType(btype, self.me, self.classes):
-            self.formals[name] = btype
-        elif temp_name in self.templates:
-            try:
-                self.templates[temp_name].compile(*types)
-            except ValueError:
-                self.error(ErrorType.TYPE_ERROR,
-                           f"Template created with wrong number of types: "
-                           f"{temp_name}",
-                           temp_name.line_num)
-            self.formals[name] = btype
-        else:
-            self.error(ErrorType.TYPE_ERROR, f"Class {btype} not defined above",
-                       btype.line_num)
+            line = (frame[1], statement[0].line_num)
+        except (IndexError, AttributeError, TypeError):
+            line = (frame[1], None)
+        self.lines.setdefault(line, [0, 0.0, 0.0])[0] += 1
+        self.active[line] = self.active.get(line, 0) + 1
+        previous = frame[3], frame[4]
+        frame[3], frame[4] = line, statement
+        return entered, previous, line, now
+
+    def end(self, stack: Plate, entered: bool, previous: tuple, line: tuple,
+            start: float):
+        """
+        A statement is done, and with it the method if it was the body
+        """
+        frames = self.frames
+        if not frames or frames[-1][0] is not stack:
+            # a generator closed after the run ended
+            return
+        now = self.clock()
+        self.charge(now)
+        self.active[line] -= 1
+        if not self.active[line]:
+            self.lines[line][1] += now - start
+        frames[-1][3], frames[-1][4] = previous
+        if entered:
+            label = frames.pop()[1]
+            self.active[label] -= 1
+            if not self.active[label]:
+                self.methods[label][1] += now - start
+
+    def report(self, limit: int | None = 20) -> str:
+        """
+        Text report of the methods, then the lines, most exclusive time first
+        """
+        total = sum(self.stacks.values())
+        report = [f"Brewin profile: {total:.6f} s",
+                  "",
+                  f"{'calls':>9} {'inclusive':>12} {'exclusive':>12}  method"]
+        for label, (calls, inclusive, exclusive) in sorted(
+                self.methods.items(), key=lambda item: -item[1][2])[:limit]:
+            report.append(f"{calls:>9} {inclusive:>12.6f} {exclusive:>12.6f}  "
+                          f"{label}")
+        report += ["",
+                   f"{'hits':>9} {'inclusive':>12} {'exclusive':>12}  line"]
+        for (label, line_num), (hits, inclusive, exclusive) in sorted(
+                self.lines.items(), key=lambda item: -item[1][2])[:limit]:
+            report.append(f"{hits:>9} {inclusive:>12.6f} {exclusive:>12.6f}  "
+                          f"{label}:{line_num}")
+        return '\n'.join(report)
+
+    def collapsed(self) -> str:
+        """
+        Exclusive time of each chain of method calls, in microseconds, in the
+        collapsed stack format flamegraph.pl and speedscope read
+        """
+        return '\n'.join(f"{';'.join(path)} {round(elapsed * 1e6)}"
+                         for path, elapsed in sorted(self.stacks.items()))
 
 
-class Plate:
+class Overbrewed(RuntimeError):
     """
-    Stack frame
+    A run went past its statement budget, its deadline or its heap limits
+
+    reason is 'budget', 'deadline' or 'heap', and line_num the Brewin line
+    about to run (or the new about to be made) when it was stopped
     """
-    def __init__(self, stack: Union['Plate', None], me: Recipe,
-                 classes: dict[SWLN, Recipe], templates: dict[SWLN, Formula],
-                 error: ErrorFun, trace_output: bool) -> None:
-        self.under = stack
-        self.me = me
-        self.classes = classes
-        self.templates = templates
-        self.error = error
-        self.trace_output = trace_output
-        self.locals: dict[SWLN, Tin] = {}
-
-    def add_variable(self, name: SWLN, btype: SWLN, value: BrewinTypes):
-        if self.trace_output:
-            debug(f"Plate {value}")
-        if name in self.locals:
-            self.error(ErrorType.NAME_ERROR,
-                       f"Duplicate local variable: {name}", name.line_num)
-        try:
-            beans = Ingredient(value, self.error, self.trace_output)
-            if self.trace_output:
-                debug(f"Prepped {beans}")
-        except ValueError:
-            self.error(ErrorType.SYNTAX_ERROR, f"Not a valid value: {value}",
-                       name.line_num)
-        try:
-            self.locals[name] = Tin(name, btype, beans, self.me, self.classes,
-                                    self.templates, self.error,
-                                    self.trace_output)
-            if self.trace_output:
-                debug(f"Plated {self.locals[name]}")
-        except TypeError as e:
-            self.error(ErrorType.TYPE_ERROR, str(e), btype.line_num)
-
-    def get_variable(self, name: SWLN) -> Tin | None:
-        if self.trace_output:
-            debug(f"Tracing stack: finding {name}")
-        if name in self.locals:
-            return self.locals[name]
-        if self.trace_output:
-            debug(f"{name} not found in {self}")
-        if self.under:
-            return self.under.get_variable(name)
-        if self.trace_output:
-            debug(f"{name} is bottom plate")
-        return None
-
-
-class Complaint(Exception):
+    def __init__(self, reason: str, line_num: int | None,
+                 message: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.line_num = line_num
+
+
+class Timer:
     """
-    Exception
+    Statement budget and deadline
+
+    Counts statements down in strides, so the budget is charged and the clock
+    read only once every stride statements (or fewer, near the end of the
+    budget); a run is stopped no later than stride statements past its
+    deadline, and exactly once its budget is spent
+
+    One Timer watches one run (see brewing.Watch), from when it is made
     """
-    def __init__(self, message: Ingredient) -> None:
+    def __init__(self, budget: int | None = None,
+                 deadline: float | None = None, stride: int = 1024,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.budget = budget
+        self.deadline = deadline
+        self.stride = stride
+        self.clock = clock
+        self.charged = 0
+        self.cutoff = None if deadline is None else clock() + deadline
+        self.countdown = self.batch = self.next_batch()
+
+    @property
+    def statements(self) -> int:
         """
-        Throws ValueError if message is not of type string
+        Statements run so far
         """
-        if type(message.value) != str:
-            raise ValueError(f"Non-string used as exception: {message}")
+        return self.charged + self.batch - self.countdown
+
+    def wrap_statement(self, evaluate: Callable) -> Callable:
+        def counted_statement(statement, stack: Plate):
+            self.countdown -= 1
+            if self.countdown < 0:
+                self.tick(statement, stack)
+            return evaluate(statement, stack)
+        return counted_statement
+
+    def wrap_steps(self, percolate: Callable) -> Callable:
+        def counted_steps(statement, stack: Plate):
+            self.countdown -= 1
+            if self.countdown < 0:
+                self.tick(statement, stack)
+            return (yield from percolate(statement, stack))
+        return counted_steps
+
+    def next_batch(self) -> int:
+        if self.budget is None:
+            return self.stride
+        return max(min(self.stride, self.budget - self.charged), 0)
+
+    def tick(self, statement, stack: Plate):
+        """
+        The countdown ran out: charges the batch just run, and throws
+        Overbrewed if the budget is spent or the deadline has passed
+        """
+        self.charged += self.batch
+        if self.budget is not None and self.charged >= self.budget:
+            reason = 'budget'
+            message = f"Statement budget of {self.budget} spent"
+        elif self.cutoff is not None and self.clock() > self.cutoff:
+            reason = 'deadline'
+            message = f"Deadline of {self.deadline} s passed"
+        else:
+            reason = None
+        if reason is not None:
+            self.batch = self.countdown = 0
+            line_num = self.line_num(statement, stack)
+            raise Overbrewed(reason, line_num, f"{message} on line {line_num}")
+        self.batch = self.next_batch()
+        self.countdown = self.batch - 1
+
+    @staticmethod
+    def line_num(statement, stack: Plate) -> int | None:
+        try:
+            return statement[0].line_num
+        except (IndexError, AttributeError, TypeError):
+            return getattr(stack.instruction.name, 'line_num', None)
 
-        super().__init__(str(message))
 
-        self.message = message
+class Scale:
+    """
+    Heap accounting
 
-    def __str__(self) -> str:
-        return str(self.message)
+    Keeps count of the live objects made by new, with the Recipe copies, Tins
+    and Ingredients each is made of, and of the Plates of the calls in
+    progress, along with their estimated bytes; temporary values are not
+    counted, nor are methods, which every object shares with its class
 
+    A new that would take the live objects past object_limit, or their bytes
+    past heap_limit, throws Overbrewed instead
 
-def evaluate_expression(expression, me: Recipe, super: Recipe | None,
-                        classes: dict[SWLN, Recipe],
-                        templates: dict[SWLN, Formula],
-                        exception: Ingredient | None, stack: Plate | None,
-                        parameters: dict[SWLN, Tin], fields: dict[SWLN, Tin],
-                        error: ErrorFun, trace_output: bool) -> Ingredient:
+    One Scale watches one run (see brewing.Watch), told of each object and
+    Plate the run makes
     """
-    Guaranteed to return a boxed value (or throw a Brewin error if unable to)
-    """
-    if trace_output:
-        if type(expression) == list:
-            try:
-                debug(f"line {expression[0].line_num}: Expression starts with "
-                    f"{expression[0]}")
-            except IndexError:
-                debug("Empty expression")
-            except AttributeError:
-                debug(f"no line_num: Expression starts with {expression[0]}")
+    KINDS = ('Recipe', 'Tin', 'Ingredient', 'Plate')
+
+    def __init__(self, heap_limit: int | None = None,
+                 object_limit: int | None = None) -> None:
+        self.heap_limit = heap_limit
+        self.object_limit = object_limit
+        self.counts = dict.fromkeys(self.KINDS, 0)
+        self.sizes = dict.fromkeys(self.KINDS, 0)
+        self.peaks = dict.fromkeys(self.KINDS, 0)
+        self.objects = 0
+        self.total = 0
+        self.peak = 0
+        self.weights: dict[SWLN, tuple[tuple[str, int, int], ...]] = {}
+
+    def made(self, cuppa: Recipe, line_num: int | None, stack: Plate):
+        self.put(cuppa, line_num)
+
+    def plated(self, stack: Plate):
+        """
+        Counts the Plate of a call, until it is freed
+        """
+        weight = (('Plate', 1, sys.getsizeof(stack)
+                   + sys.getsizeof(stack.parameters)
+                   + sys.getsizeof(stack.values)
+                   + sys.getsizeof(stack.shadowed)
+                   + sys.getsizeof(stack.slots)),)
+        self.add(weight)
+        weakref.finalize(stack, self.take, weight)
+
+    def weigh(self, recipe: Recipe) -> tuple[tuple[str, int, int], ...]:
+        """
+        Counts and estimated bytes of an object of recipe's class, by kind,
+        worked out from the first one made
+        """
+        if recipe.name in self.weights:
+            return self.weights[recipe.name]
+        counts = dict.fromkeys(self.KINDS[:-1], 0)
+        sizes = dict.fromkeys(self.KINDS[:-1], 0)
+        cuppa = recipe
+        while cuppa is not None:
+            counts['Recipe'] += 1
+            sizes['Recipe'] += (sys.getsizeof(cuppa)
+                                + sys.getsizeof(vars(cuppa))
+                                + sys.getsizeof(cuppa.fields))
+            for can in cuppa.fields.values():
+                counts['Tin'] += 1
+                sizes['Tin'] += sys.getsizeof(can) + sys.getsizeof(vars(can))
+                counts['Ingredient'] += 1
+                sizes['Ingredient'] += (sys.getsizeof(can.value)
+                                        + sys.getsizeof(vars(can.value)))
+            cuppa = cuppa.parent
+        weight = tuple((kind, counts[kind], sizes[kind]) for kind in counts)
+        self.weights[recipe.name] = weight
+        return weight
+
+    def put(self, recipe: Recipe, line_num: int | None):
+        """
+        Counts an object new has made, until it is freed
+
+        Throws Overbrewed if it takes the heap past either limit
+        """
+        weight = self.weigh(recipe)
+        size = sum(kind[2] for kind in weight)
+        if self.object_limit is not None \
+                and self.objects + 1 > self.object_limit:
+            message = f"Object limit of {self.object_limit} reached"
+        elif self.heap_limit is not None \
+                and self.total + size > self.heap_limit:
+            message = f"Heap limit of {self.heap_limit} bytes reached"
         else:
-            try:
-                debug(f"line {expression.line_num}: Expression is {expression}")
-            except AttributeError:
-                debug(f"no line_num: Expression is {expression}")
-    match expression:
-        case InterpreterBase.ME_DEF:
-            return Ingredient(me, error, trace_output)
-        case InterpreterBase.SUPER_DEF:
-            if super:
-                beans = Ingredient(super, error, trace_output)
-                beans.is_super = True
-                return beans
-            else:
-                error(ErrorType.TYPE_ERROR, "Class is not inherited",
-                      expression.line_num)
-        case InterpreterBase.EXCEPTION_VARIABLE_DEF:
-            if exception:
-                return exception
-            else:
-                error(ErrorType.NAME_ERROR, "No exception has been thrown yet",
-                      expression.line_num)
-        case variable if (isSWLN(variable) and stack
-                          and (can := stack.get_variable(variable))):
-            return can.value
-        case variable if isSWLN(variable) and variable in parameters:
-            return parameters[variable].value
-        case variable if isSWLN(variable) and variable in fields:
-            return fields[variable].value
-        case const if isSWLN(const):
-            try:
-                return Ingredient(const, error, trace_output)
-            except ValueError:
-                error(ErrorType.NAME_ERROR, f"Variable not found: {const}",
-                      const.line_num)
-        case [InterpreterBase.CALL_DEF, obj_expression, method, *arguments
-              ] if isSWLN(method):
-            beans = evaluate_expression(obj_expression, me, super, classes,
-                                        templates, exception, stack, parameters,
-                                        fields, error, trace_output)
-            cuppa = beans.value
-            if cuppa is None:
-                error(ErrorType.FAULT_ERROR,
-                      f"Trying to dereference nullptr", expression[0].line_num)
-            try:
-                service = cuppa.call_method(
-                    method,
-                    *(evaluate_expression(argument, me, super, classes,
-                                          templates, exception, stack,
-                                          parameters, fields, error,
-                                          trace_output)
-                      for argument in arguments),
-                    first_call=not beans.is_super,
-                    me=me,
-                    exception=exception
-                )
-            except KeyError:
-                error(ErrorType.NAME_ERROR,
-                      f"Object does not have method: {method}", method.line_num)
-            except AttributeError:
-                error(ErrorType.TYPE_ERROR,
-                      f"Method being called on non-object",
-                      expression[0].line_num)
-            except ValueError:
-                error(ErrorType.NAME_ERROR,
-                      f"Method called with wrong number of arguments: {method}",
-                      expression[0].line_num)
-            except NameError as e:
-                error(ErrorType.NAME_ERROR, str(e), expression[0].line_num)
-            except TypeError as e:
-                error(ErrorType.TYPE_ERROR, str(e), expression[0].line_num)
-            if service is None:
-                error(ErrorType.TYPE_ERROR,
-                      f"Method did not return a value: {method}",
-                      expression[0].line_num)
-            else:
-                return service
-        case [InterpreterBase.NEW_DEF, name] if isSWLN(name):
-            name, *types = T2L(name)
-            if trace_output:
-                debug(f"New with {name=}, {types=}")
-            if types:
-                try:
-                    cuppa = templates[name].compile(*types)
-                except KeyError:
-                    error(ErrorType.TYPE_ERROR,
-                          f"Could not find template: {name}",
-                          expression[0].line_num)
-                except ValueError:
-                    error(ErrorType.TYPE_ERROR,
-                          f"Template created with wrong number of types: "
-                          f"{name}",
-                          name.line_num)
-            else:
-                try:
-                    cuppa = classes[name]
-                except KeyError:
-                    error(ErrorType.TYPE_ERROR, f"Could not find class: {name}",
-                          expression[0].line_num)
-            if trace_output:
-                debug(f"Object {cuppa} generated")
-            return Ingredient(copy.copy(cuppa), error, trace_output)
-        case [unary_operator, sub_expression] if isSWLN(unary_operator):
-            grounds = evaluate_expression(sub_expression, me, super, classes,
-                                          templates, exception, stack,
-                                          parameters, fields, error,
-                                          trace_output).value
-            if trace_output:
-                debug(f"{unary_operator=} with {grounds=}:{type(grounds)}")
-            match unary_operator:
-                case '!' if type(grounds) == bool:
-                    roast = bool(not grounds)
-                case _:
-                    error(ErrorType.TYPE_ERROR,
-                        f"No use of {unary_operator} is compatible with "
-                        f"expression type: {type(grounds)}",
-                        unary_operator.line_num)
-            if trace_output:
-                debug(f"{type(roast)=}")
-            return Ingredient(roast, error, trace_output)
-        case [binary_operator, left_expression, right_expression
-              ] if isSWLN(binary_operator):
-            beans = evaluate_expression(left_expression, me, super, classes,
-                                        templates, exception, stack, parameters,
-                                        fields, error, trace_output)
-            grounds = beans.value
-            milk = evaluate_expression(right_expression, me, super, classes,
-                                       templates, exception, stack, parameters,
-                                       fields, error, trace_output)
-            cream = milk.value
-            if trace_output:
-                debug(f"{binary_operator=} with {grounds=}:{type(grounds)} and "
-                      f"{cream=}:{type(cream)}")
-            match binary_operator:
-                # NOTE: `eval` only used after operator becomes known to prevent
-                #       arbitrary code execution
-                case '+'|'-'|'*'|'/'|'%' if type(grounds) == type(cream) == int:
-                    operator = eval(
-                        f'lambda left, right: left {binary_operator} right'
-                    )
-                    blend = int(operator(grounds, cream))
-                case '<'|'>'|'<='|'>='|'!='|'==' \
-                        if type(grounds) == type(cream) == int:
-                    operator = eval(
-                        f'lambda left, right: left {binary_operator} right'
-                    )
-                    blend = bool(operator(grounds, cream))
-                case '+' if type(grounds) == type(cream) == str:
-                    operator = eval(
-                        f'lambda left, right: left {binary_operator} right'
-                    )
-                    blend = str(operator(grounds, cream))
-                case '=='|'!='|'<'|'>'|'<='|'>=' \
-                        if type(grounds) == type(cream) == str:
-                    operator = eval(
-                        f'lambda left, right: left {binary_operator} right'
-                    )
-                    blend = bool(operator(grounds, cream))
-                case '!='|'==' if type(grounds) == type(cream) == bool:
-                    operator = eval(
-                        f'lambda left, right: left {binary_operator} right'
-                    )
-                    blend = bool(operator(grounds, cream))
-                case '&' if type(grounds) == type(cream) == bool:
-                    blend = bool(grounds and cream)
-                case '|' if type(grounds) == type(cream) == bool:
-                    blend = bool(grounds or cream)
-                case '==' if ((grounds is None or isinstance(grounds, Recipe))
-                              and (cream is None or isinstance(cream, Recipe))):
-                    if beans.btype:
-                        fragrance = classes[beans.btype]
-                    else:
-                        fragrance = grounds
-                    if milk.btype:
-                        flavor = classes[milk.btype]
-                    else:
-                        flavor = milk
-                    try:
-                        if not (fragrance.is_instance(flavor.name)
-                                or flavor.is_instance(fragrance.name)):
-                            error(ErrorType.TYPE_ERROR,
-                                  f"Classes {fragrance.name} and {flavor.name} "
-                                  f"are not related",
-                                  binary_operator.line_num)
-                    except AttributeError:
-                        pass
-                    blend = bool(grounds is cream)
-                case '!=' if ((grounds is None or isinstance(grounds, Recipe))
-                              and (cream is None or isinstance(cream, Recipe))):
-                    if beans.btype:
-                        fragrance = classes[beans.btype]
-                    else:
-                        fragrance = grounds
-                    if milk.btype:
-                        flavor = classes[milk.btype]
-                    else:
-                        flavor = milk
-                    try:
-                        if not (fragrance.is_instance(flavor.name)
-                                or flavor.is_instance(fragrance.name)):
-                            error(ErrorType.TYPE_ERROR,
-                                  f"Classes {fragrance.name} and {flavor.name} "
-                                  f"are not related",
-                                  binary_operator.line_num)
-                    except AttributeError:
-                        pass
-                    blend = bool(grounds is not cream)
-                case _:
-                    error(ErrorType.TYPE_ERROR,
-                        f"No use of {binary_operator} is compatible with "
-                        f"expression types: {type(grounds)}, {type(cream)}",
-                        binary_operator.line_num)
-            if trace_output:
-                debug(f"{type(blend)=}")
-            return Ingredient(blend, error, trace_output)
-        case _:
-            error(ErrorType.SYNTAX_ERROR,
-                  f"Not a valid expression: {expression}")
-
-
-def evaluate_statement(statement, me: Recipe, super: Recipe | None,
-                       classes: dict[SWLN, Recipe],
-                       templates: dict[SWLN, Formula],
-                       exception: Ingredient | None, stack: Plate | None,
-                       parameters: dict[SWLN, Tin], fields: dict[SWLN, Tin],
-                       get_input: InputFun, output: OutputFun, error: ErrorFun,
-                       trace_output: bool) -> Tuple[bool, None | Ingredient]:
-    """
-    Returns a tuple of the form (<if the method is returning>, <the boxed value
-    of the return, if there is one>)
-    """
-    if trace_output:
-        try:
-            debug(f"line {statement[0].line_num}: Running {statement[0]}")
-        except IndexError:
-            debug("Empty statement")
-        except AttributeError:
-            debug(f"no line_num: Running {statement[0]}")
-    match statement:
-        case [InterpreterBase.BEGIN_DEF, *sub_statements] if sub_statements:
-            for sub_statement in sub_statements:
-                latest_order = evaluate_statement(sub_statement, me, super,
-                                                  classes, templates, exception,
-                                                  stack, parameters, fields,
-                                                  get_input, output, error,
-                                                  trace_output)
-                if latest_order[0]:
-                    return latest_order
-        case [InterpreterBase.CALL_DEF, expression, method, *arguments
-              ] if isSWLN(method):
-            beans = evaluate_expression(expression, me, super, classes,
-                                        templates, exception, stack, parameters,
-                                        fields, error, trace_output)
-            cuppa = beans.value
-            if cuppa is None:
-                error(ErrorType.FAULT_ERROR,
-                      f"Trying to dereference nullptr", statement[0].line_num)
-            try:
-                cuppa.call_method(
-                    method,
-                    *(evaluate_expression(argument, me, super, classes,
-                                          templates, exception, stack,
-                                          parameters, fields, error,
-                                          trace_output)
-                      for argument in arguments),
-                    first_call=not beans.is_super,
-                    me=me,
-                    exception=exception
-                )
-            except KeyError:
-                error(ErrorType.NAME_ERROR,
-                      f"Object does not have method: {method}", method.line_num)
-            except AttributeError:
-                error(ErrorType.TYPE_ERROR,
-                      f"Method being called on non-object",
-                      statement[0].line_num)
-            except ValueError:
-                error(ErrorType.NAME_ERROR,
-                      f"Method called with wrong number of arguments: {method}",
-                      statement[0].line_num)
-            except NameError as e:
-                error(ErrorType.NAME_ERROR, str(e), statement[0].line_num)
-            except TypeError as e:
-                error(ErrorType.TYPE_ERROR, str(e), statement[0].line_num)
-        case [InterpreterBase.IF_DEF, expression, true_statement]:
-            condition = evaluate_expression(expression, me, super, classes,
-                                            templates, exception, stack,
-                                            parameters, fields, error,
-                                            trace_output).value
-            if type(condition) != bool:
-                error(ErrorType.TYPE_ERROR,
-                      "Condition did not evaluate to boolean",
-                      statement[0].line_num)
-            if condition:
-                order = evaluate_statement(true_statement, me, super, classes,
-                                           templates, exception, stack,
-                                           parameters, fields, get_input,
-                                           output, error, trace_output)
-                if order[0]:
-                    return order
-        case [InterpreterBase.IF_DEF, expression, true_statement,
-              false_statement]:
-            condition = evaluate_expression(expression, me, super, classes,
-                                            templates, exception, stack,
-                                            parameters, fields, error,
-                                            trace_output).value
-            if type(condition) != bool:
-                error(ErrorType.TYPE_ERROR,
-                      "Condition did not evaluate to boolean",
-                      statement[0].line_num)
-            if condition:
-                order = evaluate_statement(true_statement, me, super, classes,
-                                           templates, exception, stack,
-                                           parameters, fields, get_input,
-                                           output, error, trace_output)
-                if order[0]:
-                    return order
-            else:
-                order = evaluate_statement(false_statement, me, super, classes,
-                                           templates, exception, stack,
-                                           parameters, fields, get_input,
-                                           output, error, trace_output)
-                if order[0]:
-                    return order
-        case [InterpreterBase.INPUT_INT_DEF, variable] if isSWLN(variable):
-            if stack and (can := stack.get_variable(variable)):
-                pass
-            elif variable in parameters:
-                can = parameters[variable]
-            elif variable in fields:
-                can = fields[variable]
-            else:
-                error(ErrorType.NAME_ERROR, f"Variable not found: {variable}",
-                      variable.line_num)
-            try:
-                beans = Ingredient(int(get_input()), error, trace_output)
-            except ValueError:
-                error(ErrorType.TYPE_ERROR,
-                        "Could not convert input to integer",
-                        statement[0].line_num)
-            except TypeError:
-                error(ErrorType.TYPE_ERROR, "Expected input but got none",
-                        statement[0].line_num)
-            try:
-                can.set_value(beans)
-            except TypeError as e:
-                error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
-        case [InterpreterBase.INPUT_STRING_DEF, variable] if isSWLN(variable):
-            if stack and (can := stack.get_variable(variable)):
-                pass
-            elif variable in parameters:
-                can = parameters[variable]
-            elif variable in fields:
-                can = fields[variable]
-            else:
-                error(ErrorType.NAME_ERROR, f"Variable not found: {variable}",
-                      variable.line_num)
-            beans = Ingredient(str(get_input()), error, trace_output)
-            try:
-                can.set_value(beans)
-            except TypeError as e:
-                error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
-        case [InterpreterBase.PRINT_DEF, *arguments]:
-            if trace_output:
-                debug(output)
-            output(
-                ''.join(
-                    str(
-                        evaluate_expression(argument, me, super, classes,
-                                            templates, exception, stack,
-                                            parameters, fields, error,
-                                            trace_output)
-                    )
-                    for argument in arguments
-                )
-            )
-        case [InterpreterBase.RETURN_DEF]:
-            return True, None
-        case [InterpreterBase.RETURN_DEF, expression]:
-            return True, evaluate_expression(expression, me, super, classes,
-                                             templates, exception, stack,
-                                             parameters, fields, error,
-                                             trace_output)
-        case [InterpreterBase.SET_DEF, variable, expression
-              ] if isSWLN(variable):
-            if stack and (can := stack.get_variable(variable)):
-                pass
-            elif variable in parameters:
-                can = parameters[variable]
-            elif variable in fields:
-                can = fields[variable]
-            else:
-                error(ErrorType.NAME_ERROR, f"Variable not found: {variable}",
-                      variable.line_num)
-            beans = evaluate_expression(expression, me, super, classes,
-                                        templates, exception, stack, parameters,
-                                        fields, error, trace_output)
-            try:
-                can.set_value(beans)
-            except TypeError as e:
-                error(ErrorType.TYPE_ERROR, str(e), variable.line_num)
-        case [InterpreterBase.WHILE_DEF, expression, statement_to_run]:
-            while True:
-                condition = evaluate_expression(expression, me, super, classes,
-                                                templates, exception, stack,
-                                                parameters, fields, error,
-                                                trace_output).value
-                if type(condition) != bool:
-                    error(ErrorType.TYPE_ERROR,
-                          "Condition did not evaluate to boolean",
-                          statement[0].line_num)
-                if not condition:
-                    break
-                latest_order = evaluate_statement(statement_to_run, me, super,
-                                                  classes, templates, exception,
-                                                  stack, parameters, fields,
-                                                  get_input, output, error,
-                                                  trace_output)
-                if latest_order[0]:
-                    return latest_order
-        case [InterpreterBase.LET_DEF, var_defs, *sub_statements
-              ] if sub_statements:
-            stack = Plate(stack, me, classes, templates, error, trace_output)
-            for var_def in var_defs:
-                if trace_output:
-                    debug(f"Let {var_def=}")
-                match var_def:
-                    case [btype, name, value] if (isSWLN(btype) and isSWLN(name)
-                                                  and isSWLN(value)):
-                        stack.add_variable(name, btype, value)
-                    case [btype, name] if isSWLN(btype) and isSWLN(name):
-                        temp_name, *types = T2L(btype)
-                        match btype:
-                            case InterpreterBase.INT_DEF:
-                                stack.add_variable(name, btype, 0)
-                            case InterpreterBase.STRING_DEF:
-                                stack.add_variable(name, btype, "")
-                            case InterpreterBase.BOOL_DEF:
-                                stack.add_variable(name, btype, False)
-                            case class_name if isVarType(class_name, me,
-                                                         classes):
-                                stack.add_variable(name, btype, None)
-                            case class_name if temp_name in templates:
-                                try:
-                                    templates[temp_name].compile(*types)
-                                except ValueError:
-                                    error(ErrorType.TYPE_ERROR,
-                                          f"Template created with wrong number "
-                                          f"of types: {temp_name}",
-                                          temp_name.line_num)
-                                stack.add_variable(name, btype, None)
-                            case _:
-                                error(ErrorType.TYPE_ERROR,
-                                      f"Class {btype} not defined above",
-                                      btype.line_num)
-                    case _:
-                        error(ErrorType.SYNTAX_ERROR,
-                              f"Malformed local variable: {var_def}",
-                              statement[0].line_num)
-            for sub_statement in sub_statements:
-                latest_order = evaluate_statement(sub_statement, me, super,
-                                                  classes, templates, exception,
-                                                  stack, parameters, fields,
-                                                  get_input, output, error,
-                                                  trace_output)
-                if latest_order[0]:
-                    return latest_order
-        case [InterpreterBase.THROW_DEF, exception_expression]:
-            try:
-                raise Complaint(evaluate_expression(exception_expression, me,
-                                                    super, classes, templates,
-                                                    exception, stack,
-                                                    parameters, fields, error,
-                                                    trace_output))
-            except ValueError as e:
-                error(ErrorType.TYPE_ERROR, str(e), statement[0].line_num)
-        case [InterpreterBase.TRY_DEF, try_statement, catch_statement]:
-            try:
-                order = evaluate_statement(try_statement, me, super, classes,
-                                           templates, exception, stack,
-                                           parameters, fields, get_input,
-                                           output, error, trace_output)
-                if order[0]:
-                    return order
-            except Complaint as e:
-                order = evaluate_statement(catch_statement, me, super, classes,
-                                           templates, e.message, stack,
-                                           parameters, fields, get_input,
-                                           output, error, trace_output)
-                if order[0]:
-                    return order
-        case _:
-            error(ErrorType.SYNTAX_ERROR, f"Not a valid statement: {statement}")
-    return False, None
+            self.objects += 1
+            self.add(weight)
+            weakref.finalize(recipe, self.free, weight)
+            return
+        raise Overbrewed('heap', line_num, f"{message} on line {line_num}")
+
+    def free(self, weight: tuple[tuple[str, int, int], ...]):
+        self.objects -= 1
+        self.take(weight)
+
+    def add(self, weight: tuple[tuple[str, int, int], ...]):
+        counts, sizes = self.counts, self.sizes
+        for kind, count, size in weight:
+            counts[kind] += count
+            sizes[kind] += size
+            self.total += size
+            if counts[kind] > self.peaks[kind]:
+                self.peaks[kind] = counts[kind]
+        if self.total > self.peak:
+            self.peak = self.total
+
+    def take(self, weight: tuple[tuple[str, int, int], ...]):
+        for kind, count, size in weight:
+            self.counts[kind] -= count
+            self.sizes[kind] -= size
+            self.total -= size
+
+    def report(self) -> str:
+        """
+        Text report of the live and peak counts and live bytes of each kind
+        """
+        report = [f"Brewin heap: {self.total} bytes live, {self.peak} at peak",
+                  "",
+                  f"{'live':>9} {'peak':>9} {'bytes':>12}  kind"]
+        for kind in self.KINDS:
+            report.append(f"{self.counts[kind]:>9} {self.peaks[kind]:>9} "
+                          f"{self.sizes[kind]:>12}  {kind}")
+        return '\n'.join(report)
 
 
 Interpreter = Barista
@@ -0,0 +1,148 @@
+"""
+Output sinks for the interpreters
+
+A sink takes each line a Brewin program prints. Sink writes the lines to a
+stream in batches and keeps them in a log for get_output; the log can be a
+list (everything, as InterpreterBase keeps), a bounded collections.deque (the
+last lines only), a SpillLog (everything, mostly on disk) or None. Discard
+drops every line, and the interpreters then skip building them at all
+"""
+
+from typing import Iterator, TextIO, Union
+import collections
+import sys
+import tempfile
+
+
+class SpillLog:
+    """
+    Log keeping up to capacity lines in memory, moving them to a temporary file
+    whenever it fills
+
+    Lines are stored one per line of the file, so should not contain newlines
+    (Brewin strings cannot)
+    """
+    def __init__(self, capacity: int = 10000) -> None:
+        self.capacity = capacity
+        self.lines: list[str] = []
+        self.spilled = None
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[str]:
+        if self.spilled:
+            self.spilled.seek(0)
+            for line in self.spilled:
+                yield line[:-1]
+            self.spilled.seek(0, 2)
+        yield from self.lines
+
+    def append(self, line: str):
+        self.lines.append(line)
+        self.length += 1
+        if len(self.lines) >= self.capacity:
+            if self.spilled is None:
+                self.spilled = tempfile.TemporaryFile('w+')
+            self.spilled.writelines(f'{line}\n' for line in self.lines)
+            self.lines.clear()
+
+    def clear(self):
+        if self.spilled:
+            self.spilled.close()
+            self.spilled = None
+        self.lines.clear()
+        self.length = 0
+
+
+Log = Union[list[str], collections.deque[str], SpillLog]
+
+
+class Sink:
+    """
+    Writes printed lines to stream, flush_every lines at a time, and keeps them
+    in log
+
+    With flush_every=1 (the default) each line is written as it's printed, as
+    InterpreterBase does; the rest of a batch is written whenever flush is
+    called, which the interpreters do at the end of each run
+    """
+    discards = False
+
+    def __init__(self, stream: TextIO | None = None, log: Log | None = None,
+                 flush_every: int = 1) -> None:
+        self.stream = stream
+        self.log = log
+        self.flush_every = flush_every
+        self.buffer: list[str] = []
+        self.owns_stream = False
+
+    @classmethod
+    def to_file(cls, path: str, log: Log | None = None,
+                flush_every: int = 1024) -> 'Sink':
+        """
+        Streams the lines to the file at path, closing it on close
+        """
+        sink = cls(open(path, 'w'), log, flush_every)
+        sink.owns_stream = True
+        return sink
+
+    def write(self, line: str):
+        if self.log is not None:
+            self.log.append(line)
+        if self.stream is not None:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.flush_every:
+                self.stream.write('\n'.join(self.buffer) + '\n')
+                self.buffer.clear()
+
+    def flush(self):
+        if self.stream is not None:
+            if self.buffer:
+                self.stream.write('\n'.join(self.buffer) + '\n')
+                self.buffer.clear()
+            self.stream.flush()
+
+    def lines(self) -> list[str]:
+        if self.log is None:
+            return []
+        if type(self.log) is list:
+            return self.log
+        return list(self.log)
+
+    def clear(self):
+        """
+        Flushes what's been written and empties the log, for another run
+
+        A list log is replaced rather than emptied, as lines hands it out
+        as it is and earlier output should stay as it was
+        """
+        self.flush()
+        if type(self.log) is list:
+            self.log = []
+        elif self.log is not None:
+            self.log.clear()
+
+    def close(self):
+        self.flush()
+        if self.owns_stream:
+            self.stream.close()
+
+
+class Discard(Sink):
+    """
+    Drops every line
+    """
+    discards = True
+
+    def write(self, line: str):
+        pass
+
+
+def console_sink(console_output: bool) -> Sink:
+    """
+    The sink InterpreterBase.output amounts to: every line to stdout, if
+    console_output is set, and all of them logged
+    """
+    return Sink(sys.stdout if console_output else None, [])
@@ -0,0 +1,75 @@
+"""
+Input sources for the interpreters
+
+A source is called for each line inputi or inputs reads, returning None once
+there are no more, as InterpreterBase.get_input does. StreamSource reads a file
+or pipe a large chunk at a time and hands the lines out as they're asked for;
+IntSource does the same for input that's all integers, converting each chunk
+at once so inputi need not convert them line by line
+"""
+
+from typing import Iterator, TextIO
+import itertools
+import sys
+
+
+class StreamSource:
+    """
+    Lines of stream, read chunk_size characters at a time
+
+    Sources are also iterators over the lines not read yet
+    """
+    def __init__(self, stream: TextIO, chunk_size: int = 1 << 16) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.lines = itertools.chain.from_iterable(self.batches())
+        self.owns_stream = False
+
+    @classmethod
+    def from_file(cls, path: str, *args, **kwargs) -> 'StreamSource':
+        source = cls(open(path), *args, **kwargs)
+        source.owns_stream = True
+        return source
+
+    @classmethod
+    def stdin(cls, *args, **kwargs) -> 'StreamSource':
+        return cls(sys.stdin, *args, **kwargs)
+
+    def __call__(self) -> str | int | None:
+        return next(self.lines, None)
+
+    def __iter__(self) -> Iterator[str | int]:
+        return self.lines
+
+    def batches(self) -> Iterator[list]:
+        """
+        Yields the lines of each chunk read, without their newlines
+        """
+        rest = ''
+        while chunk := self.stream.read(self.chunk_size):
+            *lines, rest = (rest + chunk).split('\n')
+            if lines:
+                yield [line.removesuffix('\r') for line in lines]
+        if rest:
+            yield [rest.removesuffix('\r')]
+        if self.owns_stream:
+            self.stream.close()
+
+    def close(self):
+        self.stream.close()
+
+
+class IntSource(StreamSource):
+    """
+    Lines of stream as ints, converted a chunk at a time, so inputs reads
+    "007" as "7"
+
+    A chunk with a line that isn't an integer is handed out as strings
+    instead, so inputi still fails on that line
+    """
+    def batches(self) -> Iterator[list]:
+        for lines in super().batches():
+            try:
+                yield list(map(int, lines))
+            except ValueError:
+                yield lines
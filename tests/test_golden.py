@@ -0,0 +1,13 @@
+import unittest
+
+import golden
+
+
+class TestGolden(unittest.TestCase):
+    def test_corpus(self):
+        jobs = golden.load_corpus()
+
+        results, failures = golden.run(jobs, timeout=10)
+
+        self.assertEqual(len(results), len(jobs))
+        self.assertEqual(failures, {})
@@ -0,0 +1,78 @@
+import unittest
+
+from bparser import string_to_program
+import brewing
+import tracing
+import interpreterv1
+import interpreterv2
+import interpreterv3
+from interpreterv1 import Interpreter
+from tracing import Recorder
+
+
+class TestEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[], trace_output=False)
+
+    def test_shared(self):
+        for interpreter in (interpreterv1, interpreterv2, interpreterv3):
+            self.assertTrue(issubclass(interpreter.Interpreter,
+                                       brewing.Barista))
+            self.assertIs(interpreter.Interpreter.DIALECT.typed,
+                          interpreter is not interpreterv1)
+
+    def test_strings(self):
+        brewin = string_to_program('''
+            (class main
+                (field s "")
+                (field n 0)
+                (method main ()
+                    (begin
+                        (while (< n 100)
+                            (begin (set s (+ s "tea")) (set n (+ n 1))))
+                        (print (== s (+ "tea" (+ s ""))))
+                        (print (+ s "!"))
+                    )
+                )
+            )
+        ''')
+
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual(self.deaf_interpreter.get_output(),
+                         ['false', 'tea' * 100 + '!'])
+
+    def test_objects(self):
+        brewin = string_to_program('''
+            (class cup (method me () (return me)))
+            (class main
+                (field c null)
+                (method main ()
+                    (begin
+                        (set c (new cup))
+                        (print (== c (call c me)) (!= c null) (== null null))
+                    )
+                )
+            )
+        ''')
+
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual(self.deaf_interpreter.get_output(), ['truetruetrue'])
+
+    def test_traced(self):
+        brewin = string_to_program('''
+            (class main
+                (method main () (print "tea"))
+            )
+        ''')
+        recorder = Recorder()
+        self.deaf_interpreter.hooks.add(recorder)
+
+        self.deaf_interpreter.run(brewin)
+        Interpreter(console_output=False, inp=[]).run(brewin)
+
+        self.assertEqual([event[:3] for event in recorder.events],
+                         [(tracing.CALL, 'main.main', 2),
+                          (tracing.STATEMENT, 'main.main', 2),
+                          (tracing.RETURN, 'main.main', 2)])
@@ -122,3 +122,67 @@ true
         output = self.deaf_interpreter.get_output()
 
         self.assertEqual(output, '''sis'''.splitlines())
+
+    def test_shadowing_in_loop(self):
+        brewin = string_to_program('''
+            (class main
+  (field string name "field")
+  (method void show ()
+    (print name)
+  )
+  (method void main ()
+    (let ((int i 0) (string name "outer"))
+      (while (< i 2)
+        (begin
+          (let ((string name "inner") (int i 5))
+            (print name " " i)
+            (call me show)
+          )
+          (print name " " i)
+          (set i (+ i 1))
+        )
+      )
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, '''inner 5
+field
+outer 0
+inner 5
+field
+outer 1'''.splitlines())
+
+    def test_planned(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (let ((int i 0))
+      (while (< i 2)
+        (let ((cup c null) (string s "tea"))
+          (print s " " (== c null))
+          (set i (+ i 1))
+        )
+      )
+      (let ((int n "tea"))
+        (print "never")
+      )
+    )
+  )
+)
+(class cup)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(output, ['tea true', 'tea true'])
+        self.assertEqual(error, (ErrorType.TYPE_ERROR, 10))
@@ -175,3 +175,38 @@ derived'''.splitlines())
         error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
         self.assertIs(error_type, ErrorType.NAME_ERROR)
         self.assertEqual(error_line, 17)
+
+    def test_deep_comparison(self):
+        brewin = string_to_program('''
+            (class A)
+(class B inherits A)
+(class C inherits B)
+(class D inherits C)
+(class E inherits A)
+
+(class main
+  (field A a null)
+  (field D d null)
+  (field E e null)
+  (method void main ()
+    (begin
+      (set a (new D))
+      (set d (new D))
+      (print (== a d) " " (!= d a))
+      (set e (new E))
+      (print (== a e) " " (== d null))
+      (print (== d e))
+    )
+  )
+)
+        ''')
+
+        self.assertRaises(RuntimeError, self.deaf_interpreter.run, brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, '''false true
+false false'''.splitlines())
+
+        error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
+        self.assertIs(error_type, ErrorType.TYPE_ERROR)
+        self.assertEqual(error_line, 18)
@@ -0,0 +1,104 @@
+import gc
+import json
+import os
+import tempfile
+import unittest
+
+from batch import (ERROR, OK, TIMEOUT, UNCAUGHT, fan_out, load_jobs,
+                   run_batch)
+
+
+PROGRAMS = {
+    'double': '''
+(class main
+  (field int n 0)
+  (method void main ()
+    (begin (inputi n) (print (* n 2)))
+  )
+)
+''',
+    'spill': '''
+(class main
+  (method void main ()
+    (print (+ 1 "tea"))
+  )
+)
+''',
+    'stew': '''
+(class main
+  (method void main ()
+    (while true (print "tea"))
+  )
+)
+''',
+    'throw': '''
+(class main
+  (method void main ()
+    (begin (print "tea") (throw "spilt"))
+  )
+)
+''',
+}
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        for name, source in PROGRAMS.items():
+            with open(os.path.join(self.directory.name, f'{name}.brewin'),
+                      'w') as f:
+                f.write(source)
+        with open(os.path.join(self.directory.name, 'double.in'), 'w') as f:
+            f.write('21\n')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_directory(self):
+        jobs = load_jobs(self.directory.name)
+
+        results = run_batch(jobs, workers=2, timeout=0.5)
+
+        self.assertEqual([result['name'] for result in results],
+                         ['double', 'spill', 'stew', 'throw'])
+        double, spill, stew, throw = results
+        self.assertEqual((double['status'], double['output']), (OK, ['42']))
+        self.assertEqual(
+            (spill['status'], spill['error_type'], spill['error_line']),
+            (ERROR, 'TYPE_ERROR', 3)
+        )
+        self.assertEqual(stew['status'], TIMEOUT)
+        self.assertEqual(set(stew['output']), {'tea'})
+        self.assertEqual(
+            (throw['status'], throw['message'], throw['output']),
+            (UNCAUGHT, 'spilt', ['tea'])
+        )
+
+    def test_manifest(self):
+        manifest = os.path.join(self.directory.name, 'manifest.json')
+        with open(manifest, 'w') as f:
+            json.dump([{'program': 'double.brewin', 'input': 'double.in'},
+                       {'program': 'spill.brewin', 'version': 2}], f)
+
+        jobs = load_jobs(manifest)
+
+        self.assertEqual([(job.name, job.version) for job in jobs],
+                         [('double', 3), ('spill', 2)])
+        self.assertEqual(
+            [result['status'] for result in run_batch(jobs, workers=1)],
+            [OK, ERROR]
+        )
+
+    def test_fan_out(self):
+        with open(os.path.join(self.directory.name, 'double.brewin')) as f:
+            program = f.read().splitlines()
+        inputs = [[str(n)] for n in range(50)] + [['tea'], []]
+
+        results = fan_out(program, inputs, workers=2, stackless=True)
+
+        self.assertEqual([result['output'] for result in results[:50]],
+                         [[str(2 * n)] for n in range(50)])
+        self.assertEqual([(result['status'], result['error_type'])
+                          for result in results[50:]],
+                         [(ERROR, 'TYPE_ERROR'), (ERROR, 'TYPE_ERROR')])
+        self.assertFalse(gc.get_freeze_count())
@@ -0,0 +1,126 @@
+import unittest
+
+from batch import BUDGET, attempt
+from bparser import string_to_program
+from interpreterv3 import Interpreter, Overbrewed, Timer
+
+
+class TimedInterpreter(Interpreter):
+    def __init__(self, timer: Timer, **options) -> None:
+        super().__init__(**options)
+        self.given_timer = timer
+
+    def watchers(self) -> list:
+        return [*super().watchers(), self.given_timer]
+
+
+STEW = '''
+(class main
+  (field int n 0)
+  (method void main ()
+    (while true
+      (begin
+        (set n (+ n 1))
+        (print n)
+      )
+    )
+  )
+)
+'''
+
+SPIRAL = string_to_program('''
+(class main
+  (method int down ((int n))
+    (return (+ 1 (call me down (+ n 1))))
+  )
+  (method void main ()
+    (print (call me down 0))
+  )
+)
+''')
+
+
+class TestBudget(unittest.TestCase):
+    def test_budget(self):
+        interpreter = Interpreter(console_output=False, budget=2500)
+
+        with self.assertRaises(Overbrewed) as caught:
+            interpreter.run(string_to_program(STEW))
+
+        self.assertEqual((caught.exception.reason, caught.exception.line_num),
+                         ('budget', 5))
+        # the while, then the begin, set and print once around
+        self.assertEqual(interpreter.get_output()[-1], '833')
+        self.assertEqual(interpreter.timer.statements, 2500)
+
+    def test_deadline(self):
+        interpreter = Interpreter(console_output=False, deadline=0.05)
+
+        with self.assertRaises(Overbrewed) as caught:
+            interpreter.run(string_to_program(STEW))
+
+        self.assertEqual(caught.exception.reason, 'deadline')
+        self.assertIn(caught.exception.line_num, (4, 5, 6, 7))
+
+    def test_stackless_recursion(self):
+        interpreter = Interpreter(console_output=False, stackless=True,
+                                  budget=5000)
+
+        with self.assertRaises(Overbrewed) as caught:
+            interpreter.run(SPIRAL)
+
+        self.assertEqual((caught.exception.reason, caught.exception.line_num),
+                         ('budget', 3))
+
+    def test_within_budget(self):
+        interpreter = Interpreter(console_output=False, inp=['3'],
+                                  budget=4)
+
+        interpreter.run(string_to_program('''
+(class main
+  (field int n 0)
+  (method void main ()
+    (begin (inputi n) (print (* n 2)))
+  )
+)
+        '''))
+
+        self.assertEqual(interpreter.get_output(), ['6'])
+        self.assertEqual(interpreter.timer.statements, 3)
+
+    def test_per_run(self):
+        interpreter = Interpreter(console_output=False, budget=10)
+        plain_interpreter = Interpreter(console_output=False)
+
+        with self.assertRaises(Overbrewed):
+            interpreter.run(string_to_program(STEW))
+        plain_interpreter.run(string_to_program(
+            STEW.replace('true', '(< n 100)')
+        ))
+
+        self.assertEqual(interpreter.timer.statements, 10)
+        self.assertIsNone(plain_interpreter.timer)
+        self.assertEqual(plain_interpreter.get_output()[-1], '100')
+
+    def test_stride(self):
+        reads = []
+        timer = Timer(deadline=60, stride=10,
+                      clock=lambda: reads.append(0) or 0.0)
+
+        TimedInterpreter(timer, console_output=False).run(
+            string_to_program(STEW.replace('true', '(< n 100)'))
+        )
+
+        self.assertEqual(timer.statements, 1 + 100 * 3)
+        self.assertEqual(len(reads), 1 + 300 // 10)
+
+    def test_attempt(self):
+        interpreter = Interpreter(console_output=False, budget=100)
+
+        result = attempt(interpreter,
+                         lambda: interpreter.run(string_to_program(STEW)),
+                         None)
+
+        self.assertEqual((result['status'], result['error_line']),
+                         (BUDGET, 5))
+        self.assertEqual(result['output'][-1], '33')
@@ -383,3 +383,38 @@ Animal's name: koda'''.splitlines())
         error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
         self.assertIs(error_type, ErrorType.TYPE_ERROR)
         self.assertEqual(error_line, 7)
+
+    def test_nested_instantiation(self):
+        brewin = string_to_program('''
+            (tclass box (t)
+  (field t item)
+)
+
+(tclass crate (t)
+  (field box@t inner)
+  (method box@t get () (return inner))
+  (method void fill () (set inner (new box@t)))
+)
+
+(class main
+  (field crate@int c)
+  (field box@string s)
+  (method void main ()
+    (begin
+      (set c (new crate@int))
+      (call c fill)
+      (print (== (call c get) null))
+      (set s (call c get))
+    )
+  )
+)
+        ''')
+
+        self.assertRaises(RuntimeError, self.deaf_interpreter.run, brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['false'])
+
+        error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
+        self.assertIs(error_type, ErrorType.TYPE_ERROR)
+        self.assertEqual(error_line, 19)
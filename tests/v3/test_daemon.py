@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from daemon import (Client, Pantry, Server, footprint, receive_message,
+                    send_message)
+from interpreterv3 import Interpreter
+from bparser import string_to_program
+
+
+DOUBLE = '''
+(class main
+  (field int n 0)
+  (method void main ()
+    (begin (inputi n) (print (* n 2)))
+  )
+)
+'''
+
+STEW = '''
+(class main
+  (method void main () (while true (print "tea")))
+)
+'''
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'brewin.sock')
+        self.server = multiprocessing.get_context('fork').Process(
+            target=Server(self.path, 2 ** 20, 2).serve_forever, daemon=True
+        )
+        self.server.start()
+        while not os.path.exists(self.path):
+            time.sleep(0.01)
+
+    def tearDown(self) -> None:
+        self.server.terminate()
+        self.server.join()
+        self.directory.cleanup()
+
+    def test_runs(self):
+        with Client(self.path) as client:
+            first = client.run(DOUBLE, ['21'])
+            second = client.run(DOUBLE, ['4'], stackless=True)
+            third = client.run(DOUBLE, ['4'], tail_calls=True)
+
+        self.assertEqual((first['output'], first['cached']), (['42'], False))
+        self.assertEqual((second['output'], second['cached']), (['8'], True))
+        self.assertEqual((third['output'], third['cached']), (['8'], False))
+
+    def test_errors(self):
+        with Client(self.path) as client:
+            bad_input = client.run(DOUBLE, ['tea'])
+            bad_program = client.run('(class main (method void main ()')
+            stew = client.run(STEW, timeout=0.2)
+            then = client.run(DOUBLE, ['1'])
+
+        self.assertEqual(
+            (bad_input['status'], bad_input['error_type'],
+             bad_input['error_line']),
+            ('error', 'TYPE_ERROR', 4)
+        )
+        self.assertEqual((bad_program['status'], bad_program['error_type']),
+                         ('error', 'SYNTAX_ERROR'))
+        self.assertEqual(stew['status'], 'timeout')
+        self.assertEqual(then['output'], ['2'])
+
+    def test_concurrent(self):
+        with Client(self.path) as idle, Client(self.path) as slow, \
+                Client(self.path) as client:
+            client.connection.settimeout(5)
+            idle.run(DOUBLE, ['1'])
+            send_message(slow.connection, {'source': STEW, 'timeout': 1})
+            start = time.perf_counter()
+            quick = client.run(DOUBLE, ['5'])
+            waited = time.perf_counter() - start
+            stewed = receive_message(slow.connection)
+            again = idle.run(DOUBLE, ['2'])
+
+        self.assertEqual((quick['output'], quick['cached']), (['10'], True))
+        self.assertLess(waited, 1)
+        self.assertEqual(stewed['status'], 'timeout')
+        self.assertEqual(again['output'], ['4'])
+
+
+class TestPantry(unittest.TestCase):
+    def test_eviction(self):
+        menus = [
+            Interpreter(console_output=False).prepare(string_to_program(
+                DOUBLE.replace('2', str(n))
+            ))
+            for n in range(3, 6)
+        ]
+        size = footprint(menus[0])
+        pantry = Pantry(2 * size + size // 2)
+
+        for n, menu in enumerate(menus):
+            pantry.put((n,), menu)
+            pantry.get((0,))
+
+        self.assertGreater(size, 0)
+        self.assertEqual(list(pantry.menus), [(2,), (0,)])
+        self.assertIs(pantry.get((0,)), menus[0])
+        self.assertIsNone(pantry.get((1,)))
@@ -377,3 +377,54 @@ all good'''.splitlines())
         output = self.deaf_interpreter.get_output()
 
         self.assertEqual(output, '''all good'''.splitlines())
+
+    def test_throw_mid_expression(self):
+        brewin = string_to_program('''
+            (class main
+  (field int count 0)
+  (method int boom () (throw "boom"))
+  (method int tick () (begin (set count (+ count 1)) (return count)))
+  (method int add ((int a) (int b)) (return (+ a b)))
+  (method void main ()
+    (begin
+      (try
+        (print "sum " (call me add (call me tick) (+ 1 (call me boom))) (call me tick))
+        (print exception " " count)
+      )
+      (try
+        (while (< (call me tick) (call me boom)) (print "never"))
+        (print exception " " count)
+      )
+      (try
+        (set count (call me add (call me boom) (call me tick)))
+        (print exception " " count)
+      )
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, '''boom 1
+boom 2
+boom 2'''.splitlines())
+
+    def test_uncaught(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (begin
+      (print "before")
+      (throw "unhandled")
+      (print "after")
+    )
+  )
+)
+        ''')
+
+        self.assertRaisesRegex(Exception, "unhandled", self.deaf_interpreter.run,
+                               brewin)
+        self.assertEqual(self.deaf_interpreter.get_output(), ['before'])
@@ -0,0 +1,95 @@
+import gc
+import unittest
+
+from batch import HEAP, attempt
+from bparser import string_to_program
+from interpreterv3 import Interpreter, Overbrewed
+
+
+POTS = '''
+(class pot
+  (field int cups 0)
+  (field string bean "")
+  (method int pour () (return cups))
+)
+
+(class main
+  (field pot p null)
+  (field int n 0)
+  (method void main ()
+    (begin
+      (while (< n 5)
+        (begin
+          (set p (new pot))
+          (set n (+ n 1))
+        )
+      )
+      (print n)
+    )
+  )
+)
+'''
+
+
+class TestHeap(unittest.TestCase):
+    def test_counts(self):
+        gc.disable()
+        try:
+            interpreter = Interpreter(console_output=False, weigh=True)
+            interpreter.run(string_to_program(POTS))
+            scale = interpreter.scale
+        finally:
+            gc.enable()
+
+        self.assertEqual(interpreter.get_output(), ['5'])
+        # an object holds no reference to itself, so the last pot is freed as
+        # soon as the next is set in its place
+        self.assertEqual(scale.peaks, {'Recipe': 2, 'Tin': 4, 'Ingredient': 4,
+                                       'Plate': 1})
+        self.assertEqual(scale.objects, 0)
+        self.assertEqual(scale.total, 0)
+        self.assertGreater(scale.peak, 0)
+
+    def test_object_limit(self):
+        interpreter = Interpreter(console_output=False, object_limit=1)
+
+        gc.disable()
+        try:
+            with self.assertRaises(Overbrewed) as caught:
+                interpreter.run(string_to_program(POTS))
+        finally:
+            gc.enable()
+
+        self.assertEqual((caught.exception.reason, caught.exception.line_num),
+                         ('heap', 14))
+        self.assertEqual(interpreter.scale.peaks['Recipe'], 1)
+
+    def test_heap_limit(self):
+        interpreter = Interpreter(console_output=False, weigh=True)
+        interpreter.run(string_to_program(POTS))
+        limit = interpreter.scale.peak - 1
+        limited = Interpreter(console_output=False, heap_limit=limit)
+
+        gc.disable()
+        try:
+            result = attempt(limited, lambda: limited.run(
+                string_to_program(POTS)
+            ), None)
+        finally:
+            gc.enable()
+
+        self.assertEqual((result['status'], result['error_line']),
+                         (HEAP, 14))
+        self.assertLessEqual(result['heap_peak'], limit)
+
+    def test_per_run(self):
+        interpreter = Interpreter(console_output=False, object_limit=1)
+        plain_interpreter = Interpreter(console_output=False)
+
+        with self.assertRaises(Overbrewed):
+            interpreter.run(string_to_program(POTS))
+        plain_interpreter.run(string_to_program(POTS))
+
+        self.assertEqual(interpreter.scale.peaks['Recipe'], 1)
+        self.assertIsNone(plain_interpreter.scale)
+        self.assertEqual(plain_interpreter.get_output(), ['5'])
@@ -0,0 +1,151 @@
+import unittest
+
+from bparser import string_to_program
+from intbase import ErrorType
+from interpreterv3 import Interpreter
+
+
+class TestEverything(unittest.TestCase):
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[], trace_output=False)
+
+    def test_parameters(self):
+        brewin = string_to_program('''
+            (class animal
+  (method string name () (return "animal"))
+)
+
+(class dog inherits animal
+  (method string name () (return "dog"))
+)
+
+(class main
+  (method string describe ((int n) (bool b) (string s) (animal a))
+    (begin
+      (set n (+ n 1))
+      (set s (+ s "!"))
+      (if (== a null)
+        (return (+ s " nobody"))
+      )
+      (return (+ s (+ " " (call a name))))
+    )
+  )
+  (method void main ()
+    (begin
+      (print (call me describe 1 true "hi" (new dog)))
+      (print (call me describe 1 false "yo" null))
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, '''hi! dog
+yo! nobody'''.splitlines())
+
+    def test_default_returns(self):
+        brewin = string_to_program('''
+            (class main
+  (method int number () (print "number"))
+  (method string word () (return))
+  (method bool flag () (print "flag"))
+  (method main thing () (return))
+  (method void main ()
+    (begin
+      (print (call me number) (call me word) (call me flag))
+      (print (== (call me thing) null))
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, '''number
+flag
+0false
+true'''.splitlines())
+
+    def test_wrong_argument(self):
+        brewin = string_to_program('''
+            (class main
+  (method void take ((int n) (string s))
+    (print n s)
+  )
+  (method void main ()
+    (call me take 5 true)
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(error, (ErrorType.NAME_ERROR, 6))
+
+    def test_wrong_argument_count(self):
+        brewin = string_to_program('''
+            (class main
+  (method void take ((int n) (string s))
+    (print n s)
+  )
+  (method void main ()
+    (call me take 5)
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(error, (ErrorType.NAME_ERROR, 6))
+
+    def test_set_parameter_wrong_type(self):
+        brewin = string_to_program('''
+            (class main
+  (method void take ((int n))
+    (set n "five")
+  )
+  (method void main ()
+    (call me take 5)
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(error, (ErrorType.TYPE_ERROR, 3))
+
+    def test_wrong_return(self):
+        brewin = string_to_program('''
+            (class animal)
+(class rock)
+
+(class main
+  (method animal find ()
+    (return (new rock))
+  )
+  (method void main ()
+    (call me find)
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(error, (ErrorType.TYPE_ERROR, 9))
@@ -0,0 +1,86 @@
+import io
+import os
+import tempfile
+
+from interpreterv3 import Interpreter
+from sinks import Sink, SpillLog
+from tracing import Recorder
+
+from . import (test_class_templates, test_exception_handling,
+               test_method_calls, test_default_field_and_local_variable_values,
+               test_stackless)
+
+
+class PreparingInterpreter(Interpreter):
+    def run(self, program: list[str]):
+        self.run_prepared(self.prepare(program))
+
+
+class SnapshottingInterpreter(Interpreter):
+    def run(self, program: list[str]):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'program.snapshot')
+            self.snapshot(program, path)
+            self.run_prepared(self.restore(path))
+
+
+def traced(**options) -> Interpreter:
+    interpreter = Interpreter(**options)
+    interpreter.hooks.add(Recorder())
+    return interpreter
+
+
+QUIET = dict(console_output=False, inp=[], trace_output=False)
+
+MODES = {
+    'Stackless': lambda: Interpreter(**QUIET, stackless=True),
+    'TailCall': lambda: Interpreter(**QUIET, tail_calls=True),
+    'StacklessTailCall': lambda: Interpreter(**QUIET, stackless=True,
+                                             tail_calls=True),
+    'Budget': lambda: Interpreter(**QUIET, budget=1_000_000, deadline=60),
+    'StacklessBudget': lambda: Interpreter(**QUIET, stackless=True,
+                                           budget=1_000_000),
+    'Weighed': lambda: Interpreter(**QUIET, weigh=True),
+    'StacklessWeighed': lambda: Interpreter(**QUIET, stackless=True,
+                                            weigh=True),
+    'Profiled': lambda: Interpreter(**QUIET, profile=True),
+    'StacklessProfiled': lambda: Interpreter(**QUIET, stackless=True,
+                                             profile=True),
+    'Traced': lambda: traced(**QUIET),
+    'StacklessTraced': lambda: traced(**QUIET, stackless=True),
+    'Buffered': lambda: Interpreter(
+        **QUIET, sink=Sink(io.StringIO(), [], flush_every=64)
+    ),
+    'Spilled': lambda: Interpreter(**QUIET,
+                                   sink=Sink(log=SpillLog(capacity=2))),
+    'Prepared': lambda: PreparingInterpreter(**QUIET),
+    'Snapshot': lambda: SnapshottingInterpreter(**QUIET),
+    'TailCallSnapshot': lambda: SnapshottingInterpreter(**QUIET,
+                                                        tail_calls=True),
+}
+
+SUITES = {
+    'Templates': test_class_templates.TestEverything,
+    'Exceptions': test_exception_handling.TestEverything,
+    'MethodCalls': test_method_calls.TestEverything,
+    'Defaults': test_default_field_and_local_variable_values.TestEverything,
+}
+
+
+class ModeSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = self.make()
+
+
+# every suite under every mode, plus the stackless suite under the stackless
+# modes, as TestStacklessBudgetMethodCalls and the like
+for mode, make in MODES.items():
+    suites = dict(SUITES)
+    if make().stackless:
+        suites['Frames'] = test_stackless.TestStackless
+    for name, suite in suites.items():
+        globals()[f'Test{mode}{name}'] = type(
+            f'Test{mode}{name}', (ModeSetUp, suite),
+            {'make': staticmethod(make)}
+        )
+del mode, make, suites, name, suite
@@ -0,0 +1,73 @@
+import unittest
+
+from bparser import string_to_program
+from brewing import Pour
+from intbase import ErrorType
+from interpreterv3 import Ingredient, Interpreter
+
+
+class TestPour(unittest.TestCase):
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False)
+
+    def test_builder(self):
+        brewin = string_to_program('''
+            (class main
+  (field string s "")
+  (field string t "")
+  (field int i 0)
+  (method string twice ((string x)) (return (+ x x)))
+  (method void main ()
+    (begin
+      (while (< i 5)
+        (begin
+          (set s (+ s "ab"))
+          (set i (+ i 1))
+        )
+      )
+      (set t (+ s "!"))
+      (set s (+ s "?"))
+      (print s " " t " " (call me twice s))
+      (print (== t "ababababab!") (< s t) (+ (+ "x" "y") (+ "z" "w")))
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual(self.deaf_interpreter.get_output(), [
+            'ababababab? ababababab! ababababab?ababababab?',
+            'truefalsexyzw',
+        ])
+
+    def test_wrong_type(self):
+        brewin = string_to_program('''
+            (class main
+  (field int n 0)
+  (method void main ()
+    (set n (+ (+ "a" "b") "c"))
+  )
+)
+        ''')
+
+        self.assertRaises(RuntimeError, self.deaf_interpreter.run, brewin)
+
+        error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
+        self.assertIs(error_type, ErrorType.TYPE_ERROR)
+        self.assertEqual(error_line, 4)
+
+    def test_shared_pieces(self):
+        tea = Pour(['a', 'b'], 2, None, False)
+
+        chai = tea.pour('c')
+        mocha = tea.pour('d')
+        latte = chai.pour('e')
+
+        self.assertIs(chai.pieces, latte.pieces)
+        self.assertIsNot(chai.pieces, mocha.pieces)
+        self.assertEqual([cup.value for cup in (tea, chai, mocha, latte)],
+                         ['ab', 'abc', 'abd', 'abce'])
+        self.assertEqual(latte.pour('f').pieces, ['abce', 'f'])
+        self.assertIsInstance(latte, Ingredient)
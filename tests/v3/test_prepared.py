@@ -0,0 +1,177 @@
+import threading
+import unittest
+
+from bparser import string_to_program
+from intbase import ErrorType
+from interpreterv3 import Interpreter
+
+
+class TestPrepared(unittest.TestCase):
+    def test_many_inputs(self):
+        brewin = string_to_program('''
+            (class counter
+  (field int count 0)
+  (method int add ((int n)) (begin (set count (+ count n)) (return count)))
+)
+
+(class main
+  (field counter c null)
+  (field int n 0)
+  (method void main ()
+    (begin
+      (set c (new counter))
+      (inputi n)
+      (call c add n)
+      (inputi n)
+      (print (call c add n))
+    )
+  )
+)
+        ''')
+        kitchen = Interpreter(console_output=False)
+        menu = kitchen.prepare(brewin)
+        interpreter = Interpreter(console_output=False)
+
+        outputs = []
+        for inp in (['1', '2'], ['10', '20'], ['5', '5']):
+            interpreter.run_prepared(menu, inp)
+            outputs.append(list(interpreter.get_output()))
+
+        self.assertEqual(outputs, [['3'], ['30'], ['10']])
+        self.assertEqual(kitchen.get_output(), [])
+
+    def test_shared(self):
+        brewin = string_to_program('''
+            (tclass box (field_type)
+  (field field_type value)
+  (method void put ((field_type v)) (set value v))
+  (method field_type get () (return value))
+)
+
+(class main
+  (field int n 0)
+  (method void main ()
+    (begin
+      (inputi n)
+      (let ((box@int b null))
+        (set b (new box@int))
+        (call b put (* n n))
+        (print (call b get))
+      )
+    )
+  )
+)
+        ''')
+        menu = Interpreter(console_output=False).prepare(brewin)
+        first = Interpreter(console_output=False, inp=['3'])
+        second = Interpreter(console_output=False, inp=['4'], stackless=True)
+
+        first.run_prepared(menu)
+        second.run_prepared(menu)
+        first.run_prepared(menu, ['5'])
+
+        self.assertEqual(first.get_output(), ['25'])
+        self.assertEqual(second.get_output(), ['16'])
+        self.assertEqual(set(menu.classes), {'main', 'box@int'})
+        with self.assertRaises(TypeError):
+            menu.classes['main'] = None
+
+    def test_threads(self):
+        brewin = string_to_program('''
+            (tclass box (field_type)
+  (field field_type value)
+  (method void put ((field_type v)) (set value v))
+  (method field_type get () (return value))
+)
+
+(class main
+  (field int n 0)
+  (method int sum ((int k))
+    (if (== k 0) (return 0) (return (+ k (call me sum (- k 1)))))
+  )
+  (method void main ()
+    (begin
+      (inputi n)
+      (let ((box@int b null) (box@string s null))
+        (set b (new box@int))
+        (set s (new box@string))
+        (call b put (call me sum n))
+        (call s put "tea")
+        (print (call s get) (call b get))
+        (if (== n 0) (print (+ n "tea")) (print (/ 100 n)))
+      )
+    )
+  )
+)
+        ''')
+        menu = Interpreter(console_output=False).prepare(brewin)
+        classes = set(menu.classes)
+        results = {}
+
+        def serve(name: str, inputs: list[str], **options):
+            interpreter = Interpreter(console_output=False, **options)
+            served = []
+            for inp in inputs:
+                try:
+                    interpreter.run_prepared(menu, [inp])
+                except RuntimeError:
+                    pass
+                served.append((list(interpreter.get_output()),
+                               interpreter.get_error_type_and_line()))
+            results[name] = served
+
+        inputs = [str(n % 7) for n in range(200)]
+        threads = [threading.Thread(target=serve, args=('plain', inputs)),
+                   threading.Thread(target=serve, args=('stackless', inputs),
+                                    kwargs={'stackless': True})]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = [([f'tea{int(n) * (int(n) + 1) // 2}', str(100 // int(n))],
+                     (None, None)) if n != '0'
+                    else (['tea0'], (ErrorType.TYPE_ERROR, 21))
+                    for n in inputs]
+        self.assertEqual(results, {'plain': expected, 'stackless': expected})
+        self.assertEqual(set(menu.classes), classes)
+
+    def test_errors(self):
+        brewin = string_to_program('''
+            (class main
+  (field int n 0)
+  (method void main ()
+    (begin
+      (inputi n)
+      (print (/ 10 n))
+      (print (+ n "tea"))
+    )
+  )
+)
+        ''')
+        kitchen = Interpreter(console_output=False)
+        menu = kitchen.prepare(brewin)
+        interpreter = Interpreter(console_output=False)
+
+        with self.assertRaises(RuntimeError):
+            interpreter.run_prepared(menu, ['2'])
+
+        self.assertEqual(interpreter.get_output(), ['5'])
+        self.assertEqual(interpreter.get_error_type_and_line(),
+                         (ErrorType.TYPE_ERROR, 7))
+        self.assertEqual(kitchen.get_error_type_and_line(), (None, None))
+
+    def test_load_errors(self):
+        brewin = string_to_program('''
+            (class main
+  (field flavor f null)
+  (method void main () (print "tea"))
+)
+        ''')
+        kitchen = Interpreter(console_output=False)
+
+        with self.assertRaises(RuntimeError):
+            kitchen.prepare(brewin)
+
+        self.assertEqual(kitchen.get_error_type_and_line(),
+                         (ErrorType.TYPE_ERROR, 2))
@@ -0,0 +1,173 @@
+import unittest
+
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+
+
+class ProfileSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False, profile=True)
+
+
+class StacklessProfileSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False, stackless=True,
+                                            profile=True)
+
+
+class TestProfiler(ProfileSetUp, unittest.TestCase):
+    def test_call_counts(self):
+        brewin = string_to_program('''
+            (class main
+  (method int fib ((int n))
+    (if (< n 2)
+      (return n)
+      (return (+ (call me fib (- n 1)) (call me fib (- n 2))))
+    )
+  )
+  (method void main ()
+    (print (call me fib 10))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+        taster = self.deaf_interpreter.taster
+
+        self.assertEqual(output, ['55'])
+        self.assertEqual(taster.methods['main.fib'][0], 177)
+        self.assertEqual(taster.methods['main.main'][0], 1)
+        self.assertEqual(taster.lines[('main.fib', 3)][0], 177)
+        self.assertEqual(taster.lines[('main.fib', 4)][0], 89)
+        self.assertEqual(taster.lines[('main.fib', 5)][0], 88)
+
+    def test_inclusive_and_exclusive(self):
+        brewin = string_to_program('''
+            (class helper
+  (method void work ((int n))
+    (while (> n 0) (set n (- n 1)))
+  )
+)
+
+(class main
+  (field helper h null)
+  (method void main ()
+    (begin
+      (set h (new helper))
+      (call h work 50)
+      (call h work 50)
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        taster = self.deaf_interpreter.taster
+        main_calls, main_inclusive, main_exclusive = taster.methods['main.main']
+        work_calls, work_inclusive, work_exclusive = \
+            taster.methods['helper.work']
+
+        self.assertEqual(work_calls, 2)
+        self.assertAlmostEqual(work_inclusive, work_exclusive)
+        self.assertGreater(main_inclusive, work_inclusive)
+        self.assertAlmostEqual(main_inclusive, main_exclusive + work_inclusive)
+        self.assertAlmostEqual(sum(taster.stacks.values()), main_inclusive)
+
+    def test_collapsed_stacks(self):
+        brewin = string_to_program('''
+            (class main
+  (method void inner () (print "tea"))
+  (method void outer () (call me inner))
+  (method void main ()
+    (begin
+      (call me outer)
+      (call me inner)
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        collapsed = self.deaf_interpreter.taster.collapsed()
+        stacks = [line.rsplit(' ', 1)[0] for line in collapsed.splitlines()]
+
+        self.assertEqual(stacks, ['main.main', 'main.main;main.inner',
+                                  'main.main;main.outer',
+                                  'main.main;main.outer;main.inner'])
+
+    def test_report(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (print "tea")
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        report = self.deaf_interpreter.taster.report()
+
+        self.assertIn('main.main', report)
+        self.assertIn('main.main:3', report)
+
+    def test_per_run(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (print "tea")
+  )
+)
+        ''')
+        plain_interpreter = Interpreter(console_output=False, inp=[],
+                                        trace_output=False)
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        taster = self.deaf_interpreter.taster
+        plain_interpreter.run(brewin)
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+
+        self.assertIsNone(plain_interpreter.taster)
+        self.assertEqual(plain_interpreter.watchers(), [])
+        self.assertIsNot(self.deaf_interpreter.taster, taster)
+        self.assertEqual(taster.methods['main.main'][0], 1)
+        self.assertEqual(self.deaf_interpreter.taster.methods['main.main'][0],
+                         1)
+
+    def test_tail_calls_stay_flat(self):
+        brewin = string_to_program('''
+            (class main
+  (method int count ((int n) (int total))
+    (if (== n 0)
+      (return total)
+      (return (call me count (- n 1) (+ total n)))
+    )
+  )
+  (method void main ()
+    (print (call me count 1000 0))
+  )
+)
+        ''')
+        self.deaf_interpreter.tail_calls = True
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+        taster = self.deaf_interpreter.taster
+
+        self.assertEqual(output, ['500500'])
+        self.assertEqual(taster.methods['main.count'][0], 1001)
+        self.assertEqual(set(taster.stacks),
+                         {('main.main',), ('main.main', 'main.count')})
+
+
+class TestStacklessProfiler(StacklessProfileSetUp, TestProfiler):
+    pass
@@ -0,0 +1,83 @@
+import unittest
+
+from bparser import string_to_program
+from intbase import ErrorType
+from interpreterv3 import Interpreter, Shot
+
+
+class TestShots(unittest.TestCase):
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False)
+
+    def test_marked(self):
+        brewin = string_to_program('''
+            (class main
+  (field int n 7)
+  (field string s "tea")
+  (method int half ((int x)) (return (/ x 2)))
+  (method void main ()
+    (let ((int m -2) (bool b false))
+      (print (+ n (* m 3)) " " (call me half -7) " " (% n m))
+      (print (< (call me half n) m) " " (== s "tea") " " (== b false))
+    )
+  )
+)
+        ''')
+        menu = self.deaf_interpreter.prepare(brewin)
+
+        self.deaf_interpreter.run_prepared(menu)
+
+        methods = menu.classes['main'].methods
+        half = methods['half'].statement
+        first, second = methods['main'].statement[2:]
+        self.assertIs(type(half[1][0]), Shot)
+        self.assertIs(type(first[1][0]), Shot)
+        self.assertIs(type(first[1][2][0]), Shot)
+        self.assertIs(type(second[1][0]), Shot)
+        self.assertIsNot(type(second[3][0]), Shot)
+        self.assertIsNot(type(second[5][0]), Shot)
+        self.assertEqual(self.deaf_interpreter.get_output(),
+                         ['1 -3 -1', 'false true true'])
+
+    def test_guard(self):
+        brewin = string_to_program('''
+            (class cup
+  (method int size () (return 1))
+  (method int doubled () (return (+ (call me size) (call me size))))
+)
+
+(class mug inherits cup
+  (method string size () (return "big"))
+)
+
+(class main
+  (method void main ()
+    (print (call (new mug) doubled))
+  )
+)
+        ''')
+
+        self.assertRaises(RuntimeError, self.deaf_interpreter.run, brewin)
+
+        error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
+        self.assertIs(error_type, ErrorType.TYPE_ERROR)
+        self.assertEqual(error_line, 12)
+
+    def test_stackless(self):
+        brewin = string_to_program('''
+            (class main
+  (method int fib ((int n))
+    (if (< n 2)
+      (return n)
+      (return (+ (call me fib (- n 1)) (call me fib (- n 2))))
+    )
+  )
+  (method void main () (print (call me fib 15)))
+)
+        ''')
+        interpreter = Interpreter(console_output=False, stackless=True)
+
+        interpreter.run(brewin)
+
+        self.assertEqual(interpreter.get_output(), ['610'])
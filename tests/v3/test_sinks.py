@@ -0,0 +1,119 @@
+import collections
+import io
+import os
+import tempfile
+import unittest
+
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+from sinks import Discard, Sink, SpillLog
+
+
+PRINTS = string_to_program('''
+    (class main
+  (method void main ()
+    (begin
+      (print "tea")
+      (print "coffee " 2)
+      (print "cocoa")
+    )
+  )
+)
+''')
+
+
+class TestSinks(unittest.TestCase):
+    def test_buffered(self):
+        stream = io.StringIO()
+        interpreter = Interpreter(console_output=False,
+                                  sink=Sink(stream, [], flush_every=2))
+
+        interpreter.sink.write('kettle')
+        self.assertEqual(stream.getvalue(), '')
+        interpreter.run(PRINTS)
+
+        self.assertEqual(stream.getvalue(), 'kettle\ntea\ncoffee 2\ncocoa\n')
+        self.assertEqual(interpreter.get_output(),
+                         ['kettle', 'tea', 'coffee 2', 'cocoa'])
+
+    def test_earlier_output(self):
+        interpreter = Interpreter(console_output=False)
+        programs = [string_to_program(f'''
+            (class main (method void main () (print "{word}")))
+        ''') for word in ('one', 'two', 'three')]
+
+        interpreter.run(programs[0])
+        first = interpreter.get_output()
+        interpreter.reset()
+        interpreter.run(programs[1])
+        second = interpreter.get_output()
+        interpreter.run_prepared(interpreter.prepare(programs[2]))
+
+        self.assertEqual(first, ['one'])
+        self.assertEqual(second, ['two'])
+        self.assertEqual(interpreter.get_output(), ['three'])
+
+    def test_bounded_log(self):
+        interpreter = Interpreter(
+            console_output=False,
+            sink=Sink(log=collections.deque(maxlen=2))
+        )
+
+        interpreter.run(PRINTS)
+
+        self.assertEqual(interpreter.get_output(), ['coffee 2', 'cocoa'])
+
+    def test_spill_log(self):
+        log = SpillLog(capacity=2)
+        interpreter = Interpreter(console_output=False, sink=Sink(log=log))
+
+        interpreter.run(PRINTS)
+
+        self.assertEqual(log.lines, ['cocoa'])
+        self.assertEqual(len(log), 3)
+        self.assertEqual(interpreter.get_output(), ['tea', 'coffee 2', 'cocoa'])
+        interpreter.reset()
+        self.assertEqual(interpreter.get_output(), [])
+
+    def test_to_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'out.txt')
+            sink = Sink.to_file(path)
+            interpreter = Interpreter(console_output=False, sink=sink)
+
+            interpreter.run(PRINTS)
+            sink.close()
+
+            with open(path) as f:
+                self.assertEqual(f.read(), 'tea\ncoffee 2\ncocoa\n')
+            self.assertEqual(interpreter.get_output(), [])
+
+    def test_discard(self):
+        brewin = string_to_program('''
+            (class main
+  (field int n 0)
+  (method int sip () (begin (set n (+ n 1)) (return n)))
+  (method void main ()
+    (begin
+      (print "sip " (call me sip))
+      (print (call me sip))
+      (print (+ 1 "tea"))
+    )
+  )
+)
+        ''')
+        interpreter = Interpreter(console_output=False, sink=Discard())
+
+        with self.assertRaises(RuntimeError):
+            interpreter.run(brewin)
+
+        self.assertEqual(interpreter.get_output(), [])
+        self.assertEqual(interpreter.get_error_type_and_line()[1], 8)
+
+    def test_stackless_discard(self):
+        interpreter = Interpreter(console_output=False, stackless=True,
+                                  sink=Discard())
+
+        interpreter.run(PRINTS)
+
+        self.assertEqual(interpreter.get_output(), [])
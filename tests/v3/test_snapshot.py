@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from bparser import string_to_program
+from intbase import ErrorType
+from interpreterv3 import Interpreter, Snapshot, StaleSnapshot
+
+
+COUNTDOWN = '''
+(class main
+  (field int n 0)
+  (method int down ((int k))
+    (if (== k 0) (return 0) (return (call me down (- k 1))))
+  )
+  (method void main ()
+    (begin
+      (inputi n)
+      (print (call me down n))
+      (print (+ n "tea"))
+    )
+  )
+)
+'''
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'program.snapshot')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_restored(self):
+        Interpreter(console_output=False, tail_calls=True).snapshot(
+            string_to_program(COUNTDOWN), self.path
+        )
+        menu = Interpreter.restore(self.path)
+        interpreter = Interpreter(console_output=False, stackless=True,
+                                  max_depth=10)
+
+        with self.assertRaises(RuntimeError):
+            interpreter.run_prepared(menu, ['100'])
+
+        # tail calls, so the depth never goes past max_depth
+        self.assertEqual(interpreter.get_output(), ['0'])
+        self.assertEqual(interpreter.get_error_type_and_line(),
+                         (ErrorType.TYPE_ERROR, 10))
+        self.assertEqual(menu.classes['main'].methods['down'].name.line_num, 3)
+
+    def test_stale(self):
+        Interpreter(console_output=False).snapshot(
+            string_to_program(COUNTDOWN), self.path
+        )
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(data.replace(Snapshot.MAGIC, b'x' * len(Snapshot.MAGIC), 1))
+
+        with self.assertRaises(StaleSnapshot):
+            Interpreter.restore(self.path)
+
+    def test_not_a_snapshot(self):
+        with open(self.path, 'w') as f:
+            f.write(COUNTDOWN)
+
+        with self.assertRaises(StaleSnapshot):
+            Interpreter.restore(self.path)
@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import unittest
+
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+from sources import IntSource, StreamSource
+
+
+SUM = string_to_program('''
+    (class main
+  (field int n 0)
+  (field int x 0)
+  (field int total 0)
+  (method void main ()
+    (begin
+      (inputi n)
+      (while (> n 0)
+        (begin
+          (inputi x)
+          (set total (+ total x))
+          (set n (- n 1))
+        )
+      )
+      (print total)
+    )
+  )
+)
+''')
+
+
+class TestSources(unittest.TestCase):
+    def test_stream(self):
+        source = StreamSource(io.StringIO('tea\r\ncoffee\n\ncocoa'),
+                              chunk_size=4)
+
+        self.assertEqual(source(), 'tea')
+        self.assertEqual(list(source), ['coffee', '', 'cocoa'])
+        self.assertIsNone(source())
+
+    def test_ints(self):
+        source = IntSource(io.StringIO('1\n-2\n 3 \n'), chunk_size=3)
+
+        self.assertEqual(list(source), [1, -2, 3])
+
+    def test_not_ints(self):
+        source = IntSource(io.StringIO('1\n2\ntea\n'))
+
+        self.assertEqual(list(source), ['1', '2', 'tea'])
+
+    def test_inputi(self):
+        lines = [1000] + list(range(1000))
+        for source_type in StreamSource, IntSource:
+            with self.subTest(source_type=source_type):
+                source = source_type(
+                    io.StringIO('\n'.join(map(str, lines)) + '\n'),
+                    chunk_size=256
+                )
+                interpreter = Interpreter(console_output=False,
+                                          source=source)
+
+                interpreter.run(SUM)
+
+                self.assertEqual(interpreter.get_output(), ['499500'])
+
+    def test_inputi_not_int(self):
+        interpreter = Interpreter(
+            console_output=False,
+            source=IntSource(io.StringIO('2\n4\nseven\n'))
+        )
+
+        with self.assertRaises(RuntimeError):
+            interpreter.run(SUM)
+
+        self.assertEqual(interpreter.get_error_type_and_line()[1], 10)
+
+    def test_inputs(self):
+        brewin = string_to_program('''
+            (class main
+  (field string s "")
+  (method void main ()
+    (begin
+      (inputs s)
+      (print s)
+      (inputs s)
+      (print s)
+    )
+  )
+)
+        ''')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'in.txt')
+            with open(path, 'w') as f:
+                f.write('tea\n007\n')
+            interpreter = Interpreter(console_output=False,
+                                      source=StreamSource.from_file(path),
+                                      stackless=True)
+
+            interpreter.run(brewin)
+
+        self.assertEqual(interpreter.get_output(), ['tea', '007'])
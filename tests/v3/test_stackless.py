@@ -0,0 +1,123 @@
+import unittest
+
+from bparser import string_to_program
+from intbase import ErrorType
+from interpreterv3 import Interpreter
+
+
+class StacklessSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False, stackless=True)
+
+
+class TestStackless(StacklessSetUp, unittest.TestCase):
+    def test_deep_recursion(self):
+        brewin = string_to_program('''
+            (class main
+  (method int sum ((int n))
+    (if (== n 0)
+      (return 0)
+      (return (+ n (call me sum (- n 1))))
+    )
+  )
+  (method void main ()
+    (print (call me sum 5000))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['12502500'])
+
+    def test_deep_throw(self):
+        brewin = string_to_program('''
+            (class node
+  (field node next null)
+  (method void link ((int n))
+    (if (> n 0)
+      (begin
+        (set next (new node))
+        (call next link (- n 1))
+      )
+    )
+  )
+  (method int walk ((int n))
+    (if (== next null)
+      (throw (+ "bottom " "reached"))
+      (return (call next walk (+ n 1)))
+    )
+  )
+)
+
+(class main
+  (method void main ()
+    (let ((node head))
+      (set head (new node))
+      (call head link 2000)
+      (try
+        (print (call head walk 0))
+        (print exception)
+      )
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['bottom reached'])
+
+    def test_overload_through_parents(self):
+        brewin = string_to_program('''
+            (class base
+  (method string pick ((int x)) (return "base int"))
+)
+
+(class middle inherits base
+  (method string pick ((string x)) (return "middle string"))
+)
+
+(class derived inherits middle
+  (method string pick ((bool x)) (return "derived bool"))
+)
+
+(class main
+  (field derived d null)
+  (method void main ()
+    (begin
+      (set d (new derived))
+      (print (call d pick true))
+      (print (call d pick 1))
+      (print (call d pick "s"))
+      (call d pick)
+    )
+  )
+)
+        ''')
+
+        self.assertRaises(RuntimeError, self.deaf_interpreter.run, brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['derived bool', 'base int', 'middle string'])
+
+        error_type, error_line = self.deaf_interpreter.get_error_type_and_line()
+        self.assertIs(error_type, ErrorType.NAME_ERROR)
+        self.assertEqual(error_line, 21)
+
+    def test_max_depth(self):
+        brewin = string_to_program('''
+            (class main
+  (method void forever () (call me forever))
+  (method void main () (call me forever))
+)
+        ''')
+
+        interpreter = Interpreter(console_output=False, inp=[], stackless=True,
+                                  max_depth=1000)
+        self.assertRaises(RecursionError, interpreter.run, brewin)
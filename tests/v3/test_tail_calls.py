@@ -0,0 +1,269 @@
+import unittest
+
+from bparser import string_to_program
+from intbase import ErrorType
+from interpreterv3 import Interpreter
+
+
+class TailCallSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False,
+                                            tail_calls=True)
+
+
+class StacklessTailCallSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False, stackless=True,
+                                            tail_calls=True)
+
+
+class TestTailCalls(TailCallSetUp, unittest.TestCase):
+    def test_deep_tail_recursion(self):
+        brewin = string_to_program('''
+            (class main
+  (method int count ((int n) (int total))
+    (if (== n 0)
+      (return total)
+      (return (call me count (- n 1) (+ total n)))
+    )
+  )
+  (method void main ()
+    (print (call me count 3000 0))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['4501500'])
+
+    def test_void_tail_call(self):
+        brewin = string_to_program('''
+            (class node
+  (field int value 0)
+  (field node next null)
+  (method void set_up ((int n) (node rest))
+    (begin
+      (set value n)
+      (set next rest)
+    )
+  )
+  (method void show ()
+    (begin
+      (if (== 0 (% value 500))
+        (print value)
+      )
+      (if (!= next null)
+        (call next show)
+      )
+    )
+  )
+)
+
+(class main
+  (method void main ()
+    (let ((node head null) (node tea null) (int n 2000))
+      (while (> n 0)
+        (begin
+          (set tea (new node))
+          (call tea set_up n head)
+          (set head tea)
+          (set n (- n 1))
+        )
+      )
+      (call head show)
+      (print "done")
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['500', '1000', '1500', '2000', 'done'])
+
+    def test_mutual_recursion(self):
+        brewin = string_to_program('''
+            (class main
+  (method bool even ((int n))
+    (if (== n 0)
+      (return true)
+      (return (call me odd (- n 1)))
+    )
+  )
+  (method bool odd ((int n))
+    (if (== n 0)
+      (return false)
+      (return (call me even (- n 1)))
+    )
+  )
+  (method void main ()
+    (print (call me even 2001) " " (call me odd 2001))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['false true'])
+
+    def test_try_is_not_tail(self):
+        brewin = string_to_program('''
+            (class main
+  (method int risky ((int n))
+    (if (== n 0)
+      (throw "bottom")
+      (return (call me risky (- n 1)))
+    )
+  )
+  (method int guarded ()
+    (try
+      (return (call me risky 500))
+      (return 7)
+    )
+  )
+  (method void main ()
+    (print (call me guarded))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['7'])
+
+    def test_return_type_checked(self):
+        brewin = string_to_program('''
+            (class main
+  (method int number ()
+    (return 5)
+  )
+  (method string word ()
+    (return (call me number))
+  )
+  (method int middle ()
+    (return (call me word))
+  )
+  (method void main ()
+    (print (call me middle))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(error, (ErrorType.TYPE_ERROR, 9))
+
+    def test_no_value_returned(self):
+        brewin = string_to_program('''
+            (class main
+  (method void nothing ()
+    (print "nothing")
+  )
+  (method int something ()
+    (return (call me nothing))
+  )
+  (method void main ()
+    (print (call me something))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(output, ['nothing'])
+        self.assertEqual(error, (ErrorType.TYPE_ERROR, 6))
+
+    def test_inherited_tail_recursion(self):
+        brewin = string_to_program('''
+            (class tally
+  (method int get () (return 0))
+)
+(class counter inherits tally
+  (method int count ((int n) (int total))
+    (if (== n 0)
+      (return total)
+      (return (call me count (- n 1) (+ total n)))
+    )
+  )
+)
+(class main
+  (method void main ()
+    (print (call (new counter) count 3000 0))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['4501500'])
+
+    def test_parent_fallback(self):
+        brewin = string_to_program('''
+            (class base
+  (method int pick ((int n)) (return 7))
+)
+(class child inherits base
+  (method int pick ((int n))
+    (if (== n 0) (return "tea") (return (call me pick (- n 1))))
+  )
+)
+(class main
+  (method void main ()
+    (print (call (new child) pick 5))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        output = self.deaf_interpreter.get_output()
+
+        self.assertEqual(output, ['7'])
+
+    def test_null_through_classes(self):
+        brewin = string_to_program('''
+            (class cup)
+(class mug inherits cup)
+(class main
+  (method cup any ((int n))
+    (if (== n 0) (return null) (return (call me some (- n 1))))
+  )
+  (method mug some ((int n))
+    (if (== n 0) (return null) (return (call me any (- n 1))))
+  )
+  (method void main ()
+    (print (== null (call me any 4)))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        with self.assertRaises(RuntimeError):
+            self.deaf_interpreter.run(brewin)
+        error = self.deaf_interpreter.get_error_type_and_line()
+
+        self.assertEqual(error, (ErrorType.TYPE_ERROR, 5))
+
+
+class TestStacklessTailCalls(StacklessTailCallSetUp, TestTailCalls):
+    pass
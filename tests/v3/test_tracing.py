@@ -0,0 +1,208 @@
+import unittest
+
+import tracing
+from bparser import string_to_program
+from interpreterv3 import Interpreter
+from tracing import Recorder
+
+
+class TracingSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False)
+        self.recorder = Recorder()
+        self.deaf_interpreter.hooks.add(self.recorder)
+
+
+class StacklessTracingSetUp:
+    def setUp(self) -> None:
+        self.deaf_interpreter = Interpreter(console_output=False, inp=[],
+                                            trace_output=False, stackless=True)
+        self.recorder = Recorder()
+        self.deaf_interpreter.hooks.add(self.recorder)
+
+
+class TestTracing(TracingSetUp, unittest.TestCase):
+    def events(self, kind: str) -> list[tracing.Event]:
+        return [event for event in self.recorder.events if event.kind == kind]
+
+    def test_calls_and_returns(self):
+        brewin = string_to_program('''
+            (class main
+  (method int add ((int x) (int y))
+    (return (+ x y))
+  )
+  (method void main ()
+    (print (call me add 1 2))
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual(self.deaf_interpreter.get_output(), ['3'])
+        self.assertEqual(
+            [event[:3] for event in self.recorder.events],
+            [
+                (tracing.CALL, 'main.main', 5),
+                (tracing.STATEMENT, 'main.main', 6),
+                (tracing.CALL, 'main.add', 2),
+                (tracing.STATEMENT, 'main.add', 3),
+                (tracing.RETURN, 'main.add', 3),
+                (tracing.RETURN, 'main.main', 6),
+            ]
+        )
+        self.assertEqual(self.events(tracing.CALL)[1].detail, 'main')
+        self.assertEqual(self.events(tracing.RETURN)[0].detail.value, 3)
+
+    def test_allocations_and_throws(self):
+        brewin = string_to_program('''
+            (class cup)
+
+(class main
+  (field cup c null)
+  (method void main ()
+    (try
+      (begin
+        (set c (new cup))
+        (throw "spill")
+      )
+      (print exception)
+    )
+  )
+)
+        ''')
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+        allocs = self.events(tracing.ALLOC)
+        throws = self.events(tracing.THROW)
+
+        self.assertEqual(self.deaf_interpreter.get_output(), ['spill'])
+        self.assertEqual([event[1:] for event in allocs],
+                         [('main.main', 8, 'cup')])
+        self.assertEqual([event[1:3] for event in throws], [('main.main', 9)])
+
+    def test_kinds(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (begin
+      (print "tea")
+      (print "coffee")
+    )
+  )
+)
+        ''')
+        calls = Recorder()
+        self.deaf_interpreter.hooks.add(calls, tracing.CALL)
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual([event.kind for event in calls.events],
+                         [tracing.CALL])
+        self.assertEqual(len(self.events(tracing.STATEMENT)), 3)
+        with self.assertRaises(ValueError):
+            self.deaf_interpreter.hooks.add(calls, 'sip')
+
+    def test_recorder_capacity(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (begin
+      (print "tea")
+      (print "coffee")
+      (print "cocoa")
+    )
+  )
+)
+        ''')
+        recorder = Recorder(capacity=2)
+        self.deaf_interpreter.hooks.add(recorder, tracing.STATEMENT)
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual([event.line_num for event in recorder.events], [5, 6])
+
+    def test_others_untraced(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (print "tea")
+  )
+)
+        ''')
+        other = Interpreter(console_output=False, inp=[], trace_output=False)
+        seen = []
+
+        def run_other(event: tracing.Event):
+            if not seen:
+                seen.append(len(self.recorder.events))
+                other.run(brewin)
+                seen.append(len(self.recorder.events))
+
+        self.deaf_interpreter.hooks.add(run_other, tracing.STATEMENT)
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+
+        self.assertEqual(other.get_output(), ['tea'])
+        self.assertEqual(seen[0], seen[1])
+
+    def test_untraced_runs_plain(self):
+        brewin = string_to_program('''
+            (class main
+  (method void main ()
+    (print "tea")
+  )
+)
+        ''')
+        self.deaf_interpreter.hooks.remove(self.recorder)
+
+        self.deaf_interpreter.reset()
+        self.deaf_interpreter.run(brewin)
+
+        self.assertIsNone(self.deaf_interpreter.hooks.tracer())
+        self.assertEqual(self.deaf_interpreter.watchers(), [])
+        self.assertEqual(self.deaf_interpreter.get_output(), ['tea'])
+
+    def test_statements_reported_once(self):
+        brewin = string_to_program('''
+            (class main
+  (field int n 0)
+  (method int twice ((int n))
+    (return (* n 2))
+  )
+  (method void main ()
+    (begin
+      (inputi n)
+      (print (call me twice n))
+    )
+  )
+)
+        ''')
+        brewin_interpreter = Interpreter(console_output=False, inp=['21'],
+                                         trace_output=False)
+        brewin_interpreter.hooks.add(self.recorder)
+        stackless_interpreter = Interpreter(console_output=False, inp=['21'],
+                                            trace_output=False,
+                                            stackless=True)
+        stackless_recorder = Recorder()
+        stackless_interpreter.hooks.add(stackless_recorder)
+
+        brewin_interpreter.run(brewin)
+        stackless_interpreter.run(brewin)
+
+        self.assertEqual(stackless_interpreter.get_output(), ['42'])
+        self.assertEqual([event[:3] for event in stackless_recorder.events],
+                         [event[:3] for event in self.recorder.events])
+        self.assertEqual(
+            [event.detail for event in self.events(tracing.STATEMENT)],
+            ['begin', 'inputi', 'print', 'return']
+        )
+
+
+class TestStacklessTracing(StacklessTracingSetUp, TestTracing):
+    pass
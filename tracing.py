@@ -0,0 +1,199 @@
+"""
+Tracing hooks shared by the interpreters
+
+Callbacks registered on an interpreter's Hooks get an Event for each method
+call and return, statement, object allocation and Brewin throw. While any are
+registered, each run is watched by a Tracer of its own, which reports the
+events around the plain evaluators; with none registered nothing watches the
+run, and the evaluator runs exactly as it would without tracing
+"""
+
+from typing import Any, Callable, NamedTuple, Union
+import collections
+import sys
+
+from intbase import InterpreterBase
+
+
+CALL = 'call'
+RETURN = 'return'
+STATEMENT = 'statement'
+ALLOC = 'alloc'
+THROW = 'throw'
+EVENTS = (CALL, RETURN, STATEMENT, ALLOC, THROW)
+
+
+class Event(NamedTuple):
+    """
+    kind is one of EVENTS; method is the running Brewin method as
+    <class>.<method>
+
+    detail is the statement keyword for STATEMENT, the object's class for CALL
+    and ALLOC, the returned value (if any) for RETURN and the Complaint for
+    THROW
+    """
+    kind: str
+    method: str | None
+    line_num: int | None
+    detail: Any
+
+
+class Hooks:
+    """
+    Callbacks to report events to, by kind
+    """
+    def __init__(self) -> None:
+        self.callbacks: dict[str, list[Callable[[Event], Any]]] = {
+            kind: [] for kind in EVENTS
+        }
+
+    def __bool__(self) -> bool:
+        return any(self.callbacks.values())
+
+    def add(self, callback: Callable[[Event], Any], *kinds: str):
+        """
+        Registers callback for the given kinds of event, or all of them
+
+        Throws ValueError on an unknown kind
+        """
+        for kind in kinds or EVENTS:
+            if kind not in self.callbacks:
+                raise ValueError(f"Not an event: {kind}")
+            self.callbacks[kind].append(callback)
+
+    def remove(self, callback: Callable[[Event], Any]):
+        for callbacks in self.callbacks.values():
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    def emit(self, kind: str, method: str | None, line_num: int | None,
+             detail: Any):
+        if callbacks := self.callbacks[kind]:
+            event = Event(kind, method, line_num, detail)
+            for callback in callbacks:
+                callback(event)
+
+    def tracer(self) -> Union['Tracer', None]:
+        """
+        Watcher reporting the events of one run, or None if no callbacks are
+        registered, in which case nothing watches the run for them
+        """
+        return Tracer(self) if self else None
+
+
+class Tracer:
+    """
+    Reports the events of one run to hooks, keeping a shadow stack of the
+    Brewin methods running
+
+    Watches the run as the interpreter's Watch asks of a watcher: the
+    statement evaluators it wraps report each statement, and the call it
+    starts if the Plate it runs on is new, and each new is reported as made
+    """
+    def __init__(self, hooks: Hooks) -> None:
+        self.hooks = hooks
+        self.frames: list[list] = []
+
+    def enter(self, statement, stack) -> tuple[bool, str, Any, Any]:
+        """
+        Reports the statement starting, and the call it starts if stack is
+        not the innermost frame's
+        """
+        frames = self.frames
+        called = not frames or frames[-1][0] is not stack
+        if called:
+            instruction = stack.instruction
+            method = f"{instruction.me.name}.{instruction.name}"
+            frames.append([stack, method, None])
+            self.hooks.emit(CALL, method, instruction.name.line_num,
+                            stack.me.name)
+        frame = frames[-1]
+        try:
+            keyword = statement[0]
+            line_num = keyword.line_num
+        except (IndexError, AttributeError, TypeError):
+            keyword = line_num = None
+        self.hooks.emit(STATEMENT, frame[1], line_num, keyword)
+        previous, frame[2] = frame[2], statement
+        return called, frame[1], keyword, previous
+
+    def leave(self, order: tuple, stack, called: bool, method: str,
+              keyword: Any, previous: Any):
+        """
+        Reports a throw statement's throw, and the return of the call if the
+        statement was its body
+        """
+        # a throw statement that comes back at all is throwing
+        if keyword == InterpreterBase.THROW_DEF:
+            self.hooks.emit(THROW, method, keyword.line_num, order[1])
+        frames = self.frames
+        if frames and frames[-1][0] is stack:
+            frames[-1][2] = previous
+            if called:
+                frames.pop()
+                self.hooks.emit(RETURN, method,
+                                getattr(keyword, 'line_num', None), order[1])
+
+    def drop(self, stack, called: bool, previous: Any):
+        """
+        Forgets the statement, and the frame of a call, that failed with a
+        Python exception
+        """
+        frames = self.frames
+        if frames and frames[-1][0] is stack:
+            frames[-1][2] = previous
+            if called:
+                frames.pop()
+
+    def wrap_statement(self, evaluate: Callable) -> Callable:
+        def traced_statement(statement, stack):
+            called, method, keyword, previous = self.enter(statement, stack)
+            try:
+                order = evaluate(statement, stack)
+            except BaseException:
+                self.drop(stack, called, previous)
+                raise
+            self.leave(order, stack, called, method, keyword, previous)
+            return order
+        return traced_statement
+
+    def wrap_steps(self, percolate: Callable) -> Callable:
+        def traced_steps(statement, stack):
+            called, method, keyword, previous = self.enter(statement, stack)
+            try:
+                order = yield from percolate(statement, stack)
+            except BaseException:
+                self.drop(stack, called, previous)
+                raise
+            self.leave(order, stack, called, method, keyword, previous)
+            return order
+        return traced_steps
+
+    def made(self, cuppa, line_num: int | None, stack):
+        frames = self.frames
+        self.hooks.emit(ALLOC, frames[-1][1] if frames else None, line_num,
+                        cuppa.name)
+
+
+class Recorder:
+    """
+    Callback keeping the last capacity events in a ring buffer
+    """
+    def __init__(self, capacity: int = 1000) -> None:
+        self.events: collections.deque[Event] = collections.deque(
+            maxlen=capacity
+        )
+
+    def __call__(self, event: Event):
+        self.events.append(event)
+
+    def clear(self):
+        self.events.clear()
+
+
+def print_event(event: Event):
+    """
+    Callback writing each event to stderr, as trace_output does
+    """
+    print(f"line {event.line_num}: {event.kind} in {event.method}: "
+          f"{event.detail}", file=sys.stderr, flush=True)